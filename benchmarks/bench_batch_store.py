@@ -0,0 +1,83 @@
+"""
+Benchmark per-event vs batched Table Storage writes for the ingester.
+
+Runs against an in-memory stand-in with simulated round-trip latency by default,
+or against a real endpoint such as Azurite when --connection-string is given:
+
+    PYTHONPATH=. python benchmarks/bench_batch_store.py --events 500
+    PYTHONPATH=. python benchmarks/bench_batch_store.py --connection-string "UseDevelopmentStorage=true"
+"""
+import argparse
+import time
+import uuid
+from unittest.mock import patch
+
+from benchmarks.in_memory_table import InMemoryTableService
+from traffic_ingester.helper_functions import store_event_in_table, store_events_in_table_batch
+from traffic_ingester.helper_functions.table_client_registry_helper import clear_table_clients
+
+def make_events(count):
+    return [
+        {
+            "PartitionKey": "OttawaTraffic",
+            "RowKey": f"bench-{i}",
+            "EventType": "Collision",
+            "Location": f"Bench St & {i} Ave",
+            "StartTime": "2025-10-21T10:00:00Z",
+            "EndTime": None,
+            "Priority": "HIGH",
+            "Status": "ACTIVE",
+            "GeoCoordinates": "[-75.69, 45.40]"
+        }
+        for i in range(count)
+    ]
+
+def run_per_event(events, connection_string, table_name):
+    for event in events:
+        store_event_in_table(event, connection_string, table_name)
+
+def run_batched(events, connection_string, table_name):
+    store_events_in_table_batch(events, connection_string, table_name)
+
+def time_in_memory(runner, events, latency):
+    service = InMemoryTableService(latency_seconds=latency)
+    clear_table_clients()
+    with patch("traffic_ingester.helper_functions.table_client_registry_helper.TableServiceClient") as mock_tsc:
+        mock_tsc.from_connection_string.return_value = service
+        start = time.perf_counter()
+        runner(events, "in-memory", "TrafficEvents")
+        elapsed = time.perf_counter() - start
+    clear_table_clients()
+    return elapsed, service.round_trips
+
+def time_live(runner, events, connection_string):
+    from azure.data.tables import TableServiceClient
+    clear_table_clients()
+    table_name = f"Bench{uuid.uuid4().hex[:8]}"
+    service = TableServiceClient.from_connection_string(connection_string)
+    service.create_table_if_not_exists(table_name)
+    try:
+        start = time.perf_counter()
+        runner(events, connection_string, table_name)
+        return time.perf_counter() - start, None
+    finally:
+        service.delete_table(table_name)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Simulated round-trip latency for the in-memory table")
+    parser.add_argument("--connection-string", help="Benchmark a real Table endpoint (e.g. Azurite) instead")
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+    for name, runner in (("per-event", run_per_event), ("batched", run_batched)):
+        if args.connection_string:
+            elapsed, round_trips = time_live(runner, events, args.connection_string)
+        else:
+            elapsed, round_trips = time_in_memory(runner, events, args.latency_ms / 1000)
+        trips = "n/a" if round_trips is None else round_trips
+        print(f"{name:>10}: {args.events} events, {trips} round trips, {elapsed * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Time the ingester's cold start under `python -X importtime`: a fresh interpreter importing
+traffic_ingester.function_app as the Functions host does, vs the same import followed by
+the dependencies it now defers (requests, aiohttp, the Azure Tables SDK, dotenv), which is
+what every cold start paid when they were imported at module level. Reports the median
+cumulative import time of function_app and its heaviest packages, plus process wall time.
+
+    PYTHONPATH=. python benchmarks/bench_cold_start.py --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+MODULES = ["traffic_ingester.function_app", "azure.functions", "traffic_ingester.helper_functions", "requests", "aiohttp", "azure.data.tables", "dotenv"]
+DEFERRED = ["requests", "aiohttp", "azure.data.tables", "azure.data.tables.aio", "azure.core.pipeline.transport", "dotenv"]
+
+# Run one fresh interpreter and return its wall time and cumulative import time per module, in ms
+def run_once(code):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")])))
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=env, check=True)
+    wall = (time.perf_counter() - start) * 1000
+
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            imports.setdefault(name.strip(), int(cumulative) / 1000)
+    return wall, imports
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    variants = {
+        "lazy (function_app only)": "import traffic_ingester.function_app",
+        "eager (plus deferred deps)": "import traffic_ingester.function_app; " + "; ".join(f"import {module}" for module in DEFERRED)
+    }
+    for name, code in variants.items():
+        runs = [run_once(code) for _ in range(args.runs)]
+        wall = statistics.median(run[0] for run in runs)
+        print(f"{name}: {wall:.0f} ms process wall time (median of {args.runs})")
+        for module in MODULES:
+            times = [run[1][module] for run in runs if module in run[1]]
+            if times:
+                print(f"  {module:<34} {statistics.median(times):8.1f} ms")
+        # function_app plus the deferred imports that were not already loaded by it
+        total = statistics.median(sum(ms for module, ms in run[1].items() if module in DEFERRED + ["traffic_ingester.function_app"]) for run in runs)
+        print(f"  {'total import time':<34} {total:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark GeoCoordinates decoding in /update-dashboard: the original per-row
+json.loads + pd.Series apply against the bulk decode_coordinates.
+
+    PYTHONPATH=. python benchmarks/bench_coordinate_decoding.py --sizes 10000 100000
+"""
+import argparse
+import json
+import time
+
+import pandas as pd
+
+from dashboard.coordinates import decode_coordinates
+
+def make_coordinates(count):
+    return [f"[{-75.9 + (i % 1000) / 2000}, {45.2 + (i % 700) / 2000}]" for i in range(count)]
+
+# What update_dashboard did before decode_coordinates
+def extract_coords(geo_str):
+    try:
+        coords = json.loads(geo_str)
+        if isinstance(coords, list) and len(coords) == 2:
+            lon, lat = coords
+            return lat, lon
+    except Exception:
+        pass
+    return None, None
+
+def apply_per_row(df):
+    df[["Latitude", "Longitude"]] = df["GeoCoordinates"].apply(lambda g: pd.Series(extract_coords(g)))
+
+def decode_bulk(df):
+    df["Longitude"], df["Latitude"] = decode_coordinates(df["GeoCoordinates"])
+
+def best_of(runner, df, repeat):
+    timings = []
+    for _ in range(repeat):
+        frame = df.copy()
+        start = time.perf_counter()
+        runner(frame)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        df = pd.DataFrame({"GeoCoordinates": make_coordinates(size)})
+        print(f"{size} events")
+        print(f"  {'apply + pd.Series per row':<30} {best_of(apply_per_row, df, args.repeat):8.1f} ms")
+        print(f"  {'decode_coordinates (bulk)':<30} {best_of(decode_bulk, df, args.repeat):8.1f} ms")
+        df["GeoCoordinates"] = [json.loads(value) for value in df["GeoCoordinates"]]
+        print(f"  {'decode_coordinates (lists)':<30} {best_of(decode_bulk, df, args.repeat):8.1f} ms")
+
+if __name__ == "__main__":
+    main()
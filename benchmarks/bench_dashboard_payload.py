@@ -0,0 +1,94 @@
+"""
+Measure bytes sent to each browser tab per data update for a city feed, comparing the
+original protocol (full latest-data-store records plus every figure rebuilt in full) with
+the versioned delta protocol (version message, hotspot/choropleth deltas).
+
+    PYTHONPATH=. python benchmarks/bench_dashboard_payload.py --events 5000 --changed 100
+"""
+import argparse
+import json
+import random
+from unittest.mock import patch
+
+import plotly.express as px
+from plotly.io.json import to_json_plotly
+
+import dashboard.app as dashboard_app
+
+def make_events(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "PartitionKey": "OttawaTraffic",
+            "RowKey": str(100000 + i),
+            "EventType": rng.choice(["Collision", "Construction", "Special Event"]),
+            "Location": f"Synthetic event {i} on Bank St",
+            "StartTime": "2025-10-21T10:00:00Z",
+            "EndTime": "2025-10-21T12:00:00Z",
+            "Priority": rng.choice(["HIGH", "MEDIUM", "LOW"]),
+            "Status": "ACTIVE",
+            "GeoCoordinates": f"[{rng.uniform(-75.95, -75.5):.5f}, {rng.uniform(45.25, 45.5):.5f}]"
+        }
+        for i in range(count)
+    ]
+
+def size(value):
+    return len(to_json_plotly(value).encode("utf-8"))
+
+# Run every figure callback for one store value; data_update marks the latest-data-store trigger.
+# shown is the (hotspot-shown, choropleth-shown) pair from the previous render, or (None, None)
+def render(store, shown, data_update):
+    with patch.object(dashboard_app.dash, "ctx") as mock_ctx:
+        mock_ctx.triggered_id = "latest-data-store" if data_update else None
+        hotspot, hotspot_shown = dashboard_app.update_hotspot_map(store, None, None, shown[0])
+        bar = dashboard_app.update_event_type_bar(store, None, None)
+        choropleth, choropleth_shown = dashboard_app.update_ward_choropleth(store, None, shown[1])
+    return {"hotspot-map": size(hotspot), "event-type-bar": size(bar), "ward-choropleth": size(choropleth)}, (hotspot_shown, choropleth_shown)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--changed", type=int, default=100, help="changed + added + removed events per update")
+    args = parser.parse_args()
+
+    client = dashboard_app.app.server.test_client()
+    events = make_events(args.events)
+    client.post("/update-dashboard", json={"events": events})
+    first = dashboard_app.poll_for_updates(1, None)
+    _, shown = render(first, (None, None), data_update=False)
+
+    # One ingest cycle: a third changed, a third added, a third removed
+    third = max(args.changed // 3, 1)
+    changed = [dict(event, Priority="LOW") for event in events[:third]]
+    added = make_events(third, seed=1)
+    for position, event in enumerate(added):
+        event["RowKey"] = str(900000 + position)
+    removed = [event["RowKey"] for event in events[-third:]]
+    client.post("/update-dashboard", json={"events": changed + added, "removed": removed, "mode": "delta"})
+    second = dashboard_app.poll_for_updates(2, first)
+    delta_sizes, _ = render(second, shown, data_update=True)
+
+    # Original protocol: all records in latest-data-store (also re-written to localStorage),
+    # and each figure rebuilt in full with the full-resolution ward GeoJSON
+    df = dashboard_app.snapshot_store.latest().frame
+    records = size(df.drop(columns=["WARD", "NAME"]).to_dict("records"))
+    full_sizes, _ = render(second, (None, None), data_update=False)
+    full_choropleth = px.choropleth(
+        dashboard_app.wards.drop(columns="geometry").assign(Count=0),
+        geojson=dashboard_app.wards.__geo_interface__,
+        locations="WARD", color="Count", featureidkey="properties.WARD"
+    )
+    full_sizes["ward-choropleth"] = size(full_choropleth)
+
+    message = len(f"data: {json.dumps(second)}\n\n".encode("utf-8"))
+    print(f"{args.events} events, {third} changed / {third} added / {third} removed per update")
+    print(f"  {'':<22} {'original':>12} {'delta':>12}")
+    print(f"  {'latest-data-store':<22} {records:>12,} {message:>12,}")
+    for name in full_sizes:
+        print(f"  {name:<22} {full_sizes[name]:>12,} {delta_sizes[name]:>12,}")
+    total_full = records + sum(full_sizes.values())
+    total_delta = message + sum(delta_sizes.values())
+    print(f"  {'total bytes':<22} {total_full:>12,} {total_delta:>12,}  ({total_full / total_delta:.0f}x smaller)")
+
+if __name__ == "__main__":
+    main()
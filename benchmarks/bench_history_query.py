@@ -0,0 +1,113 @@
+"""
+Compare the scan cost of time-window queries on the history table's day-partitioned layout
+against the current layout, where every event ever seen sits in the "OttawaTraffic" partition.
+
+Both layouts are filled from the same simulated feed history in the in-memory Table
+Storage stand-in; the service reads every entity of the partitions a query touches and
+returns at most 1,000 entities per page (round trip).
+
+    PYTHONPATH=. python benchmarks/bench_history_query.py --days 90 --events-per-day 300
+"""
+import argparse
+import contextlib
+import io
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from benchmarks.in_memory_table import InMemoryTableService
+from traffic_ingester.helper_functions.history_store_helper import record_history, record_history_day, query_history
+
+PAGE_SIZE = 1000
+
+def make_event(key, now, rng):
+    start = now + timedelta(hours=rng.randint(0, 6))
+    return {
+        "PartitionKey": "OttawaTraffic",
+        "RowKey": str(key),
+        "EventType": rng.choice(["Collision", "Construction", "Special Event"]),
+        "Location": f"Synthetic event {key} on Bank St",
+        "StartTime": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "EndTime": (start + timedelta(hours=rng.randint(1, 72))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "Priority": rng.choice(["HIGH", "MEDIUM", "LOW"]),
+        "Status": "ACTIVE",
+        "GeoCoordinates": "[-75.69, 45.40]"
+    }
+
+# Runs every few hours of simulated time; events leave the feed once their EndTime has passed
+def fill_history(service, days, events_per_day, first_day, runs_per_day=4, seed=0):
+    rng = random.Random(seed)
+    history = service.get_table_client("TrafficHistory")
+    single = service.get_table_client("SinglePartition")
+    stored = service.get_table_client("TrafficEvents")
+    active, next_key = {}, 0
+
+    for run in range(days * runs_per_day):
+        now = first_day + timedelta(hours=run * 24 / runs_per_day)
+        now_text = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+        removed = [key for key, event in active.items() if event["EndTime"] < now_text]
+        for key in removed:
+            del active[key]
+            single.entities[("OttawaTraffic", key)]["Status"] = "INACTIVE"
+        added = []
+        while len(active) < events_per_day:
+            active[str(next_key)] = make_event(next_key, now, rng)
+            added.append(str(next_key))
+            next_key += 1
+
+        # As the ingester does: copy the stored ACTIVE set once per day, then store and record the delta
+        record_history_day("in-memory", "TrafficEvents", "TrafficHistory", "TrafficMetadata", now=now)
+        for key in removed:
+            stored.entities.pop(("OttawaTraffic", key), None)
+        for key in added:
+            stored.entities[("OttawaTraffic", key)] = dict(active[key])
+        delta = {"added": added, "changed": [], "removed": removed}
+        record_history(delta, [active[key] for key in added], "in-memory", "TrafficHistory", now=now)
+
+        # The current layout: one row per event ever seen, all in one partition
+        for key in added:
+            single.entities[("OttawaTraffic", key)] = dict(active[key])
+    return history, single
+
+# The single partition can only be filtered on properties, so all of it is read
+def query_single_partition(single, start, end):
+    start_text, end_text = (moment.strftime("%Y-%m-%dT%H:%M:%SZ") for moment in (start, end))
+    return single.query_entities(
+        f"PartitionKey eq 'OttawaTraffic' and StartTime le '{end_text}' and EndTime ge '{start_text}'"
+    )
+
+def run_query(table, query):
+    table.entities_scanned = 0
+    results = query()
+    scanned = table.entities_scanned
+    return len(results), scanned, max(1, math.ceil(scanned / PAGE_SIZE))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--events-per-day", type=int, default=300)
+    parser.add_argument("--window-days", type=int, nargs="+", default=[1, 7])
+    args = parser.parse_args()
+
+    service = InMemoryTableService(latency_seconds=0)
+    first_day = datetime(2025, 7, 1, tzinfo=timezone.utc)
+    with patch("traffic_ingester.helper_functions.history_store_helper.get_table_client", side_effect=lambda conn, name: service.get_table_client(name)):
+        with contextlib.redirect_stdout(io.StringIO()):
+            history, single = fill_history(service, args.days, args.events_per_day, first_day)
+        print(f"{args.days} days of history: {len(single.entities):,} events in one partition, {len(history.entities):,} day/log rows")
+
+        end = first_day + timedelta(days=args.days)
+        for window in args.window_days:
+            start = end - timedelta(days=window)
+            layouts = [
+                ("single partition", single, lambda: query_single_partition(single, start, end)),
+                ("day partitions", history, lambda: query_history("in-memory", "TrafficHistory", start, end))
+            ]
+            print(f"{window}-day window")
+            for name, table, query in layouts:
+                results, scanned, pages = run_query(table, query)
+                print(f"  {name:<17} {results:>7,} events returned {scanned:>9,} entities scanned {pages:>5} pages")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compare ways for a restarted (or extra) dashboard process to get the ward-enriched event
+frame: rebuilding it from JSON event records (decode + ward join), loading the JSON
+snapshot written without pyarrow, and memory-mapping the Arrow IPC snapshot (converted to a
+pandas frame, or as the Arrow table itself, whose buffers are used in place). Also times the header-only read used to check a
+snapshot's version and age.
+
+    PYTHONPATH=. python benchmarks/bench_snapshot_file.py --events 5000 50000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import pandas as pd
+
+import dashboard.app as dashboard_app
+from traffic_ingester.snapshot_file import write_snapshot, read_snapshot_header, read_snapshot_frame, open_arrow
+
+def make_event(key, rng):
+    return {
+        "PartitionKey": "OttawaTraffic",
+        "RowKey": str(100000 + key),
+        "EventType": rng.choice(["Collision", "Construction", "Special Event"]),
+        "Location": f"Synthetic event {key} on Bank St",
+        "StartTime": "2025-10-21T10:00:00Z",
+        "EndTime": "2025-10-22T10:00:00Z",
+        "Priority": rng.choice(["HIGH", "MEDIUM", "LOW"]),
+        "Status": "ACTIVE",
+        "GeoCoordinates": f"[{rng.uniform(-75.9, -75.5)!r}, {rng.uniform(45.25, 45.45)!r}]"
+    }
+
+def best_of(function, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, nargs="+", default=[5000, 50000])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for count in args.events:
+        body = json.dumps([make_event(key, rng) for key in range(count)])
+        frame = dashboard_app.enrich_events(pd.DataFrame(json.loads(body)))
+
+        with tempfile.TemporaryDirectory() as directory:
+            arrow_path = os.path.join(directory, "latest_snapshot.arrow")
+            json_path = os.path.join(directory, "latest_snapshot.json")
+            write_ms = best_of(lambda: write_snapshot(arrow_path, frame, version=1, use_arrow=True), 3)
+            write_snapshot(json_path, frame, version=1, use_arrow=False)
+
+            print(f"{count:,} events (JSON {len(body) / 1024:,.0f} KB, Arrow {os.path.getsize(arrow_path) / 1024:,.0f} KB, "
+                  f"JSON snapshot {os.path.getsize(json_path) / 1024:,.0f} KB; Arrow write {write_ms:.1f} ms)")
+            cases = [
+                ("JSON records + decode + ward join", lambda: dashboard_app.enrich_events(pd.DataFrame(json.loads(body)))),
+                ("JSON snapshot -> pandas", lambda: read_snapshot_frame(json_path)),
+                ("Arrow mmap -> pandas", lambda: read_snapshot_frame(arrow_path)),
+                ("Arrow mmap table (no conversion)", lambda: open_arrow(arrow_path)),
+                ("Arrow header only", lambda: read_snapshot_header(arrow_path))
+            ]
+            for name, function in cases:
+                print(f"  {name:<34} {best_of(function):9.2f} ms")
+
+if __name__ == "__main__":
+    main()
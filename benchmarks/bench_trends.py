@@ -0,0 +1,78 @@
+"""
+Measure the rolling trend aggregates: cost of folding one published frame into the
+5-minute/hourly/daily rings, and time to produce a trend chart's series from them, versus
+rescanning a log of every past event observation with pandas.
+
+    PYTHONPATH=. python benchmarks/bench_trends.py --weeks 6 --events 300
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from dashboard.trend_store import TrendStore
+
+PRIORITIES = np.array(["HIGH", "MEDIUM", "LOW"])
+EVENT_TYPES = np.array(["Collision", "Construction", "Special Event", "Road Closure"])
+WARDS = np.array([f"Ward {i}" for i in range(1, 25)])
+
+def make_frame(rng, count):
+    return pd.DataFrame({
+        "Priority": PRIORITIES[rng.integers(0, len(PRIORITIES), count)],
+        "EventType": EVENT_TYPES[rng.integers(0, len(EVENT_TYPES), count)],
+        "NAME": WARDS[rng.integers(0, len(WARDS), count)]
+    })
+
+def best_of(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--weeks", type=int, default=6)
+    parser.add_argument("--events", type=int, default=300, help="active events per 5-minute ingest")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    end = time.time()
+    runs = args.weeks * 7 * 24 * 12
+    start = end - runs * 300
+
+    store = TrendStore()
+    observations = []
+    record_seconds = 0.0
+    for run in range(runs):
+        frame = make_frame(rng, args.events)
+        timestamp = start + run * 300
+        begin = time.perf_counter()
+        store.record(frame, timestamp)
+        record_seconds += time.perf_counter() - begin
+        observations.append(frame.assign(Time=timestamp))
+    log = pd.concat(observations, ignore_index=True)
+    log["Time"] = pd.to_datetime(log["Time"], unit="s", utc=True)
+
+    print(f"{runs:,} ingests of {args.events} events ({len(log):,} observations)")
+    print(f"  record per ingest: {record_seconds / runs * 1000:.3f} ms")
+
+    windows = [("5min", "5min", 24 * 3600), ("hourly", "h", 14 * 24 * 3600), ("daily", "D", min(args.weeks * 7, 90) * 24 * 3600)]
+    for dimension in ("Priority", "NAME"):
+        for resolution, frequency, window in windows:
+            ring_ms = best_of(lambda: store.series(dimension, resolution, end - window, end), args.repeat)
+
+            # Rescan: count each ingest's events per category, then take each bucket's peak
+            def rescan():
+                recent = log[log["Time"] >= pd.Timestamp(end - window, unit="s", tz="UTC")]
+                per_ingest = recent.groupby(["Time", dimension]).size().unstack(fill_value=0)
+                return per_ingest.resample(frequency).max()
+
+            rescan_ms = best_of(rescan, args.repeat)
+            print(f"  {dimension:<8} {resolution:<7} rings {ring_ms:7.2f} ms   rescan {rescan_ms:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
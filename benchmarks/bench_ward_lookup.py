@@ -0,0 +1,57 @@
+"""
+Benchmark ward assignment: the original per-event Point + gpd.sjoin against the
+prebuilt WardLookup engine (prepared polygons, bbox prefilter, vectorized contains_xy).
+
+    PYTHONPATH=. python benchmarks/bench_ward_lookup.py --points 100000
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import geopandas as gpd
+from shapely.geometry import Point
+
+from dashboard.ward_lookup import WardLookup
+
+WARDS_PATH = os.path.join(os.path.dirname(__file__), "..", "dashboard", "data", "ottawa_wards.geojson")
+
+# What assign_events_to_wards did before the lookup engine
+def sjoin_wards(wards, lon, lat):
+    points = gpd.GeoDataFrame(geometry=[Point(xy) for xy in zip(lon, lat)], crs="EPSG:4326")
+    joined = gpd.sjoin(points, wards, how="left", predicate="within")
+    return joined[~joined.index.duplicated()]["WARD"].to_numpy(dtype=object)
+
+def best_of(runner, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = runner()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    wards = gpd.read_file(WARDS_PATH).to_crs("EPSG:4326")
+    min_x, min_y, max_x, max_y = wards.total_bounds
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(min_x, max_x, args.points)
+    lat = rng.uniform(min_y, max_y, args.points)
+
+    build_ms, lookup = best_of(lambda: WardLookup(wards), args.repeat)
+    sjoin_ms, expected = best_of(lambda: sjoin_wards(wards, lon, lat), args.repeat)
+    lookup_ms, (ward_ids, _) = best_of(lambda: lookup.assign(lon, lat), args.repeat)
+
+    matches = sum(1 for a, b in zip(expected, ward_ids) if a == b or (a != a and b is None))
+    print(f"{args.points} points, {len(wards)} wards")
+    print(f"  {'gpd.sjoin (Point per event)':<30} {sjoin_ms:8.1f} ms")
+    print(f"  {'WardLookup build (once)':<30} {build_ms:8.1f} ms")
+    print(f"  {'WardLookup.assign':<30} {lookup_ms:8.1f} ms")
+    print(f"  speedup {sjoin_ms / lookup_ms:.1f}x, agreement {matches / args.points:.2%}")
+
+if __name__ == "__main__":
+    main()
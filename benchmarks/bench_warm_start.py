@@ -0,0 +1,71 @@
+"""
+Time a dashboard warm start: from Table Storage with one paged query vs concurrent key-range
+queries split by the ACTIVE index, and from the local snapshot file. Table times include
+the bulk coordinate decoding and ward assignment; the snapshot file is already enriched.
+
+The in-memory Table Storage stand-in sleeps for --latency-ms per round trip (one per page
+of 1,000 entities).
+
+    PYTHONPATH=. python benchmarks/bench_warm_start.py --events 5000 20000 --latency-ms 80
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from unittest.mock import patch
+
+import pandas as pd
+
+from benchmarks.in_memory_table import InMemoryTableService
+import dashboard.app as dashboard_app
+from dashboard.warm_start import load_table_events, read_snapshot_file, write_snapshot_file
+
+def make_entity(key, rng):
+    return {
+        "PartitionKey": "OttawaTraffic",
+        "RowKey": f"{key}-{rng.choice(['Collision', 'Construction', 'Special Event'])}",
+        "EventType": rng.choice(["Collision", "Construction", "Special Event"]),
+        "Location": f"Synthetic event {key} on Bank St",
+        "StartTime": "2025-10-21T10:00:00Z",
+        "EndTime": "2025-10-22T10:00:00Z",
+        "Priority": rng.choice(["HIGH", "MEDIUM", "LOW"]),
+        "Status": "ACTIVE",
+        "GeoCoordinates": f"[{rng.uniform(-75.9, -75.5)!r}, {rng.uniform(45.25, 45.45)!r}]"
+    }
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, nargs="+", default=[5000, 20000])
+    parser.add_argument("--latency-ms", type=float, default=80)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for count in args.events:
+        service = InMemoryTableService(latency_seconds=args.latency_ms / 1000)
+        table = service.get_table_client("TrafficEvents")
+        entities = [make_entity(key, rng) for key in range(count)]
+        table.entities = {(entity["PartitionKey"], entity["RowKey"]): entity for entity in entities}
+        active_keys = {entity["RowKey"] for entity in entities}
+
+        print(f"{count:,} ACTIVE events, {args.latency_ms:.0f} ms per round trip")
+        with patch("traffic_ingester.helper_functions.table_client_registry_helper.get_table_client", side_effect=lambda conn, name: service.get_table_client(name)):
+            for name, index in (("one paged query", None), ("key-range queries", active_keys)):
+                with patch("traffic_ingester.helper_functions.cleanup_inactive_events_helper.get_active_index", return_value=index):
+                    elapsed, events = timed(lambda: dashboard_app.enrich_events(pd.DataFrame(load_table_events("in-memory"))))
+                print(f"  table, {name:<18} {elapsed * 1000:8.0f} ms  ({len(events):,} events)")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "latest_snapshot.arrow")
+            write_snapshot_file(path, events)
+            elapsed, frame = timed(lambda: read_snapshot_file(path))
+            size = os.path.getsize(path)
+        print(f"  snapshot file              {elapsed * 1000:8.0f} ms  ({len(frame):,} events, {size / 1024:,.0f} KB)")
+
+if __name__ == "__main__":
+    main()
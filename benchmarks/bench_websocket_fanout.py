@@ -0,0 +1,111 @@
+"""
+Load test for the WebSocket fan-out: starts websocket/server.py on a local port, connects
+1,000 WebSocket clients (plus optional stalled clients that never read), posts broadcasts
+and reports how long it takes until every reading client has each message. A burst of
+deltas then shows backlogs being coalesced and capped by the high-water marks.
+
+    PORT=8765 PYTHONPATH=. python benchmarks/bench_websocket_fanout.py --clients 1000 --stalled 20 --burst 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import threading
+import time
+
+os.environ.setdefault("PORT", "8765")
+
+import aiohttp
+import uvicorn
+import websockets
+
+from websocket.server import app, fanout
+
+def start_server(port):
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", ws_max_queue=1))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+def make_payload(events):
+    return {"events": [
+        {"RowKey": str(100000 + i), "EventType": "Construction", "Priority": "LOW", "Status": "ACTIVE",
+         "Location": f"Synthetic event {i} on Bank St", "GeoCoordinates": "[-75.69, 45.42]"}
+        for i in range(events)
+    ]}
+
+async def reader(url, received, ready):
+    async with websockets.connect(url, max_size=None, ping_interval=None) as socket:
+        ready.release()
+        async for _ in socket:
+            received.append(time.perf_counter())
+
+async def stalled(url, ready, stop):
+    # Connects but never reads, so its socket buffers fill and sends to it back up
+    async with websockets.connect(url, max_size=None, ping_interval=None, max_queue=1) as socket:
+        socket.transport.pause_reading()
+        ready.release()
+        await stop.wait()
+
+async def run(args):
+    url = f"ws://127.0.0.1:{args.port}/ws"
+    ready = asyncio.Semaphore(0)
+    stop = asyncio.Event()
+    inboxes = [[] for _ in range(args.clients)]
+    tasks = [asyncio.create_task(reader(url, inbox, ready)) for inbox in inboxes]
+    tasks += [asyncio.create_task(stalled(url, ready, stop)) for _ in range(args.stalled)]
+    for _ in range(args.clients + args.stalled):
+        await ready.acquire()
+    while fanout.stats()["clients"] < args.clients + args.stalled:
+        await asyncio.sleep(0.05)
+
+    payload = make_payload(args.events)
+    latencies = []
+    async with aiohttp.ClientSession() as session:
+        for round_number in range(1, args.broadcasts + 1):
+            start = time.perf_counter()
+            async with session.post(f"http://127.0.0.1:{args.port}/broadcast", json=payload) as response:
+                await response.json()
+            posted = time.perf_counter() - start
+            while sum(len(inbox) >= round_number for inbox in inboxes) < args.clients:
+                await asyncio.sleep(0.001)
+            latencies.append(max(inbox[round_number - 1] for inbox in inboxes) - start)
+            print(f"  broadcast {round_number}: POST {posted * 1000:7.1f} ms, all {args.clients} clients {latencies[-1] * 1000:7.1f} ms")
+
+        # Bursty ingestion: deltas posted back to back; stalled clients' backlogs are
+        # coalesced and capped by the high-water marks instead of growing
+        for burst_number in range(args.burst):
+            delta = {"mode": "delta", "events": payload["events"][:10], "removed": [str(200000 + burst_number)]}
+            async with session.post(f"http://127.0.0.1:{args.port}/broadcast", json=delta) as response:
+                await response.json()
+
+        async with session.get(f"http://127.0.0.1:{args.port}/stats") as response:
+            stats = await response.json()
+            stats.pop("per_client")
+
+    stop.set()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return latencies, stats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--stalled", type=int, default=20)
+    parser.add_argument("--events", type=int, default=500, help="events per broadcast")
+    parser.add_argument("--broadcasts", type=int, default=5)
+    parser.add_argument("--burst", type=int, default=50, help="deltas posted back to back after the timed rounds")
+    parser.add_argument("--port", type=int, default=int(os.environ["PORT"]))
+    args = parser.parse_args()
+
+    start_server(args.port)
+    print(f"{args.clients} reading clients, {args.stalled} stalled clients, {args.events} events per broadcast")
+    latencies, stats = asyncio.run(run(args))
+    print(f"  median fan-out {statistics.median(latencies) * 1000:.1f} ms, worst {max(latencies) * 1000:.1f} ms")
+    print(f"  server stats: {stats}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare the size and encode/decode time of the event wire formats: JSON (the current
+format and the fallback), JSON with zlib for reference, the columnar format with and
+without compression, and MessagePack when it is installed.
+
+    PYTHONPATH=. python benchmarks/bench_wire_format.py --sizes 100 5000 50000
+"""
+import argparse
+import random
+import time
+import zlib
+
+from traffic_ingester.wire_format import available_formats, encode_payload, decode_payload
+
+def make_events(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "PartitionKey": "OttawaTraffic",
+            "RowKey": str(100000 + i),
+            "EventType": rng.choice(["Collision", "Construction", "Special Event"]),
+            "Location": f"Synthetic event {i} on Bank St",
+            "StartTime": f"2025-10-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00Z",
+            "EndTime": None if i % 4 == 0 else "2025-10-31T12:00:00Z",
+            "Priority": rng.choice(["HIGH", "MEDIUM", "LOW"]),
+            "Status": "ACTIVE",
+            "GeoCoordinates": [round(rng.uniform(-75.95, -75.5), 5), round(rng.uniform(45.25, 45.5), 5)]
+        }
+        for i in range(count)
+    ]
+
+def best_of(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 5000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    codecs = [
+        ("json", lambda payload: encode_payload(payload), lambda body: decode_payload(body)),
+        ("json + zlib", lambda payload: zlib.compress(encode_payload(payload)), lambda body: decode_payload(zlib.decompress(body))),
+        ("columnar", lambda payload: encode_payload(payload, "columnar", compress=False), lambda body: decode_payload(body, "columnar")),
+        ("columnar + zlib", lambda payload: encode_payload(payload, "columnar", compress=True), lambda body: decode_payload(body, "columnar"))
+    ]
+    if "msgpack" in available_formats():
+        codecs.append(("msgpack", lambda payload: encode_payload(payload, "msgpack"), lambda body: decode_payload(body, "msgpack")))
+
+    for size in args.sizes:
+        payload = {"events": make_events(size), "removed": [], "mode": "delta"}
+        print(f"{size} events")
+        print(f"  {'format':<18} {'bytes':>11} {'vs json':>8} {'encode ms':>10} {'decode ms':>10}")
+        json_bytes = None
+        for name, encode, decode in codecs:
+            encode_ms, body = best_of(lambda: encode(payload), args.repeat)
+            decode_ms, decoded = best_of(lambda: decode(body), args.repeat)
+            assert decoded == payload, name
+            json_bytes = json_bytes or len(body)
+            print(f"  {name:<18} {len(body):>11,} {len(body) / json_bytes:>8.2f} {encode_ms:>10.2f} {decode_ms:>10.2f}")
+
+if __name__ == "__main__":
+    main()
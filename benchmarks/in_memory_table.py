@@ -0,0 +1,123 @@
+import math
+import operator
+import re
+import time
+from azure.core.exceptions import ResourceNotFoundError
+
+# Comparisons understood in query filters ("Prop op 'value'" joined by "and")
+FILTER_OPERATORS = {"eq": operator.eq, "ne": operator.ne, "ge": operator.ge, "gt": operator.gt, "le": operator.le, "lt": operator.lt}
+FILTER_CONDITION = re.compile(r"(\w+) (eq|ne|ge|gt|le|lt) '((?:[^']|'')*)'")
+
+def parse_filter(query_filter):
+    return [(name, op, value.replace("''", "'")) for name, op, value in FILTER_CONDITION.findall(query_filter)]
+
+def matches(entity, condition):
+    name, op, value = condition
+    actual = entity.get(name)
+    return actual is not None and FILTER_OPERATORS[op](str(actual), value)
+
+# In-memory stand-in for the Azure Table Storage clients used by the ingester.
+# Every public call counts as one HTTP round trip and sleeps for a simulated latency.
+class InMemoryTableClient:
+    def __init__(self, table_name, latency_seconds=0.002):
+        self.table_name = table_name
+        self.latency_seconds = latency_seconds
+        self.entities = {}
+        self.round_trips = 0
+        self.entities_scanned = 0
+
+    def _round_trip(self):
+        self.round_trips += 1
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+
+    def get_entity(self, partition_key, row_key, **kwargs):
+        self._round_trip()
+        try:
+            return dict(self.entities[(partition_key, row_key)])
+        except KeyError:
+            raise ResourceNotFoundError(f"{partition_key}/{row_key} not found")
+
+    def upsert_entity(self, entity, mode="merge", **kwargs):
+        self._round_trip()
+        key = (entity["PartitionKey"], entity["RowKey"])
+        if str(mode).lower().endswith("merge") and key in self.entities:
+            self.entities[key].update(entity)
+        else:
+            self.entities[key] = dict(entity)
+
+    def update_entity(self, entity, mode="merge", **kwargs):
+        self._round_trip()
+        key = (entity["PartitionKey"], entity["RowKey"])
+        if key not in self.entities:
+            raise ResourceNotFoundError(f"{key[0]}/{key[1]} not found")
+        if str(mode).lower().endswith("merge"):
+            self.entities[key].update(entity)
+        else:
+            self.entities[key] = dict(entity)
+
+    def create_entity(self, entity, **kwargs):
+        self._round_trip()
+        self.entities[(entity["PartitionKey"], entity["RowKey"])] = dict(entity)
+
+    def delete_entity(self, partition_key, row_key, **kwargs):
+        self._round_trip()
+        self.entities.pop((partition_key, row_key), None)
+
+    def submit_transaction(self, operations, **kwargs):
+        # One round trip for the whole batch, applied without extra latency
+        self._round_trip()
+        latency, self.latency_seconds = self.latency_seconds, 0
+        round_trips = self.round_trips
+        try:
+            for operation in operations:
+                action, entity = operation[0], operation[1]
+                kwargs = operation[2] if len(operation) > 2 else {}
+                if action == "delete":
+                    self.delete_entity(entity["PartitionKey"], entity["RowKey"])
+                else:
+                    getattr(self, f"{action}_entity")(entity, **kwargs)
+        finally:
+            self.latency_seconds = latency
+            self.round_trips = round_trips
+        return [{} for _ in operations]
+
+    def query_entities(self, query_filter, results_per_page=1000, **kwargs):
+        # Like the service, only the partitions matched by PartitionKey conditions are read;
+        # every entity in them counts as scanned, and the remaining conditions filter rows.
+        # Each page of results after the first costs another round trip.
+        self._round_trip()
+        conditions = parse_filter(query_filter)
+        partition_conditions = [condition for condition in conditions if condition[0] == "PartitionKey"]
+        results = []
+        for (partition_key, row_key), entity in self.entities.items():
+            if not all(matches(entity, condition) for condition in partition_conditions):
+                continue
+            self.entities_scanned += 1
+            if all(matches(entity, condition) for condition in conditions):
+                results.append(dict(entity))
+        for _ in range(1, math.ceil(len(results) / results_per_page)):
+            self._round_trip()
+        return results
+
+    def list_entities(self, **kwargs):
+        self._round_trip()
+        self.entities_scanned += len(self.entities)
+        return [dict(entity) for entity in self.entities.values()]
+
+class InMemoryTableService:
+    def __init__(self, latency_seconds=0.002):
+        self.latency_seconds = latency_seconds
+        self.tables = {}
+
+    def get_table_client(self, table_name, **kwargs):
+        if table_name not in self.tables:
+            self.tables[table_name] = InMemoryTableClient(table_name, self.latency_seconds)
+        return self.tables[table_name]
+
+    def create_table_if_not_exists(self, table_name, **kwargs):
+        return self.get_table_client(table_name)
+
+    @property
+    def round_trips(self):
+        return sum(table.round_trips for table in self.tables.values())
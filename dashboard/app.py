@@ -1,40 +1,68 @@
 import dash
-from dash import dcc, html, Input, Output, State
+from dash import dcc, html, Input, Output, State, Patch
 import plotly.express as px
+import plotly.io as pio
 import pandas as pd
-import threading
-import json
 import geopandas as gpd
-from shapely.geometry import Point
+from dashboard.ward_lookup import WardLookup
+from dashboard.coordinates import decode_coordinates
+from dashboard.figure_cache import FigureCache, with_layout
+from dashboard.ward_geometry import load_ward_geometry
+from dashboard.update_stream import UpdateBroadcaster
+from dashboard.trace_delta import diff_trace_rows, patch_trace
+from dashboard.snapshot_store import create_snapshot_store
+from dashboard.trend_store import create_trend_store
+from dashboard.warm_start import SnapshotFileWriter, read_snapshot_file, load_table_events
+from traffic_ingester.wire_format import wire_format_for, decode_payload
 from datetime import datetime, timezone
-from azure.data.tables import TableServiceClient
 from dotenv import load_dotenv
 import os
-from flask import request
+import threading
+import time
+from flask import request, jsonify, Response
 import dash_bootstrap_components as dbc
 
-# BASE_DIR = os.path.dirname(__file__)
-# load_dotenv(dotenv_path=os.path.join(BASE_DIR, ".env"))
+BASE_DIR = os.path.dirname(__file__)
+load_dotenv(dotenv_path=os.path.join(BASE_DIR, ".env"))
 
 # Later store in Azure Key Vault
-# TABLE_NAME = os.getenv("TABLE_NAME")
-# STORAGE_CONNECTION_STRING = os.getenv("STORAGE_CONNECTION_STRING")
-
-# table_service = TableServiceClient.from_connection_string(conn_str=STORAGE_CONNECTION_STRING)
-
-# # Ensure the table exists before any callbacks run
-# try:
-#     table_service.create_table_if_not_exists(TABLE_NAME)
-#     table_client = table_service.get_table_client(table_name=TABLE_NAME)
-# except Exception as e:
-#     print(f"Warning: could not ensure table exists: {e}")
+TABLE_NAME = os.getenv("TABLE_NAME", "TrafficEvents")
+STORAGE_CONNECTION_STRING = os.getenv("STORAGE_CONNECTION_STRING")
+
+# Warm start: publish the last known events on startup instead of waiting for the next
+# ingester push. DASHBOARD_SNAPSHOT_FILE keeps the enriched frame on disk after every update;
+# EVENT_SNAPSHOT_FILE is the ingester's snapshot (same host), which still needs wards. Files
+# are used while younger than DASHBOARD_SNAPSHOT_MAX_AGE seconds; otherwise the ACTIVE
+# events are read from TABLE_NAME.
+WARM_START = os.getenv("DASHBOARD_WARM_START", "true").lower() == "true"
+SNAPSHOT_FILE = os.getenv("DASHBOARD_SNAPSHOT_FILE")
+EVENT_SNAPSHOT_FILE = os.getenv("EVENT_SNAPSHOT_FILE")
+SNAPSHOT_MAX_AGE = float(os.getenv("DASHBOARD_SNAPSHOT_MAX_AGE", "900"))
 
 # Load Ottawa ward boundaries once at startup
 # Make sure you have the GeoJSON file in your project, e.g. data/ottawa_wards.geojson
-BASE_DIR = os.path.dirname(__file__)
 wards_path = os.path.join(BASE_DIR, "data", "ottawa_wards.geojson")
 wards = gpd.read_file(wards_path).to_crs("EPSG:4326")
-wards_geojson = wards.__geo_interface__
+ward_lookup = WardLookup(wards)
+
+# The choropleth ships a simplified, quantized copy of the ward boundaries (cached on disk);
+# ward assignment above keeps using the full-resolution polygons
+ward_geometry = load_ward_geometry(wards, wards_path, os.path.join(BASE_DIR, "data", "ottawa_wards.simplified.json"))
+wards_geojson = ward_geometry["geojson"]
+
+# "push" streams new data versions to browsers over Server-Sent Events; "poll" keeps the
+# original 1s dcc.Interval poller
+UPDATE_MODE = os.getenv("DASHBOARD_UPDATE_MODE", "push")
+
+# Trend chart choices: frame column per dimension, and the window shown per resolution
+TREND_DIMENSIONS = {"Priority": "Priority", "EventType": "Event type", "NAME": "Ward"}
+TREND_WINDOWS = {
+    "5min": ("Last day (5 min)", 24 * 3600),
+    "hourly": ("Last 2 weeks (hourly)", 14 * 24 * 3600),
+    "daily": ("Last 90 days (daily)", 90 * 24 * 3600)
+}
+
+TREND_TEMPLATE = pio.templates[pio.templates.default].to_plotly_json()
 
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.FLATLY])
 
@@ -72,10 +100,43 @@ app.layout = dbc.Container([
         )
     ], className="g-4"),
 
+    # Trend row: active events over time from the rolling aggregates
+    dbc.Row([
+        dbc.Col(
+            dbc.Card([
+                dbc.CardHeader([
+                    html.Span("Trends", className="me-auto"),
+                    dbc.RadioItems(
+                        id="trend-dimension",
+                        options=[{"label": label, "value": value} for value, label in TREND_DIMENSIONS.items()],
+                        value="Priority",
+                        inline=True,
+                        className="ms-4"
+                    ),
+                    dbc.RadioItems(
+                        id="trend-resolution",
+                        options=[{"label": label, "value": value} for value, (label, _) in TREND_WINDOWS.items()],
+                        value="hourly",
+                        inline=True,
+                        className="ms-4"
+                    )
+                ], className="d-flex align-items-center"),
+                dbc.CardBody(dcc.Graph(id="trend-chart", style={"height": "40vh"}))
+            ], className="shadow-sm")
+        )
+    ], className="g-4 mt-2"),
+
     # Hidden stores for state
-    dcc.Store(id="latest-data-store", storage_type="local"),
+    # Holds only {"version", "count"}; events stay on the server in the enriched frames
+    dcc.Store(id="latest-data-store", storage_type="memory"),
     dcc.Store(id="selected-ward", storage_type="memory"),
-    dcc.Interval(id="poller", interval=1000, n_intervals=0),
+    # Data version and ward currently drawn on the hotspot map, so updates can be sent as deltas
+    dcc.Store(id="hotspot-shown", storage_type="memory"),
+    # Data version currently drawn on the ward choropleth, so updates only patch the counts
+    dcc.Store(id="choropleth-shown", storage_type="memory"),
+    dcc.Interval(id="poller", interval=1000, n_intervals=0, disabled=UPDATE_MODE != "poll"),
+    # Marker that tells assets/update_stream.js to subscribe to pushed updates
+    *([html.Div(id="update-stream", **{"data-url": "/update-stream"})] if UPDATE_MODE == "push" else []),
     # Ward details collapse
     dbc.Collapse(
         dbc.Card([
@@ -99,77 +160,171 @@ app.layout = dbc.Container([
 
 
 
-# Shared state
-latest_df = pd.DataFrame()
-latest_df_lock = threading.Lock()
-update_flag = threading.Event()
+# Shared state: immutable, versioned snapshots of the ward-enriched events. Events get
+# WARD/NAME once when they arrive at /update-dashboard; browsers only carry the version
+# and callbacks read the snapshot frames. DASHBOARD_SNAPSHOT_BACKEND=redis shares the
+# snapshots between dashboard processes (REDIS_URL).
+SNAPSHOT_BACKEND = os.getenv("DASHBOARD_SNAPSHOT_BACKEND", "memory")
+snapshot_store = create_snapshot_store(SNAPSHOT_BACKEND, os.getenv("REDIS_URL"))
 
-# Helper to parse GeoCoordinates string into (lat, lon)
-def extract_coords(geo_str):
-    try:
-        coords = json.loads(geo_str)  # e.g. "[-75.93772, 45.29347]"
-        if isinstance(coords, list) and len(coords) == 2:
-            lon, lat = coords
-            return lat, lon
-    except Exception:
-        pass
-    return None, None
-
-# Helper to assign events to wards
+# Pushes each new data version to the browsers subscribed to /update-stream. Every stream
+# holds a server thread for as long as its tab is open, so keep DASHBOARD_MAX_STREAMS below
+# the server's thread count; tabs over the cap get 503 and poll instead. The broadcaster is
+# fed by the snapshot store, so with the Redis backend every process hears about versions
+# published by the others, not just the one that handled the POST.
+update_broadcaster = UpdateBroadcaster(max_subscribers=int(os.getenv("DASHBOARD_MAX_STREAMS", "32")))
+snapshot_store.subscribe(lambda version, count: update_broadcaster.publish({"version": version, "count": count}))
+
+# Serialized figures by (data version, selected ward, figure type)
+figure_cache = FigureCache(max_entries=int(os.getenv("FIGURE_CACHE_SIZE", "64")))
+
+# Rolling 5-minute/hourly/daily counts per priority, event type and ward, updated on every
+# publish. Kept next to the snapshots: in this process for the memory backend, in Redis
+# (shared by every process and kept across restarts) for the redis backend.
+trend_store = create_trend_store(SNAPSHOT_BACKEND, getattr(snapshot_store, "client", None))
+
+# Rewrites DASHBOARD_SNAPSHOT_FILE in the background after every publish
+snapshot_file_writer = SnapshotFileWriter(SNAPSHOT_FILE) if SNAPSHOT_FILE else None
+
+# Helper to assign events to wards using the prebuilt ward lookup engine
 def assign_events_to_wards(df):
-    gdf = gpd.GeoDataFrame(
-        df,
-        geometry=[Point(xy) for xy in zip(df.Longitude, df.Latitude)],
-        crs="EPSG:4326"
-    )
-    joined = gpd.sjoin(gdf, wards, how="left", predicate="within")
+    joined = df.copy()
+    joined["WARD"], joined["NAME"] = ward_lookup.assign(df["Longitude"].to_numpy(), df["Latitude"].to_numpy())
     return joined
 
-# Endpoint to receive updates from the ingester function
+# Helper to decode coordinates and assign wards for events as stored by the ingester,
+# dropping events without usable coordinates
+def enrich_events(df):
+    if "GeoCoordinates" not in df.columns:
+        return df
+    df["Longitude"], df["Latitude"] = decode_coordinates(df["GeoCoordinates"])
+    df = df.dropna(subset=["Latitude", "Longitude"])
+    return assign_events_to_wards(df)
+
+# Helper to publish a new enriched frame as the next snapshot (call inside snapshot_store.writing())
+def publish_frame(df):
+    snapshot = snapshot_store.publish(df)
+    trend_store.record(df, time.time())
+    if snapshot_file_writer:
+        snapshot_file_writer.submit(df, snapshot.version)
+    return snapshot.version
+
+# Helper to publish the last known events on startup: the dashboard's snapshot file when it
+# is fresh (already ward-enriched), else the ingester's ACTIVE events, else the ACTIVE events
+# in Table Storage; the last two are enriched in one bulk pass. Does nothing once a push (or
+# another dashboard process sharing the store) has published.
+def warm_start_dashboard():
+    started = time.perf_counter()
+    df, source = None, None
+    if SNAPSHOT_FILE:
+        df, source = read_snapshot_file(SNAPSHOT_FILE, SNAPSHOT_MAX_AGE), SNAPSHOT_FILE
+    if df is None and EVENT_SNAPSHOT_FILE:
+        df, source = read_snapshot_file(EVENT_SNAPSHOT_FILE, SNAPSHOT_MAX_AGE), EVENT_SNAPSHOT_FILE
+        if df is not None:
+            df = enrich_events(df)
+    if df is None and STORAGE_CONNECTION_STRING:
+        try:
+            events = load_table_events(STORAGE_CONNECTION_STRING, TABLE_NAME)
+        except Exception as e:
+            print(f"Warm start from {TABLE_NAME} failed: {e}")
+            return None
+        df, source = enrich_events(pd.DataFrame(events)), TABLE_NAME
+    if df is None or df.empty:
+        return None
+
+    with snapshot_store.writing() as latest:
+        if latest.version:
+            return None
+        version = publish_frame(df)
+    print(f"Warm start: published {len(df)} events from {source} in {time.perf_counter() - started:.2f}s")
+    return version
+
+# Helper to get (version, enriched frame) for the version held in latest-data-store,
+# falling back to the latest snapshot when that version has already been evicted
+def get_versioned_frame(data):
+    if not data:
+        return None, pd.DataFrame()
+    snapshot = snapshot_store.get(data.get("version")) or snapshot_store.latest()
+    return snapshot.version, snapshot.frame
+
+# Helper to get the enriched frame for the version held in latest-data-store
+def get_enriched_frame(data):
+    return get_versioned_frame(data)[1]
+
+# Server-Sent Events stream of new data versions (push mode)
+@app.server.route("/update-stream", methods=["GET"])
+def update_stream():
+    if not update_broadcaster.subscribe():
+        return "Too many update streams, poll instead", 503
+    response = Response(
+        update_broadcaster.stream(reserved=True),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+    # Release the slot when the connection closes, even if the stream never started
+    response.call_on_close(update_broadcaster.unsubscribe)
+    return response
+
+# Stats endpoint for the figure cache (hits, misses, evictions, size)
+@app.server.route("/figure-cache-stats", methods=["GET"])
+def figure_cache_stats():
+    return jsonify(figure_cache.stats())
+
+# Endpoint to receive updates from the ingester function. A full snapshot replaces the
+# current events; a "delta" payload upserts changed events and drops removed RowKeys.
+# Bodies are JSON or, by Content-Type, one of the compact binary wire formats.
 @app.server.route("/update-dashboard", methods=["POST"])
 def update_dashboard():
-    global latest_df
+    wire_format = wire_format_for(request.content_type)
+    if wire_format is None:
+        return f"Unsupported wire format: {request.content_type}", 415
+
     try:
-        payload = request.get_json(silent=True) or {}
+        payload = decode_payload(request.get_data(), wire_format) or {}
         events = payload.get("events", [])
+        removed = payload.get("removed", [])
+        is_delta = payload.get("mode") == "delta"
         
         # Bail out early if no events
-        if not events:
+        if not events and not (is_delta and removed):
             return "No events provided, dashboard not updated", 400
 
-        df = pd.DataFrame(events)
-
-        if "GeoCoordinates" in df.columns:
-            df[["Latitude", "Longitude"]] = df["GeoCoordinates"].apply(
-                lambda g: pd.Series(extract_coords(g))
-            )
-            df = df.dropna(subset=["Latitude", "Longitude"])
-
-        # Only update if df is non-empty after processing
-        if not df.empty:
-            with latest_df_lock:
-                latest_df = df
-                update_flag.set()
-            return "Dashboard updated", 200
-        else:
-            return "No valid events after processing, dashboard not updated", 400
+        # Enrich only the incoming events; rows kept from the previous frame already have wards
+        df = enrich_events(pd.DataFrame(events))
+
+        with snapshot_store.writing() as latest:
+            if is_delta:
+                # Deltas need a snapshot to apply to; ask the ingester for a full one
+                if latest.frame.empty:
+                    return "No snapshot to apply delta to, send full snapshot", 409
+                # Every incoming RowKey replaces its old row, including events that enrichment
+                # dropped for invalid coordinates, so they don't keep a stale position
+                replaced = set(removed) | {event.get("RowKey") for event in events}
+                kept = latest.frame[~latest.frame["RowKey"].isin(replaced)]
+                df = pd.concat([kept, df], ignore_index=True) if not df.empty else kept.reset_index(drop=True)
+
+            # Only update if df is non-empty after processing
+            if not df.empty:
+                publish_frame(df)
+                return "Dashboard updated", 200
+        return "No valid events after processing, dashboard not updated", 400
 
     except Exception as e:
         print(f"Update failed: {e}")
         return f"Error: {str(e)}", 400
 
-# Dash callback to poll for updates
+# Dash callback to poll for updates (poll mode; push mode sets the store from update_stream.js)
 @app.callback(
     Output("latest-data-store", "data"),
-    Input("poller", "n_intervals")
+    Input("poller", "n_intervals"),
+    State("latest-data-store", "data")
 )
-def poll_for_updates(n):
-    if not update_flag.is_set():
+def poll_for_updates(n, data):
+    # Each tab compares against the version it last saw, so every tab sees every update
+    snapshot = snapshot_store.latest()
+    if snapshot.version == 0 or (data and data.get("version") == snapshot.version):
         raise dash.exceptions.PreventUpdate
-    with latest_df_lock:
-        df = latest_df.copy()
-        update_flag.clear()
-    return df.to_dict("records")
+    return {"version": snapshot.version, "count": len(snapshot.frame)}
 
 # Store the selected ward when a choropleth region is clicked
 @app.callback(
@@ -193,9 +348,10 @@ def display_ward_details(ward, data):
     if not ward or not data:
         return "Click on a ward to see details."
 
-    df = pd.DataFrame(data)
-    joined = assign_events_to_wards(df)
-    ward_events = joined[joined["WARD"] == ward]
+    df = get_enriched_frame(data)
+    if df.empty:
+        return "Click on a ward to see details."
+    ward_events = df[df["WARD"] == ward]
 
     if ward_events.empty:
         return f"Ward {ward}: No events."
@@ -230,15 +386,8 @@ def toggle_collapse(ward, close_clicks, is_open):
     return is_open
 
 
-# Dash callback to update the hotspot density map
-@app.callback(
-    Output("hotspot-map", "figure"),
-    Input("latest-data-store", "data"),
-    Input("selected-ward", "data"),   # ward number or None
-    State("hotspot-map", "relayoutData")
-)
-def update_hotspot_map(data, ward_click, relayout_data):
-    df = pd.DataFrame(data)
+# Helper to build the hotspot density map for a ward-enriched frame
+def build_hotspot_map(df, ward_click):
     if df.empty:
         return px.density_map(
             pd.DataFrame(columns=["Latitude", "Longitude"]),
@@ -248,14 +397,15 @@ def update_hotspot_map(data, ward_click, relayout_data):
             zoom=10,
             map_style="carto-positron",
             title="Waiting for traffic data..."
-        )
-
-    # Always enrich with ward info
-    df = assign_events_to_wards(df)
+        ).to_dict()
 
-    # If a ward was clicked, filter
+    # If a ward was clicked, filter and centre on that ward
+    center = {"lat": 45.4215, "lon": -75.6972}
     if ward_click:
         df = df[df["WARD"] == ward_click]
+        ward_info = ward_geometry["wards"].get(str(ward_click))
+        if ward_info:
+            center = {"lat": ward_info["centroid"][1], "lon": ward_info["centroid"][0]}
 
     if df.empty:
         return px.density_map(
@@ -266,7 +416,7 @@ def update_hotspot_map(data, ward_click, relayout_data):
             zoom=10,
             map_style="carto-positron",
             title="No events for selected ward"
-        )
+        ).to_dict()
 
     fig = px.density_map(
         df,
@@ -276,40 +426,90 @@ def update_hotspot_map(data, ward_click, relayout_data):
         radius=15,
         hover_name="Location",
         hover_data=["EventType", "Priority", "Status", "WARD", "NAME"],
-        center={"lat": 45.4215, "lon": -75.6972},
+        center=center,
         zoom=10,
         map_style="carto-positron",
         title="Traffic Hotspots"
+    ).to_dict()
+    # Plain lists rather than packed arrays, so later deltas can delete/extend points
+    fig["data"][0]["lat"] = df["Latitude"].tolist()
+    fig["data"][0]["lon"] = df["Longitude"].tolist()
+    return fig
+
+# Frame columns behind each hotspot point, and the trace arrays built from them
+HOTSPOT_ROW_COLUMNS = ["RowKey", "Latitude", "Longitude", "Location", "EventType", "Priority", "Status", "WARD", "NAME"]
+HOTSPOT_TRACE_ARRAYS = {"lat": 1, "lon": 2, "hovertext": 3, "customdata": slice(4, 9)}
+
+# Helper to build a Patch that moves the hotspot map from one data version to another,
+# or None when a full figure is needed (old version evicted, empty map, large change)
+def build_hotspot_patch(shown_version, version, ward_click):
+    old_snapshot = snapshot_store.get(shown_version)
+    new_snapshot = snapshot_store.get(version)
+    if old_snapshot is None or new_snapshot is None:
+        return None
+    old_df, new_df = old_snapshot.frame, new_snapshot.frame
+
+    if ward_click:
+        old_df = old_df[old_df["WARD"] == ward_click]
+        new_df = new_df[new_df["WARD"] == ward_click]
+    if old_df.empty or new_df.empty:
+        return None
+
+    delta = diff_trace_rows(
+        list(old_df[HOTSPOT_ROW_COLUMNS].itertuples(index=False, name=None)),
+        list(new_df[HOTSPOT_ROW_COLUMNS].itertuples(index=False, name=None))
+    )
+    if delta is None:
+        return None
+
+    patch = Patch()
+    patch_trace(patch["data"][0], HOTSPOT_TRACE_ARRAYS, *delta)
+    return patch
+
+# Dash callback to update the hotspot density map
+@app.callback(
+    Output("hotspot-map", "figure"),
+    Output("hotspot-shown", "data"),
+    Input("latest-data-store", "data"),
+    Input("selected-ward", "data"),   # ward number or None
+    State("hotspot-map", "relayoutData"),
+    State("hotspot-shown", "data")
+)
+def update_hotspot_map(data, ward_click, relayout_data, shown):
+    version, df = get_versioned_frame(data)
+    shown_now = {"version": version, "ward": ward_click}
+
+    # Same ward, newer data: send only the points that changed since the version on screen
+    if shown and shown.get("ward") == ward_click and shown.get("version") not in (None, version):
+        patch = build_hotspot_patch(shown["version"], version, ward_click)
+        if patch is not None:
+            return patch, shown_now
+
+    fig = figure_cache.get_or_build(
+        (version, ward_click, "hotspot-map"),
+        lambda: build_hotspot_map(df, ward_click)
     )
 
     # Preserve user zoom/pan if present
-    if relayout_data:
+    if relayout_data and not df.empty:
         center = relayout_data.get("map.center")
         zoom = relayout_data.get("map.zoom")
         if center and zoom:
-            fig.update_layout(map_center=center, map_zoom=zoom)
+            fig = with_layout(fig, map={"center": center, "zoom": zoom})
 
-    return fig
+    return fig, shown_now
 
 
-# Dash callback to update the event type bar chart
-@app.callback(
-    Output("event-type-bar", "figure"),
-    Input("latest-data-store", "data"),
-    Input("selected-ward", "data"),
-    State("event-type-bar", "relayoutData")
-)
-def update_event_type_bar(data, ward_click, relayout_data):
-    df = pd.DataFrame(data)
+# Helper to build the priority bar chart for a ward-enriched frame
+def build_event_type_bar(df, ward_click):
     if df.empty:
-        return px.bar(title="Waiting for traffic data...")
+        return px.bar(title="Waiting for traffic data...").to_dict()
 
     if ward_click:
-        joined = assign_events_to_wards(df)
-        df = joined[joined["WARD"] == ward_click]
+        df = df[df["WARD"] == ward_click]
 
     if df.empty:
-        return px.bar(title="No events for selected ward")
+        return px.bar(title="No events for selected ward").to_dict()
 
     counts = df["Priority"].value_counts().reset_index()
     counts.columns = ["Priority", "Count"]
@@ -317,28 +517,39 @@ def update_event_type_bar(data, ward_click, relayout_data):
     fig = px.bar(counts, x="Priority", y="Count",
                  title="Events by Priority", text="Count")
     fig.update_layout(yaxis_title="Number of Events")
+    return fig.to_dict()
+
+# Dash callback to update the event type bar chart
+@app.callback(
+    Output("event-type-bar", "figure"),
+    Input("latest-data-store", "data"),
+    Input("selected-ward", "data"),
+    State("event-type-bar", "relayoutData")
+)
+def update_event_type_bar(data, ward_click, relayout_data):
+    version, df = get_versioned_frame(data)
+    fig = figure_cache.get_or_build(
+        (version, ward_click, "event-type-bar"),
+        lambda: build_event_type_bar(df, ward_click)
+    )
 
-    if relayout_data:
+    if relayout_data and not df.empty:
         if "xaxis.range" in relayout_data:
-            fig.update_xaxes(range=relayout_data["xaxis.range"])
+            fig = with_layout(fig, xaxis={"range": relayout_data["xaxis.range"]})
         if "yaxis.range" in relayout_data:
-            fig.update_yaxes(range=relayout_data["yaxis.range"])
+            fig = with_layout(fig, yaxis={"range": relayout_data["yaxis.range"]})
     return fig
 
-@app.callback(
-    Output("ward-choropleth", "figure"),
-    Input("latest-data-store", "data"),
-    State("ward-choropleth", "relayoutData")
-)
-def update_ward_choropleth(data, relayout_data):
-    df = pd.DataFrame(data)
-    if df.empty or "Latitude" not in df.columns or "Longitude" not in df.columns:
-        wards_with_counts = wards.copy()
-        wards_with_counts["Count"] = 0
-    else:
-        joined = assign_events_to_wards(df)
-        counts = joined.groupby(["WARD", "NAME"]).size().reset_index(name="Count")
-        wards_with_counts = wards.merge(counts, on=["WARD", "NAME"], how="left").fillna(0)
+# Helper to count events per ward, in the ward order used by the choropleth trace
+def ward_counts(df):
+    if df.empty or "WARD" not in df.columns:
+        return [0] * len(wards)
+    return df["WARD"].value_counts().reindex(wards["WARD"], fill_value=0).tolist()
+
+# Helper to build the ward choropleth for a ward-enriched frame
+def build_ward_choropleth(df):
+    wards_with_counts = wards[["WARD", "NAME", "NAME_FR"]].copy()
+    wards_with_counts["Count"] = ward_counts(df)
 
     fig = px.choropleth(
         wards_with_counts,
@@ -352,12 +563,85 @@ def update_ward_choropleth(data, relayout_data):
     )
     fig.update_traces(marker_line_width=1.5, marker_line_color="black")
     fig.update_geos(fitbounds="locations", visible=False)
+    return fig.to_dict()
+
+@app.callback(
+    Output("ward-choropleth", "figure"),
+    Output("choropleth-shown", "data"),
+    Input("latest-data-store", "data"),
+    State("ward-choropleth", "relayoutData"),
+    State("choropleth-shown", "data")
+)
+def update_ward_choropleth(data, relayout_data, shown_version):
+    version, df = get_versioned_frame(data)
+
+    # Once a full map for an earlier version is on the page only the per-ward counts change,
+    # so patch the trace's z values instead of re-sending the ward geometry
+    if shown_version is not None and shown_version != version:
+        patch = Patch()
+        patch["data"][0]["z"] = ward_counts(df)
+        return patch, version
+
+    # The choropleth always shows every ward, so the selected ward is not part of the key
+    fig = figure_cache.get_or_build((version, None, "ward-choropleth"), lambda: build_ward_choropleth(df))
+
     if relayout_data and "geo.center" in relayout_data:
-        fig.update_geos(
-            center=relayout_data.get("geo.center"),
-            projection_scale=relayout_data.get("geo.projection.scale", 1)
-        )
-    return fig
+        projection = fig["layout"].get("geo", {}).get("projection", {})
+        fig = with_layout(fig, geo={
+            "center": relayout_data.get("geo.center"),
+            "projection": {**projection, "scale": relayout_data.get("geo.projection.scale", 1)}
+        })
+    return fig, version
+
+# Helper to build the trend line chart from one dimension's bucketed counts. Weeks of buckets
+# times every ward is too many points for plotly.express (hundreds of ms per figure), so
+# the figure dict is written directly with the default template computed once.
+def build_trend_chart(series, dimension):
+    if trend_store.last_recorded is None:
+        return px.line(title="Waiting for traffic data...").to_dict()
+
+    label = TREND_DIMENSIONS[dimension]
+    times = series.index.strftime("%Y-%m-%dT%H:%M:%SZ").tolist()
+    return {
+        "data": [
+            {
+                "type": "scatter",
+                "mode": "lines",
+                "name": str(category),
+                "x": times,
+                "y": series[category].tolist(),
+                "line": {"shape": "hv"},
+                "hovertemplate": f"{label}={category}<br>%{{x}}<br>Active events=%{{y}}<extra></extra>"
+            }
+            for category in series.columns
+        ],
+        "layout": {
+            "template": TREND_TEMPLATE,
+            "title": {"text": f"Active events by {label.lower()}"},
+            "xaxis": {"type": "date"},
+            "yaxis": {"title": {"text": "Active events"}, "rangemode": "tozero"},
+            "legend": {"title": {"text": label}}
+        }
+    }
+
+# Dash callback to update the trend chart; reads only the pre-bucketed counts
+@app.callback(
+    Output("trend-chart", "figure"),
+    Input("latest-data-store", "data"),
+    Input("trend-dimension", "value"),
+    Input("trend-resolution", "value")
+)
+def update_trend_chart(data, dimension, resolution):
+    version = data.get("version") if data else None
+    end = time.time()
+    start = end - TREND_WINDOWS[resolution][1]
+    seconds = trend_store.resolutions[resolution][0]
+
+    # Keyed by the current bucket too, so the window moves forward between data versions
+    return figure_cache.get_or_build(
+        (version, None, f"trend-chart:{dimension}:{resolution}:{int(end // seconds)}"),
+        lambda: build_trend_chart(trend_store.series(dimension, resolution, start, end), dimension)
+    )
 
 @app.callback(
     Output("last-updated", "children"),
@@ -368,6 +652,10 @@ def update_timestamp(data):
         return "Last updated: no data yet"
     return f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
 
+# Warm start in the background, so the server answers (with empty panels) straight away
+if WARM_START and (SNAPSHOT_FILE or EVENT_SNAPSHOT_FILE or STORAGE_CONNECTION_STRING):
+    threading.Thread(target=warm_start_dashboard, name="dashboard-warm-start", daemon=True).start()
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    # Threaded, so open /update-stream connections don't block other requests
+    app.run(debug=True, threaded=True)
@@ -0,0 +1,43 @@
+// Server push for dashboard updates: listens on /update-stream (Server-Sent Events) and
+// writes each new data version into latest-data-store, replacing the 1s dcc.Interval poller.
+// Only active when the layout contains the #update-stream marker (push mode). If the server
+// refuses the stream (503 once DASHBOARD_MAX_STREAMS are open), the tab falls back to the poller.
+(function () {
+    var attempts = 0;
+    var lastVersion = null;
+
+    function connect() {
+        var marker = document.getElementById("update-stream");
+        var clientside = window.dash_clientside;
+        if (!marker || !clientside || !clientside.set_props) {
+            // Dash renders the layout after assets load; give up after ~10s (poll mode)
+            if (++attempts < 40) {
+                setTimeout(connect, 250);
+            }
+            return;
+        }
+
+        // EventSource reconnects on its own using the server's retry interval
+        var source = new EventSource(marker.dataset.url);
+        source.onmessage = function (event) {
+            var update = JSON.parse(event.data);
+            if (update.version === lastVersion) {
+                return;
+            }
+            lastVersion = update.version;
+            clientside.set_props("latest-data-store", {data: update});
+        };
+        // CLOSED means EventSource will not reconnect (a non-200 answer such as 503)
+        source.onerror = function () {
+            if (source.readyState === EventSource.CLOSED) {
+                clientside.set_props("poller", {disabled: false});
+            }
+        };
+    }
+
+    if (document.readyState === "loading") {
+        document.addEventListener("DOMContentLoaded", connect);
+    } else {
+        connect();
+    }
+})();
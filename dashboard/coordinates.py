@@ -0,0 +1,66 @@
+import json
+import numpy as np
+
+# Helper to collect every [lon, lat] pair from a (possibly nested) coordinate list
+def collect_points(value, points):
+    if isinstance(value, (list, tuple)):
+        if len(value) == 2 and all(isinstance(part, (int, float)) for part in value):
+            points.append(value)
+        else:
+            for part in value:
+                collect_points(part, points)
+    return points
+
+# Helper to decode one coordinate value into (lon, lat). Accepts "[lon, lat]" strings,
+# [lon, lat] lists and nested geometry forms (line/polygon coordinate lists or GeoJSON
+# objects, as lists or JSON strings); nested geometries are reduced to the mean of their
+# vertices. Returns NaN when nothing usable is found.
+def decode_coordinate(value):
+    try:
+        if isinstance(value, str):
+            value = json.loads(value)
+        if isinstance(value, dict):
+            value = value.get("coordinates")
+        points = collect_points(value, [])
+        if points:
+            lon, lat = np.mean(np.asarray(points, dtype=np.float64), axis=0)
+            return lon, lat
+    except (TypeError, ValueError):
+        pass
+    return np.nan, np.nan
+
+# Helper to decode a whole GeoCoordinates column into float Longitude/Latitude arrays.
+# Plain "[lon, lat]" strings are joined and converted in one bulk pass and plain [lon, lat]
+# lists in one array conversion; only the remaining rows are decoded one by one.
+def decode_coordinates(values, dtype=np.float64):
+    values = list(values)
+    longitudes = np.full(len(values), np.nan, dtype=dtype)
+    latitudes = np.full(len(values), np.nan, dtype=dtype)
+    string_rows, list_rows, other_rows = [], [], []
+
+    for row, value in enumerate(values):
+        value_type = type(value)
+        if value_type is str and value.count(",") == 1 and value.count("[") == 1:
+            string_rows.append(row)
+        elif value_type is list and len(value) == 2 and type(value[0]) in (int, float) and type(value[1]) in (int, float):
+            list_rows.append(row)
+        else:
+            other_rows.append(row)
+
+    if string_rows:
+        joined = ",".join([values[row] for row in string_rows]).replace("[", "").replace("]", "")
+        try:
+            pairs = np.array(joined.split(","), dtype=np.float64).reshape(-1, 2)
+            longitudes[string_rows], latitudes[string_rows] = pairs[:, 0], pairs[:, 1]
+        except ValueError:
+            # A malformed string spoils the bulk conversion; decode those rows individually
+            other_rows.extend(string_rows)
+
+    if list_rows:
+        pairs = np.array([values[row] for row in list_rows], dtype=np.float64)
+        longitudes[list_rows], latitudes[list_rows] = pairs[:, 0], pairs[:, 1]
+
+    for row in other_rows:
+        longitudes[row], latitudes[row] = decode_coordinate(values[row])
+
+    return longitudes, latitudes
@@ -0,0 +1,59 @@
+import threading
+from collections import OrderedDict
+
+# Bounded LRU cache of serialized figures keyed by (data version, selected ward, figure type).
+# Repeated ward clicks, poll ticks without new data and extra browser sessions reuse the
+# cached figure dict instead of rebuilding the Plotly figure.
+class FigureCache:
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # Return the cached figure for key, building (and caching) it on a miss
+    def get_or_build(self, key, build):
+        with self.lock:
+            figure = self.entries.get(key)
+            if figure is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return figure
+            self.misses += 1
+
+        # Build outside the lock so one slow figure does not block other callbacks
+        figure = build()
+        with self.lock:
+            self.entries[key] = figure
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return figure
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self.entries),
+                "max_entries": self.max_entries
+            }
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+# Helper to return a copy of a cached figure dict with some layout sections merged in,
+# leaving the cached figure untouched
+def with_layout(figure, **sections):
+    layout = dict(figure.get("layout", {}))
+    for name, values in sections.items():
+        layout[name] = {**layout.get(name, {}), **values}
+    return {**figure, "layout": layout}
@@ -0,0 +1,183 @@
+import json
+import pickle
+import threading
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+import pandas as pd
+
+# Published dashboard state: a data version and its ward-enriched frame. Frames are never
+# mutated once published, so every reader shares the same object without copying.
+Snapshot = namedtuple("Snapshot", ["version", "frame"])
+
+EMPTY_SNAPSHOT = Snapshot(0, pd.DataFrame())
+
+# Versions kept readable, so callbacks still drawing an older version see a consistent frame
+DEFAULT_HISTORY = 4
+
+# In-process snapshot store. Readers take the current snapshot with a plain attribute read
+# (the publish is a single reference swap); only writers serialize on a lock.
+class SnapshotStore:
+    def __init__(self, history=DEFAULT_HISTORY):
+        self.history = history
+        self.write_lock = threading.Lock()
+        self.snapshots = OrderedDict()
+        self.current = EMPTY_SNAPSHOT
+        self.listeners = []
+
+    # Call callback(version, count) after every publish, e.g. to push the version to open tabs
+    def subscribe(self, callback):
+        self.listeners.append(callback)
+
+    def latest(self):
+        return self.current
+
+    # Return the snapshot for a version, or None once it has dropped out of the history
+    def get(self, version):
+        if version == self.current.version:
+            return self.current
+        return self.snapshots.get(version)
+
+    # Hold the write lock while an update is merged into the latest snapshot and published
+    @contextmanager
+    def writing(self):
+        with self.write_lock:
+            yield self.current
+
+    # Publish a new frame as the next version (call inside writing())
+    def publish(self, frame):
+        snapshot = Snapshot(self.current.version + 1, frame)
+        self.snapshots[snapshot.version] = snapshot
+        while len(self.snapshots) > self.history:
+            self.snapshots.popitem(last=False)
+        self.current = snapshot
+        notify(self.listeners, snapshot.version, len(frame))
+        return snapshot
+
+# Run version listeners, so one failing callback cannot break a publish or the others
+def notify(listeners, version, count):
+    for callback in listeners:
+        try:
+            callback(version, count)
+        except Exception as e:
+            print(f"Snapshot listener failed for version {version}: {e!r}")
+
+# Snapshot store shared by several dashboard processes (e.g. gunicorn workers) through Redis.
+# Frames are pickled under one key per version and the latest version number under another;
+# each process keeps the frames it has already loaded, so repeated reads of a version cost
+# nothing after the first. The current version never expires (an unchanged feed publishes
+# nothing for hours); a version only starts its ttl_seconds once a newer one replaces it.
+# Every publish is also announced on the {prefix}:versions channel, so subscribe() callbacks
+# run in every process, not just the one that published.
+class RedisSnapshotStore:
+    def __init__(self, client, prefix="dashboard:snapshot", history=DEFAULT_HISTORY, ttl_seconds=3600, lock_timeout=30,
+                 reconnect_seconds=1.0, connect_timeout=10.0):
+        self.client = client
+        self.prefix = prefix
+        self.history = history
+        self.ttl_seconds = ttl_seconds
+        self.lock_timeout = lock_timeout
+        self.reconnect_seconds = reconnect_seconds
+        self.connect_timeout = connect_timeout
+        self.loaded = OrderedDict()
+        self.loaded_lock = threading.Lock()
+        self.listeners = []
+        self.listener_thread = None
+        self.subscribed = threading.Event()
+        self.stopped = threading.Event()
+        self.notified_version = 0
+
+    def latest(self):
+        version = int(self.client.get(f"{self.prefix}:version") or 0)
+        return self.get(version) or EMPTY_SNAPSHOT
+
+    def get(self, version):
+        if not version:
+            return EMPTY_SNAPSHOT if version == 0 else None
+
+        with self.loaded_lock:
+            snapshot = self.loaded.get(version)
+        if snapshot is not None:
+            return snapshot
+
+        payload = self.client.get(f"{self.prefix}:{version}")
+        if payload is None:
+            return None
+        return self.remember(Snapshot(version, pickle.loads(payload)))
+
+    def remember(self, snapshot):
+        with self.loaded_lock:
+            self.loaded[snapshot.version] = snapshot
+            while len(self.loaded) > self.history:
+                self.loaded.popitem(last=False)
+        return snapshot
+
+    # Serialize writers across processes with a Redis lock
+    @contextmanager
+    def writing(self):
+        with self.client.lock(f"{self.prefix}:lock", timeout=self.lock_timeout):
+            yield self.latest()
+
+    # Write the frame before bumping the version, so readers never see a version without data
+    def publish(self, frame):
+        previous = int(self.client.get(f"{self.prefix}:version") or 0)
+        version = previous + 1
+        pipeline = self.client.pipeline()
+        pipeline.set(f"{self.prefix}:{version}", pickle.dumps(frame, protocol=pickle.HIGHEST_PROTOCOL))
+        pipeline.set(f"{self.prefix}:version", version)
+        if previous:
+            # Superseded versions stay readable a while for tabs still applying deltas to them
+            pipeline.expire(f"{self.prefix}:{previous}", self.ttl_seconds)
+        pipeline.publish(f"{self.prefix}:versions", json.dumps({"version": version, "count": len(frame)}))
+        pipeline.execute()
+        return self.remember(Snapshot(version, frame))
+
+    # Call callback(version, count) whenever any process publishes. The first call starts a
+    # listener thread and raises ConnectionError if the channel cannot be joined in time.
+    def subscribe(self, callback):
+        self.listeners.append(callback)
+        if self.listener_thread is None:
+            self.listener_thread = threading.Thread(target=self.listen, name="snapshot-versions", daemon=True)
+            self.listener_thread.start()
+            if not self.subscribed.wait(self.connect_timeout):
+                self.close()
+                raise ConnectionError(f"Could not subscribe to Redis channel {self.prefix}:versions within {self.connect_timeout:g}s")
+
+    def listen(self):
+        while not self.stopped.is_set():
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(f"{self.prefix}:versions")
+                # Versions published while disconnected are lost, so catch up on the latest
+                latest = self.latest()
+                self.subscribed.set()
+                self.announce(latest.version, len(latest.frame))
+                while not self.stopped.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None and message["type"] == "message":
+                        update = json.loads(message["data"])
+                        self.announce(update["version"], update["count"])
+            except Exception as e:
+                print(f"Snapshot version channel lost, resubscribing: {e!r}")
+                self.stopped.wait(self.reconnect_seconds)
+            finally:
+                pubsub.close()
+
+    # Notify listeners once per version, skipping duplicates seen again after a reconnect
+    def announce(self, version, count):
+        if version > self.notified_version:
+            self.notified_version = version
+            notify(self.listeners, version, count)
+
+    # Stop the listener thread
+    def close(self):
+        self.stopped.set()
+        if self.listener_thread is not None:
+            self.listener_thread.join(timeout=5)
+
+# Helper to create the snapshot store for DASHBOARD_SNAPSHOT_BACKEND ("memory" or "redis")
+def create_snapshot_store(backend="memory", redis_url=None):
+    if backend == "redis":
+        # Optional dependency, only needed for multi-process deployments
+        import redis
+        return RedisSnapshotStore(redis.Redis.from_url(redis_url or "redis://localhost:6379/0"))
+    return SnapshotStore()
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from dashboard.coordinates import decode_coordinate, decode_coordinates
+
+# Test that strings, lists and nested geometry forms decode to float columns in one call
+def test_decode_coordinates_handles_mixed_forms():
+    values = [
+        "[-75.69, 45.40]",
+        [-75.70, 45.41],
+        "[[-75.0, 45.0], [-75.2, 45.2]]",
+        {"type": "Point", "coordinates": [-75.5, 45.5]},
+        '{"type": "LineString", "coordinates": [[-75.0, 45.0], [-76.0, 46.0]]}',
+        None,
+        "not coordinates"
+    ]
+
+    longitudes, latitudes = decode_coordinates(values)
+
+    assert longitudes.dtype == np.float64 and latitudes.dtype == np.float64
+    assert longitudes[:5] == pytest.approx([-75.69, -75.70, -75.1, -75.5, -75.5])
+    assert latitudes[:5] == pytest.approx([45.40, 45.41, 45.1, 45.5, 45.5])
+    assert np.isnan(longitudes[5:]).all() and np.isnan(latitudes[5:]).all()
+
+# Test that a malformed string in the bulk path falls back to per-row decoding
+def test_decode_coordinates_falls_back_on_malformed_strings():
+    longitudes, latitudes = decode_coordinates(["[-75.69, 45.40]", "[abc, 45.0]"], dtype=np.float32)
+
+    assert longitudes.dtype == np.float32
+    assert longitudes[0] == pytest.approx(-75.69) and latitudes[0] == pytest.approx(45.40)
+    assert np.isnan(longitudes[1]) and np.isnan(latitudes[1])
+
+# Test that a single value with nothing usable decodes to NaN
+def test_decode_coordinate_returns_nan_without_points():
+    assert all(np.isnan(part) for part in decode_coordinate({"type": "Point"}))
@@ -0,0 +1,36 @@
+from unittest.mock import MagicMock
+from dashboard.figure_cache import FigureCache, with_layout
+
+# Test that repeated keys are served from the cache and counted as hits
+def test_figure_cache_hits_and_misses():
+    cache = FigureCache(max_entries=4)
+    build = MagicMock(return_value={"data": [], "layout": {}})
+
+    first = cache.get_or_build((1, None, "bar"), build)
+    second = cache.get_or_build((1, None, "bar"), build)
+
+    assert first is second
+    assert build.call_count == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hit_rate"] == 0.5
+
+# Test that the least recently used figure is evicted once the cache is full
+def test_figure_cache_evicts_least_recently_used():
+    cache = FigureCache(max_entries=2)
+    cache.get_or_build((1, None, "bar"), dict)
+    cache.get_or_build((1, "5", "bar"), dict)
+    cache.get_or_build((1, None, "bar"), dict)
+    cache.get_or_build((2, None, "bar"), dict)
+
+    assert list(cache.entries) == [(1, None, "bar"), (2, None, "bar")]
+    assert cache.stats()["evictions"] == 1
+
+# Test that per-session layout tweaks do not leak into the cached figure
+def test_with_layout_leaves_cached_figure_untouched():
+    cached = {"data": [], "layout": {"map": {"zoom": 10, "style": "carto-positron"}}}
+
+    updated = with_layout(cached, map={"zoom": 12})
+
+    assert updated["layout"]["map"] == {"zoom": 12, "style": "carto-positron"}
+    assert cached["layout"]["map"]["zoom"] == 10
@@ -0,0 +1,93 @@
+import pytest
+import pandas as pd
+from dashboard.snapshot_store import SnapshotStore, RedisSnapshotStore, EMPTY_SNAPSHOT
+
+# Test that publishing swaps in a new version and readers share the frame without copying
+def test_snapshot_store_publishes_versions():
+    store = SnapshotStore(history=2)
+    assert store.latest() is EMPTY_SNAPSHOT
+
+    frames = [pd.DataFrame({"RowKey": [str(i)]}) for i in range(3)]
+    for frame in frames:
+        with store.writing():
+            store.publish(frame)
+
+    assert store.latest().version == 3
+    assert store.latest().frame is frames[2]
+    assert store.get(2).frame is frames[1]
+    assert store.get(1) is None
+
+# Test that two processes sharing Redis see each other's snapshots
+def test_redis_snapshot_store_shares_snapshots_between_processes():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # fakeredis needs Lua scripting for redis-py locks
+    server = fakeredis.FakeServer()
+    writer = RedisSnapshotStore(fakeredis.FakeRedis(server=server))
+    reader = RedisSnapshotStore(fakeredis.FakeRedis(server=server))
+    assert reader.latest() is EMPTY_SNAPSHOT
+
+    with writer.writing() as latest:
+        assert latest.version == 0
+        writer.publish(pd.DataFrame({"RowKey": ["1", "2"]}))
+    with writer.writing() as latest:
+        writer.publish(pd.concat([latest.frame, pd.DataFrame({"RowKey": ["3"]})], ignore_index=True))
+
+    snapshot = reader.latest()
+    assert snapshot.version == 2
+    assert list(snapshot.frame["RowKey"]) == ["1", "2", "3"]
+    assert reader.latest().frame is snapshot.frame
+    assert list(reader.get(1).frame["RowKey"]) == ["1", "2"]
+    assert reader.get(5) is None
+
+# Test that only superseded versions expire, so an unchanged feed never empties the store
+def test_redis_snapshot_store_keeps_current_version():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    client = fakeredis.FakeRedis()
+    store = RedisSnapshotStore(client, ttl_seconds=60)
+
+    with store.writing():
+        store.publish(pd.DataFrame({"RowKey": ["1"]}))
+    assert client.ttl("dashboard:snapshot:1") == -1
+
+    with store.writing():
+        store.publish(pd.DataFrame({"RowKey": ["2"]}))
+    assert 0 < client.ttl("dashboard:snapshot:1") <= 60
+    assert client.ttl("dashboard:snapshot:2") == -1
+
+# Test that every store subscriber hears about a publish, whichever process made it
+def test_redis_snapshot_store_notifies_every_process():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    from dashboard.update_stream import UpdateBroadcaster
+    server = fakeredis.FakeServer()
+    workers = []
+    for _ in range(2):
+        store = RedisSnapshotStore(fakeredis.FakeRedis(server=server))
+        broadcaster = UpdateBroadcaster()
+        store.subscribe(lambda version, count, broadcaster=broadcaster: broadcaster.publish({"version": version, "count": count}))
+        workers.append((store, broadcaster))
+
+    try:
+        streams = [broadcaster.stream(heartbeat_seconds=5) for _, broadcaster in workers]
+        for stream in streams:
+            assert next(stream).startswith("retry:")
+
+        writer = workers[0][0]
+        with writer.writing():
+            writer.publish(pd.DataFrame({"RowKey": ["1", "2"]}))
+
+        for stream in streams:
+            assert next(stream) == 'data: {"version": 1, "count": 2}\n\n'
+    finally:
+        for store, _ in workers:
+            store.close()
+
+# Test that the in-memory store calls its listeners on publish
+def test_snapshot_store_notifies_listeners():
+    store = SnapshotStore()
+    seen = []
+    store.subscribe(lambda version, count: seen.append((version, count)))
+    with store.writing():
+        store.publish(pd.DataFrame({"RowKey": ["1", "2", "3"]}))
+    assert seen == [(1, 3)]
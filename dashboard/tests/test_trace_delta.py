@@ -0,0 +1,18 @@
+from dashboard.trace_delta import diff_trace_rows
+
+# Test that deleting the dropped rows and appending the rest reproduces the new rows
+def test_diff_trace_rows_reproduces_new_rows():
+    old_rows = [("1", 1.0), ("2", 2.0), ("3", 3.0), ("4", 4.0), ("5", 5.0), ("6", 6.0)]
+    new_rows = [("1", 1.0), ("3", 3.0), ("5", 5.0), ("6", 6.0), ("2", 2.5)]
+
+    dropped, appended = diff_trace_rows(old_rows, new_rows, max_changed_fraction=1.0)
+
+    assert dropped == [1, 3]
+    assert [row for index, row in enumerate(old_rows) if index not in dropped] + appended == new_rows
+
+# Test that a change touching most rows asks for a full figure instead
+def test_diff_trace_rows_gives_up_on_large_changes():
+    old_rows = [(str(i), float(i)) for i in range(10)]
+    new_rows = [(str(i), float(i) + 0.5) for i in range(10)]
+
+    assert diff_trace_rows(old_rows, new_rows) is None
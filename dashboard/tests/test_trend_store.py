@@ -0,0 +1,79 @@
+import pytest
+import numpy as np
+import pandas as pd
+from dashboard.trend_store import TrendStore, TrendRing, RedisTrendStore
+
+DAY = 1760054400  # 2025-10-10T00:00:00Z
+
+def frame(priorities, names=None):
+    return pd.DataFrame({"Priority": priorities, "NAME": names or [None] * len(priorities)})
+
+# Test that a bucket shows its peak counts and later buckets without updates carry the latest counts
+def test_series_keeps_peak_and_carries_latest_counts():
+    store = TrendStore()
+    store.record(frame(["HIGH", "HIGH", "LOW"]), DAY + 10)
+    store.record(frame(["LOW"]), DAY + 200)
+
+    series = store.series("Priority", "5min", DAY, DAY + 900)
+
+    assert list(series.columns) == ["HIGH", "LOW"]
+    assert series.to_numpy().tolist() == [[2, 1], [0, 1], [0, 1], [0, 1]]
+    assert series.index[0] == pd.Timestamp(DAY, unit="s", tz="UTC")
+
+# Test that events without a category are not counted and new categories get their own column
+def test_record_skips_missing_values_and_adds_categories():
+    store = TrendStore()
+    store.record(frame(["HIGH"], ["Somerset"]), DAY)
+    store.record(frame(["HIGH", "HIGH"], ["Kanata North", None]), DAY + 3600)
+
+    series = store.series("NAME", "hourly", DAY, DAY + 3600)
+
+    assert series.to_dict("list") == {"Somerset": [1, 0], "Kanata North": [0, 1]}
+
+# Test that a slot reused after the ring wraps around is not read as an old bucket
+def test_ring_ignores_overwritten_slots():
+    ring = TrendRing(seconds=60, slots=4, categories=1)
+    ring.record(0, np.array([5]))
+    ring.record(240, np.array([7]))
+
+    times, counts = ring.series(0, 240)
+
+    assert times.tolist() == [60, 120, 180, 240]
+    assert counts[:, 0].tolist() == [0, 0, 0, 7]
+
+# Test that the Redis trend store charts what the in-memory one does, from any process
+def test_redis_trend_store_matches_memory_store_across_processes():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    writer = RedisTrendStore(fakeredis.FakeRedis(server=server))
+    reader = RedisTrendStore(fakeredis.FakeRedis(server=server))
+    memory = TrendStore()
+    assert reader.last_recorded is None
+
+    updates = [
+        (frame(["HIGH", "HIGH", "LOW"], ["Somerset", None, "Kanata North"]), DAY - 400),
+        (frame(["LOW"], ["Somerset"]), DAY + 10),
+        (frame(["HIGH", "LOW"]), DAY + 200),
+        (frame(["MEDIUM"], ["Barrhaven"]), DAY + 3700)
+    ]
+    for update, timestamp in updates:
+        writer.record(update, timestamp)
+        memory.record(update, timestamp)
+
+    assert reader.last_recorded == DAY + 3700
+    for dimension in ("Priority", "NAME"):
+        for resolution in ("5min", "hourly"):
+            expected = memory.series(dimension, resolution, DAY, DAY + 3900)
+            actual = reader.series(dimension, resolution, DAY, DAY + 3900)
+            pd.testing.assert_frame_equal(actual[expected.columns], expected, check_dtype=False)
+
+# Test that buckets older than the ring are dropped when a new bucket starts
+def test_redis_trend_store_trims_expired_buckets():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    store = RedisTrendStore(client, resolutions={"minute": (60, 4)})
+    store.record(frame(["HIGH"]), 0)
+    store.record(frame(["HIGH", "HIGH"]), 240)
+
+    assert sorted(int(field) for field in client.hkeys("dashboard:trend:Priority:minute")) == [4]
+    assert store.series("Priority", "minute", 0, 240)["HIGH"].tolist() == [0, 0, 0, 2]
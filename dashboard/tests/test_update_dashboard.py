@@ -0,0 +1,182 @@
+import json
+import dash
+import pytest
+from unittest.mock import patch
+from plotly.io.json import to_json_plotly
+import dashboard.app as dashboard_app
+from dashboard.snapshot_store import SnapshotStore
+from dashboard.trend_store import TrendStore
+from traffic_ingester.wire_format import encode_payload
+
+def make_event(row_key, coordinates="[-75.6972, 45.4215]", priority="HIGH"):
+    return {
+        "RowKey": str(row_key),
+        "EventType": "Collision",
+        "Location": f"Event {row_key}",
+        "Priority": priority,
+        "Status": "ACTIVE",
+        "GeoCoordinates": coordinates
+    }
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(dashboard_app, "snapshot_store", SnapshotStore())
+    monkeypatch.setattr(dashboard_app, "trend_store", TrendStore())
+    dashboard_app.figure_cache.clear()
+    return dashboard_app.app.server.test_client()
+
+# Test that wards are assigned once per update, and only for the incoming events
+def test_update_dashboard_assigns_wards_once_per_update(client):
+    with patch.object(dashboard_app, "assign_events_to_wards", wraps=dashboard_app.assign_events_to_wards) as mock_assign:
+        response = client.post("/update-dashboard", json={"events": [make_event(1), make_event(2)]})
+        assert response.status_code == 200
+
+        response = client.post("/update-dashboard", json={"events": [make_event(3)], "removed": ["1"], "mode": "delta"})
+        assert response.status_code == 200
+
+    assert [len(call.args[0]) for call in mock_assign.call_args_list] == [2, 1]
+    store = dashboard_app.poll_for_updates(1, None)
+    df = dashboard_app.get_enriched_frame(store)
+    assert sorted(df["RowKey"]) == ["2", "3"]
+    assert df["WARD"].notna().all()
+
+# Test that a delta event whose coordinates became invalid drops its old row
+def test_update_dashboard_delta_drops_event_with_invalid_coordinates(client):
+    client.post("/update-dashboard", json={"events": [make_event(1), make_event(2)]})
+
+    response = client.post("/update-dashboard", json={"events": [make_event(1, coordinates="[]")], "removed": [], "mode": "delta"})
+    assert response.status_code == 200
+
+    df = dashboard_app.get_enriched_frame(dashboard_app.poll_for_updates(1, None))
+    assert list(df["RowKey"]) == ["2"]
+
+# Test that figure callbacks read the cached enriched frame instead of re-joining wards
+def test_callbacks_read_cached_frame(client):
+    client.post("/update-dashboard", json={"events": [make_event(1), make_event(2, priority="LOW")]})
+    store = dashboard_app.poll_for_updates(1, None)
+    ward = dashboard_app.get_enriched_frame(store)["WARD"].iloc[0]
+
+    with patch.object(dashboard_app, "assign_events_to_wards") as mock_assign, \
+         patch.object(dashboard_app.dash, "ctx") as mock_ctx:
+        mock_ctx.triggered_id = None
+        bar = dashboard_app.update_event_type_bar(store, ward, None)
+        dashboard_app.update_hotspot_map(store, ward, None, None)
+        dashboard_app.update_ward_choropleth(store, None, None)
+        details = dashboard_app.display_ward_details(ward, store)
+
+    mock_assign.assert_not_called()
+    assert sorted(bar["data"][0]["x"]) == ["HIGH", "LOW"]
+    assert "Total events: 2" in str(details)
+
+# Test that a callback still holding an older version keeps seeing that version's frame
+def test_get_enriched_frame_returns_frame_for_version(client):
+    client.post("/update-dashboard", json={"events": [make_event(1)]})
+    first = dashboard_app.poll_for_updates(1, None)
+    client.post("/update-dashboard", json={"events": [make_event(2), make_event(3)]})
+    second = dashboard_app.poll_for_updates(2, None)
+
+    assert second["version"] == first["version"] + 1
+    assert list(dashboard_app.get_enriched_frame(first)["RowKey"]) == ["1"]
+    assert list(dashboard_app.get_enriched_frame(second)["RowKey"]) == ["2", "3"]
+
+# Test that repeated ward clicks reuse cached figures and show up in the stats endpoint
+def test_repeated_ward_clicks_hit_figure_cache(client):
+    dashboard_app.figure_cache.clear()
+    client.post("/update-dashboard", json={"events": [make_event(1)]})
+    store = dashboard_app.poll_for_updates(1, None)
+    ward = dashboard_app.get_enriched_frame(store)["WARD"].iloc[0]
+
+    with patch.object(dashboard_app, "build_hotspot_map", wraps=dashboard_app.build_hotspot_map) as mock_build:
+        first, _ = dashboard_app.update_hotspot_map(store, ward, None, None)
+        second, _ = dashboard_app.update_hotspot_map(store, ward, None, None)
+
+    assert mock_build.call_count == 1
+    assert first is second
+    stats = client.get("/figure-cache-stats").get_json()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+# Apply dash Patch operations the way the browser does, for checking deltas against full figures
+def apply_patch(figure, patch):
+    for operation in patch.to_plotly_json()["operations"]:
+        *path, last = operation["location"]
+        target = figure
+        for key in path:
+            target = target[key]
+        if operation["operation"] == "Delete":
+            del target[last]
+        elif operation["operation"] == "Extend":
+            target[last].extend(operation["params"]["value"])
+        elif operation["operation"] == "Assign":
+            target[last] = operation["params"]["value"]
+    return figure
+
+# Test that a data update sends the hotspot map as a delta that reproduces the full figure
+def test_hotspot_map_update_is_sent_as_delta(client):
+    events = [make_event(i, coordinates=f"[-75.69{i}, 45.42]") for i in range(10)]
+    client.post("/update-dashboard", json={"events": events})
+    first = dashboard_app.poll_for_updates(1, None)
+    figure, shown = dashboard_app.update_hotspot_map(first, None, None, None)
+    # What the browser holds after Dash serializes the figure
+    figure = json.loads(to_json_plotly(figure))
+
+    changed = make_event(3, coordinates="[-75.70, 45.43]", priority="LOW")
+    client.post("/update-dashboard", json={"events": [changed, make_event(10)], "removed": ["5"], "mode": "delta"})
+    second = dashboard_app.poll_for_updates(2, None)
+    patch, shown = dashboard_app.update_hotspot_map(second, None, None, shown)
+
+    assert isinstance(patch, dashboard_app.Patch)
+    assert shown == {"version": second["version"], "ward": None}
+    expected, _ = dashboard_app.update_hotspot_map(second, None, None, None)
+    expected = json.loads(to_json_plotly(expected))["data"][0]
+    patched = apply_patch(figure, patch)["data"][0]
+    for name in dashboard_app.HOTSPOT_TRACE_ARRAYS:
+        assert patched[name] == expected[name]
+
+# Test that the hotspot map falls back to a full figure when the shown version is gone
+def test_hotspot_map_resyncs_when_shown_version_evicted(client):
+    client.post("/update-dashboard", json={"events": [make_event(1)]})
+    store = dashboard_app.poll_for_updates(1, None)
+
+    figure, _ = dashboard_app.update_hotspot_map(store, None, None, {"version": -1, "ward": None})
+
+    assert isinstance(figure, dict) and figure["data"][0]["type"] == "densitymap"
+
+# Test that every tab sees an update, since each compares against its own last-seen version
+def test_poll_for_updates_tracks_version_per_session(client):
+    client.post("/update-dashboard", json={"events": [make_event(1)]})
+
+    first_tab = dashboard_app.poll_for_updates(1, None)
+    second_tab = dashboard_app.poll_for_updates(1, None)
+
+    assert first_tab == second_tab == {"version": 1, "count": 1}
+    with pytest.raises(dash.exceptions.PreventUpdate):
+        dashboard_app.poll_for_updates(2, first_tab)
+
+# Test that a columnar body is decoded by content type and an unknown content type is rejected
+def test_update_dashboard_accepts_columnar_payload(client):
+    body = encode_payload({"events": [make_event(1), make_event(2)]}, "columnar")
+
+    response = client.post("/update-dashboard", data=body, content_type="application/x-traffic-columnar")
+    rejected = client.post("/update-dashboard", data=b"events", content_type="text/plain")
+
+    assert response.status_code == 200
+    assert rejected.status_code == 415
+    df = dashboard_app.get_enriched_frame(dashboard_app.poll_for_updates(1, None))
+    assert list(df["RowKey"]) == ["1", "2"]
+
+# Test that published updates feed the trend chart without rescanning frames
+def test_trend_chart_reads_rolling_counts(client):
+    # Keep both updates in the same 5-minute bucket
+    with patch.object(dashboard_app, "time") as mock_time:
+        mock_time.time.return_value = 1760054400 + 60
+        client.post("/update-dashboard", json={"events": [make_event(1), make_event(2, priority="LOW")]})
+        client.post("/update-dashboard", json={"events": [make_event(3)], "removed": ["2"], "mode": "delta"})
+        store = dashboard_app.poll_for_updates(1, None)
+
+        fig = dashboard_app.update_trend_chart(store, "Priority", "5min")
+
+    traces = {trace["name"]: trace["y"] for trace in fig["data"]}
+    assert set(traces) == {"HIGH", "LOW"}
+    # Peak within the current bucket
+    assert traces["HIGH"][-1] == 2
+    assert traces["LOW"][-1] == 1
@@ -0,0 +1,59 @@
+import threading
+from unittest.mock import patch
+import dashboard.app as dashboard_app
+from dashboard.update_stream import UpdateBroadcaster
+
+# Test that a new subscriber gets the latest version immediately, then only newer ones
+def test_stream_sends_latest_then_new_versions():
+    broadcaster = UpdateBroadcaster()
+    broadcaster.publish({"version": 1, "count": 10})
+    stream = broadcaster.stream(heartbeat_seconds=5)
+
+    assert next(stream).startswith("retry:")
+    assert next(stream) == 'data: {"version": 1, "count": 10}\n\n'
+
+    threading.Timer(0.05, broadcaster.publish, args=({"version": 2, "count": 12},)).start()
+    assert next(stream) == 'data: {"version": 2, "count": 12}\n\n'
+    assert broadcaster.subscribers == 1
+
+    stream.close()
+    assert broadcaster.subscribers == 0
+
+# Test that an idle stream only sends keep-alive comments
+def test_stream_sends_heartbeat_when_idle():
+    stream = UpdateBroadcaster().stream(heartbeat_seconds=0.01)
+    next(stream)
+
+    assert next(stream) == ": keep-alive\n\n"
+
+# Test that /update-dashboard pushes the new version to /update-stream subscribers
+def test_update_dashboard_pushes_version_to_stream():
+    client = dashboard_app.app.server.test_client()
+    response = client.get("/update-stream", buffered=False)
+    frames = iter(response.response)
+
+    assert response.mimetype == "text/event-stream"
+    next(frames)
+    client.post("/update-dashboard", json={"events": [{"RowKey": "1", "Priority": "HIGH", "GeoCoordinates": "[-75.69, 45.42]"}]})
+    frame = next(frames).decode()
+    while not frame.startswith("data:"):
+        frame = next(frames).decode()
+
+    assert f'"version": {dashboard_app.snapshot_store.latest().version}' in frame
+    response.close()
+
+# Test that connections over the cap are turned away and a closed stream frees its slot
+def test_update_stream_caps_subscribers():
+    client = dashboard_app.app.server.test_client()
+    with patch.object(dashboard_app.update_broadcaster, "max_subscribers", 1):
+        first = client.get("/update-stream", buffered=False)
+        second = client.get("/update-stream", buffered=False)
+        assert first.status_code == 200
+        assert second.status_code == 503
+
+        first.close()
+        third = client.get("/update-stream", buffered=False)
+        assert third.status_code == 200
+        third.close()
+
+    assert dashboard_app.update_broadcaster.subscribers == 0
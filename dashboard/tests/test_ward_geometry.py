@@ -0,0 +1,61 @@
+import json
+import pytest
+import shapely
+from unittest.mock import patch
+from shapely.geometry import shape
+import dashboard.app as dashboard_app
+from dashboard.ward_geometry import build_ward_geometry, load_ward_geometry
+
+# Test that the simplified wards are smaller and quantized but cover the same area
+def test_build_ward_geometry_simplifies_and_quantizes():
+    wards = dashboard_app.wards
+
+    ward_geometry = build_ward_geometry(wards, tolerance=0.0001, precision=5)
+
+    features = ward_geometry["geojson"]["features"]
+    simplified = [shape(feature["geometry"]) for feature in features]
+    assert [feature["properties"]["WARD"] for feature in features] == list(wards["WARD"])
+    assert sum(shapely.get_num_coordinates(simplified)) < shapely.get_num_coordinates(wards.geometry.values).sum() / 2
+    assert all(len(str(value).split(".")[-1]) <= 5 for value in shapely.get_coordinates(simplified).ravel())
+    assert shapely.area(simplified).sum() == pytest.approx(shapely.area(wards.geometry.values).sum(), rel=1e-3)
+
+    ward = wards["WARD"].iloc[0]
+    assert len(ward_geometry["wards"][ward]["centroid"]) == 2
+    assert len(ward_geometry["wards"][ward]["bbox"]) == 4
+
+# Test that the on-disk cache is reused, and rebuilt when the settings change
+def test_load_ward_geometry_uses_disk_cache(tmp_path):
+    cache_path = str(tmp_path / "wards.simplified.json")
+    wards = dashboard_app.wards
+
+    first = load_ward_geometry(wards, dashboard_app.wards_path, cache_path)
+    with patch("dashboard.ward_geometry.build_ward_geometry") as mock_build:
+        second = load_ward_geometry(wards, dashboard_app.wards_path, cache_path)
+        mock_build.assert_not_called()
+    assert second == json.loads(json.dumps(first))
+
+    rebuilt = load_ward_geometry(wards, dashboard_app.wards_path, cache_path, tolerance=0.0005)
+    assert rebuilt["cache_key"]["tolerance"] == 0.0005
+
+# Test that a data update patches only the per-ward counts of a choropleth already on screen
+def test_choropleth_data_update_patches_counts():
+    df = dashboard_app.wards[["WARD", "NAME"]].head(2)
+
+    with patch.object(dashboard_app, "get_versioned_frame", return_value=(2, df)):
+        update, shown = dashboard_app.update_ward_choropleth({"version": 2}, None, 1)
+
+    update = update.to_plotly_json()
+    assert shown == 2
+    assert [operation["location"] for operation in update["operations"]] == [["data", 0, "z"]]
+    assert update["operations"][0]["params"]["value"] == [1, 1] + [0] * (len(dashboard_app.wards) - 2)
+
+# Test that the first render with data builds the full choropleth, ward geometry included
+def test_choropleth_first_render_builds_full_figure():
+    df = dashboard_app.wards[["WARD", "NAME"]].head(2)
+    dashboard_app.figure_cache.clear()
+
+    with patch.object(dashboard_app, "get_versioned_frame", return_value=(1, df)):
+        fig, shown = dashboard_app.update_ward_choropleth({"version": 1}, None, None)
+
+    assert shown == 1
+    assert fig["data"][0]["geojson"] == dashboard_app.wards_geojson
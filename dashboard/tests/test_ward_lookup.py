@@ -0,0 +1,42 @@
+import os
+import numpy as np
+import geopandas as gpd
+from shapely.geometry import Point, box
+from dashboard.ward_lookup import WardLookup
+
+WARDS_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "ottawa_wards.geojson")
+
+def make_wards():
+    return gpd.GeoDataFrame(
+        {"WARD": ["1", "2"], "NAME": ["West", "East"]},
+        geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1)],
+        crs="EPSG:4326"
+    )
+
+# Test that points are assigned to the ward containing them, and -1/None outside every ward
+def test_ward_lookup_assigns_points_to_wards():
+    lookup = WardLookup(make_wards())
+
+    positions = lookup.lookup([0.5, 1.5, 3.0, np.nan], [0.5, 0.5, 0.5, np.nan])
+    ward_ids, names = lookup.assign([0.5, 1.5, 3.0], [0.5, 0.5, 0.5])
+
+    assert positions.tolist() == [0, 1, -1, -1]
+    assert ward_ids.tolist() == ["1", "2", None]
+    assert names.tolist() == ["West", "East", None]
+
+# Test that the lookup matches a geopandas "within" spatial join on the real ward boundaries
+def test_ward_lookup_matches_sjoin():
+    wards = gpd.read_file(WARDS_PATH).to_crs("EPSG:4326")
+    min_x, min_y, max_x, max_y = wards.total_bounds
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(min_x, max_x, 2000)
+    lat = rng.uniform(min_y, max_y, 2000)
+
+    points = gpd.GeoDataFrame(geometry=[Point(xy) for xy in zip(lon, lat)], crs="EPSG:4326")
+    joined = gpd.sjoin(points, wards, how="left", predicate="within")
+    joined = joined[~joined.index.duplicated()]
+
+    ward_ids, _ = WardLookup(wards).assign(lon, lat)
+
+    expected = [None if ward != ward else ward for ward in joined["WARD"]]
+    assert ward_ids.tolist() == expected
@@ -0,0 +1,122 @@
+import re
+import pandas as pd
+from unittest.mock import MagicMock, patch
+import dashboard.app as dashboard_app
+from dashboard.snapshot_store import SnapshotStore
+from dashboard.trend_store import TrendStore
+from traffic_ingester.snapshot_file import write_snapshot
+from dashboard.warm_start import SnapshotFileWriter, key_ranges, load_table_events, read_snapshot_file, write_snapshot_file
+
+def make_entity(row_key, coordinates="[-75.6972, 45.4215]"):
+    return {
+        "PartitionKey": "OttawaTraffic",
+        "RowKey": row_key,
+        "EventType": "Collision",
+        "Priority": "HIGH",
+        "Status": "ACTIVE",
+        "GeoCoordinates": coordinates
+    }
+
+# Stand-in for query_entities that applies the RowKey range of a filter
+def query_by_range(entities):
+    def query_entities(query_filter, **kwargs):
+        low = re.search(r"RowKey ge '([^']*)'", query_filter)
+        high = re.search(r"RowKey lt '([^']*)'", query_filter)
+        return [
+            entity for entity in entities
+            if (not low or entity["RowKey"] >= low.group(1)) and (not high or entity["RowKey"] < high.group(1))
+        ]
+    return query_entities
+
+# Test that key ranges are contiguous, open-ended and balanced
+def test_key_ranges_cover_the_whole_key_space():
+    keys = [f"{i:03d}" for i in range(10)]
+    assert key_ranges(keys, 3) == [(None, "004"), ("004", "008"), ("008", None)]
+    assert key_ranges(keys, 1) == [(None, None)]
+    assert key_ranges([], 4) == [(None, None)]
+
+# Test that ACTIVE events are read with one concurrent query per key range, including
+# events newer than the index
+def test_load_table_events_queries_key_ranges_concurrently():
+    entities = [make_entity(f"{i:04d}") for i in range(2500)] + [make_entity("9999")]
+    table_client = MagicMock()
+    table_client.query_entities.side_effect = query_by_range(entities)
+    index = {entity["RowKey"] for entity in entities[:2500]}
+
+    with patch("traffic_ingester.helper_functions.table_client_registry_helper.get_table_client", return_value=table_client), \
+         patch("traffic_ingester.helper_functions.cleanup_inactive_events_helper.get_active_index", return_value=index):
+        events = load_table_events("conn", "TrafficEvents", "TrafficMetadata")
+
+    assert table_client.query_entities.call_count == 3
+    assert sorted(event["RowKey"] for event in events) == sorted(entity["RowKey"] for entity in entities)
+    first_filter = table_client.query_entities.call_args_list[0].args[0]
+    assert first_filter.startswith("PartitionKey eq 'OttawaTraffic' and Status eq 'ACTIVE'")
+
+# Test that snapshot files round-trip the frame and are ignored once stale
+def test_snapshot_file_round_trip(tmp_path):
+    path = tmp_path / "latest_snapshot.arrow"
+    frame = pd.DataFrame({"RowKey": ["1"], "WARD": ["12"]})
+
+    writer = SnapshotFileWriter(str(path))
+    writer.submit(frame)
+    assert writer.flush(timeout=5)
+    pd.testing.assert_frame_equal(read_snapshot_file(str(path)), frame)
+
+    write_snapshot_file(str(path), frame, saved_at=1)
+    assert read_snapshot_file(str(path), max_age_seconds=60) is None
+    assert read_snapshot_file(str(tmp_path / "missing.arrow")) is None
+
+# Test that a warm start enriches the stored events with wards and publishes them once
+def test_warm_start_publishes_table_events(monkeypatch):
+    monkeypatch.setattr(dashboard_app, "snapshot_store", SnapshotStore())
+    monkeypatch.setattr(dashboard_app, "trend_store", TrendStore())
+    monkeypatch.setattr(dashboard_app, "SNAPSHOT_FILE", None)
+    monkeypatch.setattr(dashboard_app, "STORAGE_CONNECTION_STRING", "conn")
+    entities = [make_entity("1"), make_entity("2"), make_entity("3", coordinates=None)]
+
+    with patch.object(dashboard_app, "load_table_events", return_value=entities):
+        assert dashboard_app.warm_start_dashboard() == 1
+        # Later restarts of the loader never overwrite newer data
+        assert dashboard_app.warm_start_dashboard() is None
+
+    df = dashboard_app.snapshot_store.latest().frame
+    assert sorted(df["RowKey"]) == ["1", "2"]
+    assert df["WARD"].notna().all()
+
+# Test that a fresh snapshot file is published as is, without touching Table Storage
+def test_warm_start_prefers_snapshot_file(monkeypatch, tmp_path):
+    path = tmp_path / "latest_snapshot.arrow"
+    frame = pd.DataFrame({"RowKey": ["1"], "WARD": ["12"], "NAME": ["Somerset"], "Priority": ["HIGH"]})
+    write_snapshot_file(str(path), frame)
+    monkeypatch.setattr(dashboard_app, "snapshot_store", SnapshotStore())
+    monkeypatch.setattr(dashboard_app, "trend_store", TrendStore())
+    monkeypatch.setattr(dashboard_app, "SNAPSHOT_FILE", str(path))
+    monkeypatch.setattr(dashboard_app, "STORAGE_CONNECTION_STRING", "conn")
+
+    with patch.object(dashboard_app, "load_table_events") as mock_load, \
+         patch.object(dashboard_app, "assign_events_to_wards") as mock_assign:
+        assert dashboard_app.warm_start_dashboard() == 1
+
+    mock_load.assert_not_called()
+    mock_assign.assert_not_called()
+    pd.testing.assert_frame_equal(dashboard_app.snapshot_store.latest().frame, frame)
+
+# Test that the ingester's event snapshot is published with wards, its coordinates decoded in one bulk pass
+def test_warm_start_reads_ingester_snapshot(monkeypatch, tmp_path):
+    path = tmp_path / "events.snapshot"
+    write_snapshot(str(path), {
+        "RowKey": ["1", "2"],
+        "GeoCoordinates": ["[-75.6972, 45.4215]", None]
+    })
+    monkeypatch.setattr(dashboard_app, "snapshot_store", SnapshotStore())
+    monkeypatch.setattr(dashboard_app, "trend_store", TrendStore())
+    monkeypatch.setattr(dashboard_app, "SNAPSHOT_FILE", None)
+    monkeypatch.setattr(dashboard_app, "EVENT_SNAPSHOT_FILE", str(path))
+
+    with patch.object(dashboard_app, "decode_coordinates", wraps=dashboard_app.decode_coordinates) as mock_decode:
+        assert dashboard_app.warm_start_dashboard() == 1
+
+    mock_decode.assert_called_once()
+    df = dashboard_app.snapshot_store.latest().frame
+    assert list(df["RowKey"]) == ["1"]
+    assert df["WARD"].notna().all()
@@ -0,0 +1,32 @@
+# Helper to diff the rows behind a figure trace. Returns (dropped, appended): deleting the
+# old rows at the dropped positions and appending the appended rows turns old_rows into
+# new_rows. Returns None when the change is too large for a delta to beat a full figure.
+def diff_trace_rows(old_rows, new_rows, max_changed_fraction=0.5):
+    dropped = []
+    position = 0
+    for index, row in enumerate(old_rows):
+        if position < len(new_rows) and new_rows[position] == row:
+            position += 1
+        else:
+            dropped.append(index)
+    appended = new_rows[position:]
+
+    if len(dropped) + len(appended) > max_changed_fraction * max(len(new_rows), 1):
+        return None
+    return dropped, appended
+
+# Helper to apply a row diff to a trace's data arrays through a dash Patch. arrays maps a
+# trace property (e.g. "lat") to the row position it comes from, or a slice of positions
+# for per-point lists such as customdata.
+def patch_trace(trace_patch, arrays, dropped, appended):
+    for name, part in arrays.items():
+        column = trace_patch[name]
+        # Delete from the end so earlier positions stay valid
+        for index in reversed(dropped):
+            del column[index]
+        if appended:
+            if isinstance(part, slice):
+                column.extend([list(row[part]) for row in appended])
+            else:
+                column.extend([row[part] for row in appended])
+    return trace_patch
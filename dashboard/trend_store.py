@@ -0,0 +1,213 @@
+import json
+import threading
+import numpy as np
+import pandas as pd
+
+# Trend resolutions: bucket length in seconds and how many buckets each ring keeps
+# (5-minute buckets for a week, hourly for six weeks, daily for about thirteen months)
+RESOLUTIONS = {
+    "5min": (300, 7 * 24 * 12),
+    "hourly": (3600, 6 * 7 * 24),
+    "daily": (86400, 400)
+}
+
+# Frame columns counted per bucket
+DIMENSIONS = ("Priority", "EventType", "NAME")
+
+# One resolution of one dimension: rings of count rows (one column per category) holding
+# each bucket's peak and latest counts, plus the absolute bucket number each slot currently
+# holds, so stale slots are recognized on read
+class TrendRing:
+    def __init__(self, seconds, slots, categories=0):
+        self.seconds = seconds
+        self.slots = slots
+        self.buckets = np.full(slots, -1, dtype=np.int64)
+        self.peak = np.zeros((slots, categories), dtype=np.int32)
+        self.latest = np.zeros((slots, categories), dtype=np.int32)
+
+    def add_categories(self, count):
+        self.peak = np.pad(self.peak, ((0, 0), (0, count)))
+        self.latest = np.pad(self.latest, ((0, 0), (0, count)))
+
+    def record(self, timestamp, counts):
+        bucket = int(timestamp // self.seconds)
+        slot = bucket % self.slots
+        if self.buckets[slot] != bucket:
+            self.buckets[slot] = bucket
+            self.peak[slot] = 0
+        np.maximum(self.peak[slot], counts, out=self.peak[slot])
+        self.latest[slot] = counts
+
+    # Peak counts for the buckets covering [start, end]. Counts are active-event gauges and
+    # pushes only arrive when something changes, so a bucket without an update carries the
+    # latest counts of the bucket before it.
+    def series(self, start, end):
+        first, last = int(start // self.seconds), int(end // self.seconds)
+        first = max(first, last - self.slots + 1)
+        buckets = np.arange(first, last + 1, dtype=np.int64)
+        slots = buckets % self.slots
+        present = self.buckets[slots] == buckets
+
+        # Seed the carry with the newest bucket before the window, if the ring still has one
+        earlier = (self.buckets >= 0) & (self.buckets < first)
+        if earlier.any():
+            seed = self.latest[np.argmax(np.where(earlier, self.buckets, -1))]
+        else:
+            seed = np.zeros(self.latest.shape[1], dtype=np.int32)
+
+        latest = np.vstack([seed[np.newaxis, :], self.latest[slots]])
+        source = np.where(np.concatenate([[True], present]), np.arange(len(buckets) + 1), 0)
+        carried = latest[np.maximum.accumulate(source)][1:]
+        return buckets * self.seconds, np.where(present[:, np.newaxis], self.peak[slots], carried)
+
+# Rolling aggregation of active-event counts per Priority, EventType and ward at 5-minute,
+# hourly and daily resolution. Each published frame updates only the current bucket of each
+# ring, so trend charts over weeks read a few thousand small array rows instead of
+# rescanning past events.
+class TrendStore:
+    def __init__(self, dimensions=DIMENSIONS, resolutions=RESOLUTIONS):
+        self.lock = threading.Lock()
+        self.categories = {dimension: {} for dimension in dimensions}
+        self.rings = {
+            dimension: {name: TrendRing(seconds, slots) for name, (seconds, slots) in resolutions.items()}
+            for dimension in dimensions
+        }
+        self.resolutions = resolutions
+        self.last_recorded = None
+
+    # Count the frame's events per category and fold them into every ring (timestamp: epoch seconds)
+    def record(self, frame, timestamp):
+        with self.lock:
+            for dimension, rings in self.rings.items():
+                if dimension not in frame.columns:
+                    counts = np.zeros(len(self.categories[dimension]), dtype=np.int32)
+                else:
+                    counts = self.count(dimension, frame[dimension])
+                for ring in rings.values():
+                    ring.record(timestamp, counts)
+            self.last_recorded = timestamp
+
+    def count(self, dimension, values):
+        codes, uniques = pd.factorize(values)
+        index = self.categories[dimension]
+        new = [value for value in uniques if value not in index]
+        if new:
+            for value in new:
+                index[value] = len(index)
+            for ring in self.rings[dimension].values():
+                ring.add_categories(len(new))
+
+        # Events without a value (e.g. outside every ward) have code -1 and are not counted
+        columns = np.array([index[value] for value in uniques], dtype=np.int64)
+        counted = codes >= 0
+        return np.bincount(columns[codes[counted]], minlength=len(index)).astype(np.int32)
+
+    # Return a DataFrame of counts (one column per category) indexed by bucket start time
+    def series(self, dimension, resolution, start, end):
+        with self.lock:
+            times, counts = self.rings[dimension][resolution].series(start, end)
+            labels = list(self.categories[dimension])
+        index = pd.to_datetime(times, unit="s", utc=True)
+        return pd.DataFrame(counts, index=index, columns=labels)
+
+# Trend store kept in Redis next to RedisSnapshotStore, so every dashboard process charts
+# the same history and it survives restarts. Each dimension and resolution is one hash of
+# bucket number -> JSON {"peak": {category: count}, "latest": {category: count}}; buckets
+# older than the ring length are dropped whenever a new bucket starts. Reads rebuild a
+# TrendRing from the buckets in the window, so both stores chart identical series. Writers
+# are serialized by the snapshot store (record inside snapshot_store.writing()).
+class RedisTrendStore:
+    def __init__(self, client, prefix="dashboard:trend", dimensions=DIMENSIONS, resolutions=RESOLUTIONS):
+        self.client = client
+        self.prefix = prefix
+        self.dimensions = dimensions
+        self.resolutions = resolutions
+
+    @property
+    def last_recorded(self):
+        value = self.client.get(f"{self.prefix}:last_recorded")
+        return float(value) if value is not None else None
+
+    def key(self, dimension, resolution):
+        return f"{self.prefix}:{dimension}:{resolution}"
+
+    # Count the frame's events per category and fold them into every bucket (timestamp: epoch seconds)
+    def record(self, frame, timestamp):
+        counts = {}
+        for dimension in self.dimensions:
+            if dimension in frame.columns:
+                # Events without a value (e.g. outside every ward) are not counted
+                values = frame[dimension].dropna().value_counts(sort=False)
+                counts[dimension] = {str(label): int(count) for label, count in values.items()}
+            else:
+                counts[dimension] = {}
+
+        targets = [
+            (self.key(dimension, name), int(timestamp // seconds), slots, counts[dimension])
+            for dimension in self.dimensions
+            for name, (seconds, slots) in self.resolutions.items()
+        ]
+        pipeline = self.client.pipeline()
+        for key, bucket, _, _ in targets:
+            pipeline.hget(key, bucket)
+        existing = pipeline.execute()
+
+        pipeline = self.client.pipeline()
+        for (key, bucket, slots, latest), stored in zip(targets, existing):
+            if stored is None:
+                peak = latest
+                self.trim(pipeline, key, bucket - slots)
+            else:
+                peak = json.loads(stored)["peak"]
+                for label, count in latest.items():
+                    peak[label] = max(peak.get(label, 0), count)
+            pipeline.hset(key, bucket, json.dumps({"peak": peak, "latest": latest}))
+        pipeline.set(f"{self.prefix}:last_recorded", timestamp)
+        pipeline.execute()
+
+    # Queue deletion of the buckets that have fallen out of the ring
+    def trim(self, pipeline, key, oldest):
+        expired = [field for field in self.client.hkeys(key) if int(field) <= oldest]
+        if expired:
+            pipeline.hdel(key, *expired)
+
+    # Return a DataFrame of counts (one column per category) indexed by bucket start time
+    def series(self, dimension, resolution, start, end):
+        seconds, slots = self.resolutions[resolution]
+        key = self.key(dimension, resolution)
+        first, last = int(start // seconds), int(end // seconds)
+        first = max(first, last - slots + 1)
+
+        # The buckets in the window plus the newest one before it, which seeds the carry
+        stored = sorted(int(field) for field in self.client.hkeys(key) if last - slots < int(field) <= last)
+        earlier = [bucket for bucket in stored if bucket < first]
+        wanted = earlier[-1:] + [bucket for bucket in stored if bucket >= first]
+        payloads = self.client.hmget(key, wanted) if wanted else []
+
+        buckets = [(bucket, json.loads(payload)) for bucket, payload in zip(wanted, payloads) if payload is not None]
+        labels = {}
+        for _, counts in buckets:
+            for label in counts["peak"]:
+                labels.setdefault(label, len(labels))
+            for label in counts["latest"]:
+                labels.setdefault(label, len(labels))
+
+        ring = TrendRing(seconds, slots, len(labels))
+        for bucket, counts in buckets:
+            slot = bucket % slots
+            ring.buckets[slot] = bucket
+            for label, count in counts["peak"].items():
+                ring.peak[slot, labels[label]] = count
+            for label, count in counts["latest"].items():
+                ring.latest[slot, labels[label]] = count
+
+        times, counts = ring.series(start, end)
+        index = pd.to_datetime(times, unit="s", utc=True)
+        return pd.DataFrame(counts, index=index, columns=list(labels))
+
+# Helper to create the trend store matching DASHBOARD_SNAPSHOT_BACKEND: with "redis" the
+# buckets live in the snapshot store's Redis (client), otherwise in this process
+def create_trend_store(backend="memory", client=None):
+    if backend == "redis":
+        return RedisTrendStore(client)
+    return TrendStore()
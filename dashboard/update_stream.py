@@ -0,0 +1,63 @@
+import json
+import threading
+
+# Seconds between keep-alive comments on an idle stream; these also let the server notice
+# disconnected browsers, since a write to a closed connection ends the generator
+HEARTBEAT_SECONDS = 15
+# Browser reconnect delay (ms) sent to EventSource clients
+RETRY_MILLISECONDS = 5000
+
+# Server-Sent Events broadcaster: /update-dashboard publishes one small message per new
+# data version and every open /update-stream connection forwards it to its browser, so
+# tabs only hear from the server when there is new data. Each open stream holds one server
+# thread, so max_subscribers caps them below the server's thread count; browsers turned
+# away fall back to polling.
+class UpdateBroadcaster:
+    def __init__(self, max_subscribers=None):
+        self.condition = threading.Condition()
+        self.message = None
+        self.subscribers = 0
+        self.max_subscribers = max_subscribers
+
+    # Reserve a subscriber slot for a new connection; False once max_subscribers are open
+    def subscribe(self):
+        with self.condition:
+            if self.max_subscribers is not None and self.subscribers >= self.max_subscribers:
+                return False
+            self.subscribers += 1
+            return True
+
+    # Release a slot reserved with subscribe()
+    def unsubscribe(self):
+        with self.condition:
+            self.subscribers -= 1
+
+    # Publish the latest message (e.g. {"version": 3, "count": 120}) to every subscriber
+    def publish(self, message):
+        with self.condition:
+            self.message = message
+            self.condition.notify_all()
+
+    # Generator of SSE frames for one browser connection. A new connection gets the latest
+    # message straight away; after that only newer messages, with heartbeats in between.
+    # reserved=True means the caller already holds a slot from subscribe() and releases it.
+    def stream(self, heartbeat_seconds=HEARTBEAT_SECONDS, reserved=False):
+        if not reserved:
+            with self.condition:
+                self.subscribers += 1
+        last_sent = None
+        try:
+            yield f"retry: {RETRY_MILLISECONDS}\n\n"
+            while True:
+                with self.condition:
+                    self.condition.wait_for(lambda: self.message is not last_sent, timeout=heartbeat_seconds)
+                    message = self.message
+
+                if message is last_sent:
+                    yield ": keep-alive\n\n"
+                else:
+                    last_sent = message
+                    yield f"data: {json.dumps(message)}\n\n"
+        finally:
+            if not reserved:
+                self.unsubscribe()
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import numpy as np
+import shapely
+
+# Bump when the cached layout changes so stale cache files are rebuilt
+WARD_GEOMETRY_FORMAT = 1
+# ~10 m simplification and ~1 m coordinate grid: plenty for a city-wide choropleth
+DEFAULT_TOLERANCE = 0.0001
+DEFAULT_PRECISION = 5
+
+# Helper to hash the source GeoJSON so the cache is rebuilt when the boundaries change
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(65536), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+# Helper to round every coordinate in a GeoJSON geometry to a fixed number of decimals
+def quantize_coordinates(coordinates, precision):
+    if coordinates and isinstance(coordinates[0], (int, float)):
+        return [round(value, precision) for value in coordinates]
+    return [quantize_coordinates(part, precision) for part in coordinates]
+
+# Build the simplified ward geometry: shared ward boundaries are simplified together
+# (shapely.coverage_simplify keeps neighbouring wards gap- and overlap-free), then every
+# coordinate is quantized. Centroids and bounding boxes come from the full-resolution wards.
+def build_ward_geometry(wards, tolerance=DEFAULT_TOLERANCE, precision=DEFAULT_PRECISION):
+    geometries = np.asarray(wards.geometry.values)
+    simplified = shapely.coverage_simplify(geometries, tolerance)
+    centroids = shapely.get_coordinates(shapely.centroid(geometries))
+    bounds = shapely.bounds(geometries)
+
+    features = []
+    ward_info = {}
+    for position, (ward, name) in enumerate(zip(wards["WARD"], wards["NAME"])):
+        geometry = json.loads(shapely.to_geojson(simplified[position]))
+        geometry["coordinates"] = quantize_coordinates(geometry["coordinates"], precision)
+        features.append({
+            "type": "Feature",
+            "properties": {"WARD": ward, "NAME": name},
+            "geometry": geometry
+        })
+        ward_info[str(ward)] = {
+            "name": name,
+            "centroid": [round(float(value), precision) for value in centroids[position]],
+            "bbox": [round(float(value), precision) for value in bounds[position]]
+        }
+
+    return {
+        "geojson": {"type": "FeatureCollection", "features": features},
+        "wards": ward_info
+    }
+
+# Load the simplified ward geometry from its on-disk cache, rebuilding it when the source
+# file, the simplification settings or the cache format have changed
+def load_ward_geometry(wards, source_path, cache_path, tolerance=DEFAULT_TOLERANCE, precision=DEFAULT_PRECISION):
+    cache_key = {
+        "format": WARD_GEOMETRY_FORMAT,
+        "source_sha256": file_sha256(source_path),
+        "tolerance": tolerance,
+        "precision": precision
+    }
+
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("cache_key") == cache_key:
+            return cached
+    except (OSError, ValueError):
+        pass
+
+    ward_geometry = build_ward_geometry(wards, tolerance, precision)
+    ward_geometry["cache_key"] = cache_key
+
+    # Write to a temp file and swap it in so a concurrent reader never sees half a file
+    try:
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(ward_geometry, f, separators=(",", ":"), ensure_ascii=False)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: could not cache simplified ward geometry: {e}")
+
+    return ward_geometry
+
+# Prebuild the cache as a build step: python -m dashboard.ward_geometry
+if __name__ == "__main__":
+    import geopandas as gpd
+
+    base_dir = os.path.dirname(__file__)
+    source_path = os.path.join(base_dir, "data", "ottawa_wards.geojson")
+    cache_path = os.path.join(base_dir, "data", "ottawa_wards.simplified.json")
+    wards = gpd.read_file(source_path).to_crs("EPSG:4326")
+    ward_geometry = load_ward_geometry(wards, source_path, cache_path)
+    print(f"Wrote {cache_path} ({os.path.getsize(cache_path)} bytes, {len(ward_geometry['wards'])} wards)")
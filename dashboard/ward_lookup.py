@@ -0,0 +1,41 @@
+import numpy as np
+import shapely
+
+# Prebuilt ward lookup engine: prepared ward polygons plus their bounding boxes, so
+# coordinate arrays are assigned to wards with vectorized contains_xy calls instead of
+# building a Point per event and running a spatial join.
+class WardLookup:
+    def __init__(self, wards):
+        self.wards = wards.reset_index(drop=True)
+        self.geometries = np.asarray(self.wards.geometry.values)
+        shapely.prepare(self.geometries)
+        self.bounds = shapely.bounds(self.geometries)
+        self.ward_ids = self.wards["WARD"].to_numpy(dtype=object)
+        self.names = self.wards["NAME"].to_numpy(dtype=object)
+
+    # Return the position of the ward containing each point (-1 when outside every ward)
+    def lookup(self, longitudes, latitudes):
+        lon = np.asarray(longitudes, dtype=np.float64)
+        lat = np.asarray(latitudes, dtype=np.float64)
+        positions = np.full(lon.shape, -1, dtype=np.int32)
+
+        for position, (geometry, (min_x, min_y, max_x, max_y)) in enumerate(zip(self.geometries, self.bounds)):
+            # Cheap bounding-box filter first; wards do not overlap, so skip assigned points
+            candidates = np.flatnonzero(
+                (positions < 0) & (lon >= min_x) & (lon <= max_x) & (lat >= min_y) & (lat <= max_y)
+            )
+            if candidates.size:
+                inside = shapely.contains_xy(geometry, lon[candidates], lat[candidates])
+                positions[candidates[inside]] = position
+
+        return positions
+
+    # Return (WARD, NAME) arrays for the given coordinates, None outside every ward
+    def assign(self, longitudes, latitudes):
+        positions = self.lookup(longitudes, latitudes)
+        found = positions >= 0
+        ward_ids = np.full(positions.shape, None, dtype=object)
+        names = np.full(positions.shape, None, dtype=object)
+        ward_ids[found] = self.ward_ids[positions[found]]
+        names[found] = self.names[positions[found]]
+        return ward_ids, names
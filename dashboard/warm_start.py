@@ -0,0 +1,109 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from traffic_ingester.snapshot_file import write_snapshot, read_snapshot_header, read_snapshot_frame
+
+# Warm start: on startup the dashboard publishes the last known event set instead of
+# waiting up to one ingest interval for the next push. The sources are local snapshot files
+# (see traffic_ingester/snapshot_file.py) of the ward-enriched frame, rewritten after every
+# update, or of the ingester's events, and else the ACTIVE events in Table Storage.
+
+# Stored entity columns the dashboard reads
+EVENT_COLUMNS = ["RowKey", "EventType", "Location", "StartTime", "EndTime", "Priority", "Status", "GeoCoordinates"]
+
+# Entities per page (the service maximum) and concurrent range queries per warm start
+PAGE_SIZE = 1000
+MAX_QUERY_WORKERS = 8
+
+# Helper to write a frame (and the data version it belongs to) to a snapshot file
+def write_snapshot_file(path, frame, version=0, saved_at=None):
+    write_snapshot(path, frame, version=version, saved_at=saved_at)
+
+# Helper to read a snapshot file; None when it is missing, unreadable or older than
+# max_age_seconds (checked from the header, before any column is loaded)
+def read_snapshot_file(path, max_age_seconds=None):
+    try:
+        age = time.time() - read_snapshot_header(path)["saved_at"]
+        if max_age_seconds is not None and age > max_age_seconds:
+            print(f"Ignoring snapshot file {path}: {age:.0f}s old")
+            return None
+        return read_snapshot_frame(path)[1]
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Ignoring unreadable snapshot file {path}: {e}")
+        return None
+
+# Writes the latest published frame to the snapshot file on a background thread, so updates
+# never wait on the disk; frames published while a write is running collapse into one
+class SnapshotFileWriter:
+    def __init__(self, path):
+        self.path = path
+        self.condition = threading.Condition()
+        self.pending = None
+        self.writing = False
+        self.thread = None
+
+    def submit(self, frame, version=0):
+        with self.condition:
+            self.pending = (frame, version)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="snapshot-file-writer", daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+
+    def run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending is not None)
+                (frame, version), self.pending = self.pending, None
+                self.writing = True
+            try:
+                write_snapshot_file(self.path, frame, version)
+            except Exception as e:
+                print(f"Failed to write snapshot file {self.path}: {e}")
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+
+    # Wait until every submitted frame has been written (used by tests and on shutdown)
+    def flush(self, timeout=None):
+        with self.condition:
+            return self.condition.wait_for(lambda: self.pending is None and not self.writing, timeout)
+
+# Helper to split the RowKey space into at most `shards` ranges holding about as many of
+# the given keys each: (low, high) means low <= RowKey < high, None leaves a side open, so
+# keys missing from the list are still covered
+def key_ranges(keys, shards):
+    keys = sorted(keys)
+    size = -(-len(keys) // max(shards, 1))
+    bounds = [None] + keys[size::size] + [None] if keys else [None, None]
+    return list(zip(bounds, bounds[1:]))
+
+# Helper to read the ACTIVE events of one RowKey range, page by page
+def query_active_events(table_client, partition_key, key_range=(None, None)):
+    low, high = (None if key is None else key.replace("'", "''") for key in key_range)
+    query_filter = f"PartitionKey eq '{partition_key}' and Status eq 'ACTIVE'"
+    if low is not None:
+        query_filter += f" and RowKey ge '{low}'"
+    if high is not None:
+        query_filter += f" and RowKey lt '{high}'"
+    return [dict(entity) for entity in table_client.query_entities(query_filter, select=EVENT_COLUMNS, results_per_page=PAGE_SIZE)]
+
+# Helper to bulk-read the ACTIVE events from Table Storage. The ingester's ACTIVE RowKey
+# index (in the metadata table) splits the single events partition into one key range per
+# page or so, queried concurrently; without an index it falls back to one paged query.
+def load_table_events(connection_string, table_name="TrafficEvents", metadata_table="TrafficMetadata", workers=MAX_QUERY_WORKERS):
+    # Only needed for table warm starts, so file warm starts never import the SDK helpers
+    from traffic_ingester.helper_functions.table_client_registry_helper import get_table_client
+    from traffic_ingester.helper_functions.cleanup_inactive_events_helper import get_active_index, EVENTS_PARTITION_KEY
+
+    table_client = get_table_client(connection_string, table_name)
+    active_keys = get_active_index(connection_string, metadata_table) or set()
+    ranges = key_ranges(active_keys, min(workers, -(-len(active_keys) // PAGE_SIZE)))
+    if len(ranges) == 1:
+        return query_active_events(table_client, EVENTS_PARTITION_KEY)
+
+    with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+        pages = executor.map(lambda key_range: query_active_events(table_client, EVENTS_PARTITION_KEY, key_range), ranges)
+        return [event for page in pages for event in page]
@@ -1,17 +1,35 @@
+import time
+
+# Start of the module import, for the cold start report
+IMPORT_STARTED = time.perf_counter()
+
 import azure.functions as func
 import logging
-import requests
-import time
+import asyncio
+import json
 import os
-from dotenv import load_dotenv
-from traffic_ingester.helper_functions import ensure_table_exists, transform_events, sanitize_event, cleanup_inactive_events, store_event_in_table, has_new_events, update_hash, get_last_hash
+from datetime import datetime, timedelta, timezone
+from traffic_ingester.lazy_import import lazy_import, lazy_import_timings
+from traffic_ingester.wire_format import resolve_wire_format
+from traffic_ingester.helper_functions import ensure_table_exists, transform_events, iter_transform_events, sanitize_event, sync_active_index, store_events_in_table_batch, store_event_stream_in_table, event_key, get_event_delta, has_event_changes, update_fingerprints, get_last_fingerprints, diff_fingerprints, iter_changed_events, iter_feed_events, get_http_validators, update_http_validators, conditional_request_headers, push_events_to_dashboard, reset_client_stats, get_client_stats, time_stage, report_stage_timings, fetch_feed_async, store_events_in_table_batch_async, push_events_to_dashboard_async, record_history, record_history_day, query_history, query_status_log, update_event_snapshot, snapshot_columns
+
+# requests, aiohttp and the Azure Tables SDK (in the helpers) are imported on first use
+# rather than during the Functions host's cold start; timer runs never import aiohttp
+requests = lazy_import("requests")
+aiohttp = lazy_import("aiohttp")
+
+# Import-time stages, in ms, for the cold start report
+startup_timings = {"imports": round((time.perf_counter() - IMPORT_STARTED) * 1000, 1)}
 
 # Suppress all Azure SDK logs
 logging.getLogger("azure").setLevel(logging.WARNING)
 
-# Explicitly load the .env file from this folder
+# Explicitly load the .env file from this folder. Deployed apps use app settings instead,
+# so dotenv is only imported when there is a file to load.
 BASE_DIR = os.path.dirname(__file__)
-load_dotenv(dotenv_path=os.path.join(BASE_DIR, ".env"))
+if os.path.exists(os.path.join(BASE_DIR, ".env")):
+    from dotenv import load_dotenv
+    load_dotenv(dotenv_path=os.path.join(BASE_DIR, ".env"))
 
 app = func.FunctionApp()
 
@@ -19,77 +37,149 @@ app = func.FunctionApp()
 TRAFFIC_URL = os.getenv("TRAFFIC_URL")
 STORAGE_CONNECTION_STRING = os.getenv("STORAGE_CONNECTION_STRING")
 TABLE_NAME = os.getenv("TABLE_NAME")
+METADATA_TABLE_NAME = "TrafficMetadata"
+DASHBOARD_URL = os.getenv("DASHBOARD_URL", "http://localhost:8050/update-dashboard")
+# json, columnar (compact binary, see wire_format.py) or msgpack; JSON is the fallback
+DASHBOARD_WIRE_FORMAT = resolve_wire_format(os.getenv("DASHBOARD_WIRE_FORMAT", "json"))
 
-ensure_table_exists(STORAGE_CONNECTION_STRING, TABLE_NAME)
+# History mode also keeps every event in day-partitioned HISTORY_TABLE_NAME with an
+# append-only status log, queryable through QueryTrafficHistory
+HISTORY_MODE = os.getenv("HISTORY_MODE", "false").lower() == "true"
+HISTORY_TABLE_NAME = os.getenv("HISTORY_TABLE_NAME", "TrafficHistory")
+
+# Optional local snapshot of the ACTIVE events (Arrow IPC when
+# pyarrow is installed), rewritten after every run so the dashboard can warm-start from it
+EVENT_SNAPSHOT_FILE = os.getenv("EVENT_SNAPSHOT_FILE")
 
 # Retry configuration
 MAX_RETRIES = 3
 BACKOFF_SECONDS = 5
 
+# Streaming ingestion parses the feed incrementally instead of loading it whole. Changed
+# events are published (pushed, recorded) in batches of STREAM_PUSH_BATCH, so at most one
+# batch is held in memory however large the feed or the delta is.
+STREAM_EVENTS = os.getenv("STREAM_EVENTS", "false").lower() == "true"
+STREAM_CHUNK_SIZE = 65536
+STREAM_PUSH_BATCH = 1000
+
+startup_timings["module"] = round((time.perf_counter() - IMPORT_STARTED) * 1000, 1)
+cold_start_reported = False
+
+# Create the tables this app writes to. Deferred from import time to the first invocation
+# (a network round trip the host would otherwise wait on); ensure_table_exists caches each
+# table for the life of the process, so later invocations skip the round trip.
+def ensure_tables():
+    ensure_table_exists(STORAGE_CONNECTION_STRING, TABLE_NAME)
+    if HISTORY_MODE:
+        ensure_table_exists(STORAGE_CONNECTION_STRING, HISTORY_TABLE_NAME)
+
+# Print the import/cold start breakdown once per process, on the first invocation: module
+# import time, then each lazily imported dependency as it was first used
+def report_cold_start():
+    global cold_start_reported
+    if cold_start_reported:
+        return
+    cold_start_reported = True
+    imports = {f"import {module}": ms for module, ms in lazy_import_timings().items()}
+    report_stage_timings("Cold start", {**startup_timings, **imports})
+
+# If the API returns a dict with 'events' key, extract it
+def extract_events(data):
+    if isinstance(data, dict) and "events" in data:
+        return data["events"]
+    elif isinstance(data, list):
+        return data
+    return None
+
 # Azure Function to fetch traffic events from Ottawa Traffic API
 @app.function_name(name="FetchTrafficEvents")
 @app.schedule(schedule="*/5 * * * *", arg_name="timer", run_on_startup=True, use_monitor=False)
 def fetch_traffic_events(timer: func.TimerRequest) -> None:
 # @app.route(route="FetchTrafficEvents", auth_level=func.AuthLevel.ANONYMOUS)
 # def fetch_traffic_events(req: func.HttpRequest) -> func.HttpResponse:
+    # Count Table client/connection reuse per invocation
+    reset_client_stats()
+    timings = {}
+    try:
+        with time_stage(timings, "total"):
+            with time_stage(timings, "provision"):
+                ensure_tables()
+            if HISTORY_MODE:
+                with time_stage(timings, "history_day"):
+                    record_history_day(STORAGE_CONNECTION_STRING, TABLE_NAME, HISTORY_TABLE_NAME, METADATA_TABLE_NAME)
+            ingest_traffic_events(timings)
+    finally:
+        report_stage_timings("FetchTrafficEvents", timings)
+        report_cold_start()
+        print(f"[Table clients] {get_client_stats()}")
+
+# Fetch, transform, store and broadcast one snapshot of the traffic feed
+def ingest_traffic_events(timings) -> None:
+    # Send the last processed feed's ETag/Last-Modified so an unchanged feed costs a 304
+    headers = conditional_request_headers(get_http_validators(STORAGE_CONNECTION_STRING, METADATA_TABLE_NAME))
+
     attempt = 0
     while attempt < MAX_RETRIES:
         try:
+            # Stream the feed through the generator pipeline instead of loading it whole
+            if STREAM_EVENTS:
+                with time_stage(timings, "fetch"):
+                    response = requests.get(TRAFFIC_URL, timeout=10, stream=True, headers=headers)
+                # Enter the response first, so every exit (304, errors) releases the connection
+                with response:
+                    if is_not_modified(response):
+                        return
+                    response.raise_for_status()
+                    if ingest_event_stream(response.iter_content(chunk_size=STREAM_CHUNK_SIZE), timings):
+                        update_http_validators(STORAGE_CONNECTION_STRING, METADATA_TABLE_NAME, response.headers)
+                return
+
             # Ensure that traffic events was successfully fetched from the Ottawa Traffic API
-            response = requests.get(TRAFFIC_URL, timeout=10)
-            response.raise_for_status()
-            
-            # Parse JSON safely
-            data = response.json()
+            with time_stage(timings, "fetch"):
+                response = requests.get(TRAFFIC_URL, timeout=10, headers=headers)
+                if is_not_modified(response):
+                    return
+                response.raise_for_status()
 
-            # If the API returns a dict with 'events' key, extract it
-            if isinstance(data, dict) and "events" in data:
-                events = data["events"]
-            elif isinstance(data, list):
-                events = data
-            else:
+            # Parse JSON safely
+            with time_stage(timings, "parse"):
+                events = extract_events(response.json())
+            if events is None:
                 print("Unexpected data format from traffic API")
                 return
                 # return func.HttpResponse("Unexpected data format", status_code=500)
-            
-            # Check to see if there are new events using hashing
-            if not has_new_events(events, STORAGE_CONNECTION_STRING, "TrafficMetadata"):
+
+            # Check which events were added, changed or removed using per-event fingerprints
+            with time_stage(timings, "delta"):
+                delta = get_event_delta(events, STORAGE_CONNECTION_STRING, METADATA_TABLE_NAME)
+            if not has_event_changes(delta):
                 print("No new traffic events detected. Skipping broadcast.")
+                update_http_validators(STORAGE_CONNECTION_STRING, METADATA_TABLE_NAME, response.headers)
                 return
                 # return func.HttpResponse("No new traffic events detected. Skipping.", status_code=200)
 
-            # New events exist; transform the events for data visualization, deactivate events not in current
-            # API request, and broadcast through Websocket
-            else: 
+            # New events exist; transform only the delta for data visualization, deactivate events not in current
+            # API request, and broadcast the delta to the dashboard
+            else:
                 # Ensure the data has valid characters and keys
-                events = transform_events([sanitize_event(e) for e in events])
-                for event in events:
-                    description = event.get("Location", "Unknown location")
-                    event_type = event.get("EventType", "Unknown event")
-                    status = event.get("Status", "UNKNOWN")
-                    
-                    # If the data is ACTIVE, we want to store it
-                    try:
-                        if status == "ACTIVE":
-                            store_event_in_table(event, STORAGE_CONNECTION_STRING, TABLE_NAME)
-                        else:
-                            pass
-                    except requests.exceptions.RequestException as e:
-                        print(f"Failed to store event for {event_type} at {description}: {str(e)}".encode('ascii', 'replace').decode())
-                        break
-
-                cleanup_inactive_events(events, STORAGE_CONNECTION_STRING, TABLE_NAME)
-
-                # Push to Dashboard endpoint
-                try:
-                    resp = requests.post(
-                        "http://localhost:8050/update-dashboard",
-                        json={"events": events},
-                        timeout=5
-                    )
-                    resp.raise_for_status()
-                except Exception as e:
-                    print(f"Push failed: {e}")
+                with time_stage(timings, "transform"):
+                    changed_keys = set(delta["added"]) | set(delta["changed"])
+                    delta_events = transform_events([sanitize_event(e) for e in events if event_key(e) in changed_keys])
+
+                # Only ACTIVE events are stored; they are written as partition-grouped batch transactions
+                with time_stage(timings, "store"):
+                    active_events = [event for event in delta_events if event.get("Status", "UNKNOWN") == "ACTIVE"]
+                    results = store_events_in_table_batch(active_events, STORAGE_CONNECTION_STRING, TABLE_NAME)
+
+                completed = finish_ingest(
+                    delta,
+                    delta_events,
+                    results,
+                    lambda: transform_events([sanitize_event(e) for e in events]),
+                    timings
+                )
+                if completed:
+                    update_http_validators(STORAGE_CONNECTION_STRING, METADATA_TABLE_NAME, response.headers)
                 return
                 #return func.HttpResponse("Traffic successfully ingested. Checkout Dash!", status_code=200)
         except requests.exceptions.RequestException as e:
@@ -100,3 +190,297 @@ def fetch_traffic_events(timer: func.TimerRequest) -> None:
     print("All retries failed. Could not fetch traffic events.")
     return
     #return func.HttpResponse("Failed to fetch traffic events after retries", status_code=500)
+
+# A 304 means the feed is unchanged since the last fully processed run
+def is_not_modified(response) -> bool:
+    if response.status_code == 304:
+        print("Traffic feed not modified since last run (304). Skipping.")
+        return True
+    return False
+
+# Cleanup, dashboard push and fingerprint bookkeeping shared by the sync ingestion paths.
+# Returns False when some events failed to store, or the dashboard push or history write
+# failed, and the run must be retried on a full fetch.
+def finish_ingest(delta, delta_events, results, full_snapshot, timings) -> bool:
+    # Deactivate only events that left the feed, tracked through the ACTIVE index
+    with time_stage(timings, "cleanup"):
+        current_keys = set(delta["fingerprints"])
+        stored_keys = set(results["succeeded"])
+        sync_active_index(current_keys, stored_keys, STORAGE_CONNECTION_STRING, TABLE_NAME, METADATA_TABLE_NAME)
+
+    failure = publish_changes(delta, delta_events, full_snapshot, timings)
+    if failure:
+        return skip_incomplete_run(failure)
+
+    # Remember the fingerprints last; events that failed to store are retried next run
+    failed_keys = set(results["failed"])
+    fingerprints = {key: value for key, value in delta["fingerprints"].items() if key not in failed_keys}
+    update_fingerprints(STORAGE_CONNECTION_STRING, METADATA_TABLE_NAME, fingerprints)
+    return not failed_keys
+
+# Push, history and event snapshot for one set of changes. Returns why the run is
+# incomplete, or None once every step succeeded. update_snapshot=False leaves the event
+# snapshot to the caller (streaming writes it once, after the whole feed).
+def publish_changes(delta, delta_events, full_snapshot, timings, snapshot_chunk_size=None, update_snapshot=True):
+    # Push to Dashboard endpoint; the first run (or a dashboard without a snapshot) gets everything
+    with time_stage(timings, "push"):
+        if delta["initial"]:
+            pushed = push_events_to_dashboard(delta_events, DASHBOARD_URL, wire_format=DASHBOARD_WIRE_FORMAT)
+        else:
+            pushed = push_events_to_dashboard(
+                delta_events,
+                DASHBOARD_URL,
+                removed=delta["removed"],
+                full_snapshot=full_snapshot,
+                wire_format=DASHBOARD_WIRE_FORMAT,
+                snapshot_chunk_size=snapshot_chunk_size
+            )
+    if not pushed:
+        return "Dashboard push failed"
+
+    if HISTORY_MODE:
+        with time_stage(timings, "history"):
+            history = record_history(delta, delta_events, STORAGE_CONNECTION_STRING, HISTORY_TABLE_NAME)
+        if history["failed"]:
+            return "History write failed"
+
+    if EVENT_SNAPSHOT_FILE and update_snapshot:
+        with time_stage(timings, "snapshot"):
+            update_event_snapshot(EVENT_SNAPSHOT_FILE, delta, delta_events, full_snapshot)
+    return None
+
+# A failed push or history write leaves the stored fingerprints and HTTP validators as they
+# were, so the next run fetches the whole feed and sends the same changes again (stores are
+# idempotent upserts; status log rows of the retried delta are logged again)
+def skip_incomplete_run(reason) -> bool:
+    print(f"{reason}. Keeping previous fingerprints so the next run resends the changes.")
+    return False
+
+# Streaming ingestion: parse -> fingerprint -> sanitize -> transform -> store one event at a
+# time. Changed events are published in batches of STREAM_PUSH_BATCH as they stream past
+# (the first batch of an initial run replaces the dashboard's events, later ones are
+# deltas), so peak memory is the fingerprint map plus one batch rather than the whole feed.
+# The event snapshot file is written once, after the stream ends, from the snapshot columns
+# of the changed events. A stream that breaks off partway marks the run incomplete: the
+# fingerprints stay as they were, so the next run publishes every change again (a first
+# run starts over with a full replacement of the dashboard's events).
+def ingest_event_stream(chunks, timings) -> bool:
+    with time_stage(timings, "delta"):
+        ensure_table_exists(STORAGE_CONNECTION_STRING, METADATA_TABLE_NAME)
+        previous = get_last_fingerprints(STORAGE_CONNECTION_STRING, METADATA_TABLE_NAME)
+
+    fingerprints = {}
+    batch = []
+    published = {"batches": 0, "failure": None}
+    snapshot_changes = snapshot_columns([]) if EVENT_SNAPSHOT_FILE else None
+
+    # Publish the buffered changed events (plus removals, on the last batch) and drop them
+    def publish_batch(removed):
+        nonlocal batch
+        if published["failure"] is None:
+            delta = {
+                "initial": previous is None and published["batches"] == 0,
+                "added": [event["RowKey"] for event in batch if previous is None or event["RowKey"] not in previous],
+                "changed": [event["RowKey"] for event in batch if previous is not None and event["RowKey"] in previous],
+                "removed": removed
+            }
+            published["failure"] = publish_changes(delta, batch, iter_full_snapshot, timings, snapshot_chunk_size=STREAM_PUSH_BATCH, update_snapshot=False)
+            if snapshot_changes is not None:
+                snapshot_columns(batch, snapshot_changes)
+        published["batches"] += 1
+        batch = []
+
+    def active_delta_events():
+        changed_events = iter_changed_events(iter_feed_events(chunks), previous or {}, fingerprints)
+        for event in iter_transform_events(sanitize_event(e) for e in changed_events):
+            batch.append(event)
+            if event.get("Status", "UNKNOWN") == "ACTIVE":
+                yield event
+            if len(batch) == STREAM_PUSH_BATCH:
+                publish_batch([])
+
+    try:
+        with time_stage(timings, "stream"):
+            results = store_event_stream_in_table(active_delta_events(), STORAGE_CONNECTION_STRING, TABLE_NAME)
+    except ValueError as e:
+        return skip_incomplete_run(f"Feed stream failed after {published['batches']} published batches: {e}")
+
+    delta = diff_fingerprints(previous or {}, fingerprints)
+    delta["initial"] = previous is None
+    delta["fingerprints"] = fingerprints
+    if not has_event_changes(delta):
+        print("No new traffic events detected. Skipping broadcast.")
+        return True
+
+    # Deactivate only events that left the feed, tracked through the ACTIVE index
+    with time_stage(timings, "cleanup"):
+        sync_active_index(set(fingerprints), set(results["succeeded"]), STORAGE_CONNECTION_STRING, TABLE_NAME, METADATA_TABLE_NAME)
+
+    if batch or delta["removed"] or not published["batches"]:
+        publish_batch(delta["removed"])
+    if published["failure"]:
+        return skip_incomplete_run(published["failure"])
+
+    if EVENT_SNAPSHOT_FILE:
+        with time_stage(timings, "snapshot"):
+            update_event_snapshot(EVENT_SNAPSHOT_FILE, delta, [], iter_full_snapshot, delta_columns=snapshot_changes)
+
+    # Remember the fingerprints last; events that failed to store are retried next run
+    failed_keys = set(results["failed"])
+    update_fingerprints(STORAGE_CONNECTION_STRING, METADATA_TABLE_NAME, {key: value for key, value in fingerprints.items() if key not in failed_keys})
+    return not failed_keys
+
+# Re-fetch and transform the whole feed, streamed, when the dashboard or the event snapshot
+# needs a full snapshot; consumers take it in chunks instead of holding it whole
+def iter_full_snapshot():
+    with requests.get(TRAFFIC_URL, timeout=10, stream=True) as response:
+        response.raise_for_status()
+        raw_events = iter_feed_events(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+        yield from iter_transform_events(sanitize_event(e) for e in raw_events)
+
+# Async variant of FetchTrafficEvents: async HTTP, async Table clients with bounded
+# concurrent batch writes, and non-blocking backoff. Returns per-stage latency so it
+# can be compared with the sync path. Each call runs a full ingest, so it needs the
+# function key (?code=... or x-functions-key).
+@app.function_name(name="FetchTrafficEventsAsync")
+@app.route(route="FetchTrafficEventsAsync", auth_level=func.AuthLevel.FUNCTION)
+async def fetch_traffic_events_async(req: func.HttpRequest) -> func.HttpResponse:
+    timings = {}
+    with time_stage(timings, "total"):
+        with time_stage(timings, "provision"):
+            await asyncio.to_thread(ensure_tables)
+        if HISTORY_MODE:
+            with time_stage(timings, "history_day"):
+                await asyncio.to_thread(record_history_day, STORAGE_CONNECTION_STRING, TABLE_NAME, HISTORY_TABLE_NAME, METADATA_TABLE_NAME)
+        status = await ingest_traffic_events_async(timings)
+    report_stage_timings("FetchTrafficEventsAsync", timings)
+    report_cold_start()
+    return func.HttpResponse(
+        json.dumps({"status": status, "stages_ms": timings}),
+        mimetype="application/json",
+        status_code=500 if status in ("failed", "push_failed", "history_failed") else 200
+    )
+
+# Async fetch, transform, store and broadcast of one snapshot of the traffic feed
+async def ingest_traffic_events_async(timings) -> str:
+    validators = await asyncio.to_thread(get_http_validators, STORAGE_CONNECTION_STRING, METADATA_TABLE_NAME)
+
+    async with aiohttp.ClientSession() as session:
+        with time_stage(timings, "fetch"):
+            status, body, response_headers = await fetch_feed_async(
+                session, TRAFFIC_URL, MAX_RETRIES, BACKOFF_SECONDS, headers=conditional_request_headers(validators)
+            )
+        if status is None:
+            print("All retries failed. Could not fetch traffic events.")
+            return "failed"
+        if status == 304:
+            print("Traffic feed not modified since last run (304). Skipping.")
+            return "not_modified"
+
+        with time_stage(timings, "parse"):
+            events = extract_events(json.loads(body))
+        if events is None:
+            print("Unexpected data format from traffic API")
+            return "failed"
+
+        # Metadata lookups stay on the pooled sync clients, off the event loop
+        with time_stage(timings, "delta"):
+            delta = await asyncio.to_thread(get_event_delta, events, STORAGE_CONNECTION_STRING, METADATA_TABLE_NAME)
+        if not has_event_changes(delta):
+            print("No new traffic events detected. Skipping broadcast.")
+            await asyncio.to_thread(update_http_validators, STORAGE_CONNECTION_STRING, METADATA_TABLE_NAME, response_headers)
+            return "unchanged"
+
+        with time_stage(timings, "transform"):
+            changed_keys = set(delta["added"]) | set(delta["changed"])
+            delta_events = transform_events([sanitize_event(e) for e in events if event_key(e) in changed_keys])
+
+        with time_stage(timings, "store"):
+            active_events = [event for event in delta_events if event.get("Status", "UNKNOWN") == "ACTIVE"]
+            results = await store_events_in_table_batch_async(active_events, STORAGE_CONNECTION_STRING, TABLE_NAME)
+            stored_keys = set(results["succeeded"])
+
+        with time_stage(timings, "cleanup"):
+            current_keys = set(delta["fingerprints"])
+            await asyncio.to_thread(sync_active_index, current_keys, stored_keys, STORAGE_CONNECTION_STRING, TABLE_NAME, METADATA_TABLE_NAME)
+
+        with time_stage(timings, "push"):
+            if delta["initial"]:
+                pushed = await push_events_to_dashboard_async(session, delta_events, DASHBOARD_URL, wire_format=DASHBOARD_WIRE_FORMAT)
+            else:
+                pushed = await push_events_to_dashboard_async(
+                    session,
+                    delta_events,
+                    DASHBOARD_URL,
+                    removed=delta["removed"],
+                    full_snapshot=lambda: transform_events([sanitize_event(e) for e in events]),
+                    wire_format=DASHBOARD_WIRE_FORMAT
+                )
+        if not pushed:
+            skip_incomplete_run("Dashboard push failed")
+            return "push_failed"
+
+        if HISTORY_MODE:
+            with time_stage(timings, "history"):
+                history = await asyncio.to_thread(record_history, delta, delta_events, STORAGE_CONNECTION_STRING, HISTORY_TABLE_NAME)
+            if history["failed"]:
+                skip_incomplete_run("History write failed")
+                return "history_failed"
+
+        if EVENT_SNAPSHOT_FILE:
+            with time_stage(timings, "snapshot"):
+                await asyncio.to_thread(
+                    update_event_snapshot,
+                    EVENT_SNAPSHOT_FILE,
+                    delta,
+                    delta_events,
+                    lambda: transform_events([sanitize_event(e) for e in events])
+                )
+
+        failed_keys = set(results["failed"])
+        fingerprints = {key: value for key, value in delta["fingerprints"].items() if key not in failed_keys}
+        await asyncio.to_thread(update_fingerprints, STORAGE_CONNECTION_STRING, METADATA_TABLE_NAME, fingerprints)
+        if not failed_keys:
+            await asyncio.to_thread(update_http_validators, STORAGE_CONNECTION_STRING, METADATA_TABLE_NAME, response_headers)
+        return "ingested"
+
+# Query the history table (HISTORY_MODE): events active at some point in [start, end] and
+# the status changes logged in that window. start/end are ISO 8601 (default: the last 24h);
+# status (e.g. ACTIVE) and event (a RowKey) narrow the result.
+@app.function_name(name="QueryTrafficHistory")
+@app.route(route="QueryTrafficHistory", auth_level=func.AuthLevel.ANONYMOUS)
+def query_traffic_history(req: func.HttpRequest) -> func.HttpResponse:
+    # Without HISTORY_MODE nothing writes the history table, so there is nothing to query
+    if not HISTORY_MODE:
+        return func.HttpResponse(json.dumps({"error": "History is disabled, set HISTORY_MODE=true to record it"}), mimetype="application/json", status_code=404)
+
+    try:
+        end = parse_query_time(req.params.get("end")) or datetime.now(timezone.utc)
+        start = parse_query_time(req.params.get("start")) or end - timedelta(days=1)
+    except ValueError as e:
+        return func.HttpResponse(json.dumps({"error": f"Invalid time: {e}"}), mimetype="application/json", status_code=400)
+    if start > end:
+        return func.HttpResponse(json.dumps({"error": "start is after end"}), mimetype="application/json", status_code=400)
+
+    event = req.params.get("event")
+    try:
+        ensure_table_exists(STORAGE_CONNECTION_STRING, HISTORY_TABLE_NAME)
+        events = query_history(STORAGE_CONNECTION_STRING, HISTORY_TABLE_NAME, start, end, status=req.params.get("status"))
+        if event:
+            events = [entity for entity in events if entity["RowKey"] == event]
+        changes = query_status_log(STORAGE_CONNECTION_STRING, HISTORY_TABLE_NAME, start, end, event_key=event)
+    except Exception as e:
+        print(f"Failed to query {HISTORY_TABLE_NAME}: {e}")
+        return func.HttpResponse(json.dumps({"error": "History query failed"}), mimetype="application/json", status_code=500)
+
+    return func.HttpResponse(
+        json.dumps({"start": start.isoformat(), "end": end.isoformat(), "events": events, "changes": changes}, default=str),
+        mimetype="application/json"
+    )
+
+# Helper to parse an ISO 8601 query parameter as a UTC datetime (naive values are UTC)
+def parse_query_time(value):
+    if not value:
+        return None
+    moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
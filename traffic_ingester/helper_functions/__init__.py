@@ -1,6 +1,14 @@
-from .cleanup_inactive_events_helper import cleanup_inactive_events
+from .table_client_registry_helper import get_table_service, get_table_client, get_async_table_client, get_client_stats, reset_client_stats, clear_table_clients
+from .cleanup_inactive_events_helper import deactivate_events, sync_active_index
 from .store_event_in_table_helper import store_event_in_table
-from .ensure_table_exists_helper import ensure_table_exists
-from .hash_tracker_helper import get_last_hash, update_hash, has_new_events
+from .store_events_batch_helper import store_events_in_table_batch, store_event_stream_in_table, submit_operations_in_batches
+from .ensure_table_exists_helper import ensure_table_exists, forget_ensured_tables
+from .hash_tracker_helper import get_last_hash, update_hash, has_new_events, event_key, get_event_delta, has_event_changes, update_fingerprints, get_last_fingerprints, diff_fingerprints, iter_changed_events, get_http_validators, update_http_validators, conditional_request_headers
+from .dashboard_push_helper import push_events_to_dashboard
 from .sanitize_event_helper import sanitize_event
-from .transform_events_helper import transform_events
\ No newline at end of file
+from .transform_events_helper import transform_events, transform_event, iter_transform_events
+from .stream_events_helper import iter_feed_events
+from .timing_helper import time_stage, report_stage_timings
+from .async_ingest_helper import fetch_feed_async, store_events_in_table_batch_async, push_events_to_dashboard_async
+from .history_store_helper import record_history, record_history_day, query_history, query_status_log
+from .event_snapshot_helper import update_event_snapshot, snapshot_columns
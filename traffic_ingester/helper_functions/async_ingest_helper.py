@@ -0,0 +1,119 @@
+import asyncio
+import random
+from traffic_ingester.lazy_import import lazy_import
+from traffic_ingester.helper_functions.store_events_batch_helper import chunk_operations_by_partition
+from traffic_ingester.helper_functions.table_client_registry_helper import get_async_table_client
+from traffic_ingester.wire_format import CONTENT_TYPES, encode_payload, resolve_wire_format
+
+# Only the async variant needs these, so timer runs never import them
+aiohttp = lazy_import("aiohttp")
+tables = lazy_import("azure.data.tables")
+
+# Upper bound on concurrent submit_transaction calls per invocation
+MAX_CONCURRENT_WRITES = 8
+
+# Helper function to fetch the traffic feed without blocking the worker during retries.
+# Returns (status, body, headers); status is None once every retry has failed.
+async def fetch_feed_async(session, url, max_retries, backoff_seconds, headers=None, timeout=10):
+    for attempt in range(1, max_retries + 1):
+        try:
+            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                if response.status == 304:
+                    return 304, b"", response.headers
+                response.raise_for_status()
+                return response.status, await response.read(), response.headers
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Request failed: {type(e).__name__} - {str(e)}")
+            if attempt < max_retries:
+                # Linear backoff with jitter so parallel workers do not retry in lockstep
+                await asyncio.sleep(backoff_seconds * attempt * random.uniform(0.5, 1.5))
+    return None, None, None
+
+# Helper function to apply one operation with the async client (used when a transaction fails)
+async def apply_operation_async(table_client, operation):
+    action, entity = operation[0], operation[1]
+    kwargs = operation[2] if len(operation) > 2 else {}
+
+    if action == "upsert":
+        await table_client.upsert_entity(entity, **kwargs)
+    elif action == "update":
+        await table_client.update_entity(entity, **kwargs)
+    elif action == "create":
+        await table_client.create_entity(entity, **kwargs)
+    elif action == "delete":
+        await table_client.delete_entity(partition_key=entity["PartitionKey"], row_key=entity["RowKey"], **kwargs)
+    else:
+        raise ValueError(f"Unsupported table operation: {action}")
+
+# Helper function to submit batched transactions concurrently, bounded by a semaphore
+async def submit_operations_in_batches_async(table_client, operations, max_concurrency=MAX_CONCURRENT_WRITES):
+    results = {"succeeded": [], "failed": {}, "transactions": 0}
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def submit_chunk(chunk):
+        async with semaphore:
+            results["transactions"] += 1
+            try:
+                await table_client.submit_transaction(chunk)
+                results["succeeded"].extend(operation[1]["RowKey"] for operation in chunk)
+            except tables.TableTransactionError as e:
+                print(f"Transaction failed at operation {e.index}, retrying {len(chunk)} entities individually")
+                for operation in chunk:
+                    row_key = operation[1]["RowKey"]
+                    try:
+                        await apply_operation_async(table_client, operation)
+                        results["succeeded"].append(row_key)
+                    except Exception as entity_error:
+                        results["failed"][row_key] = str(entity_error)
+            except Exception as e:
+                for operation in chunk:
+                    results["failed"][operation[1]["RowKey"]] = str(e)
+
+    await asyncio.gather(*(submit_chunk(chunk) for chunk in chunk_operations_by_partition(operations)))
+    return results
+
+# Helper function to upsert events with concurrent batch transactions on the cached async Table client
+async def store_events_in_table_batch_async(events, connection_string, table_name, max_concurrency=MAX_CONCURRENT_WRITES):
+    table_client = get_async_table_client(connection_string, table_name)
+    operations = [("upsert", event) for event in events]
+    results = await submit_operations_in_batches_async(table_client, operations, max_concurrency)
+
+    print(
+        f"Stored {len(results['succeeded'])}/{len(operations)} events in {table_name} "
+        f"using {results['transactions']} transactions"
+    )
+    for row_key, error in results["failed"].items():
+        print(f"Failed to store entity {row_key}: {error}")
+
+    return results
+
+# Helper function to POST one payload without blocking (see post_payload)
+async def post_payload_async(session, dashboard_url, payload, wire_format, client_timeout):
+    wire_format = resolve_wire_format(wire_format)
+    if wire_format != "json":
+        headers = {"Content-Type": CONTENT_TYPES[wire_format]}
+        async with session.post(dashboard_url, data=encode_payload(payload, wire_format), headers=headers, timeout=client_timeout) as resp:
+            if resp.status != 415:
+                return resp
+        print(f"Dashboard does not accept {wire_format} payloads, sending JSON")
+    async with session.post(dashboard_url, json=payload, timeout=client_timeout) as resp:
+        return resp
+
+# Helper function to push events to the dashboard without blocking (see push_events_to_dashboard)
+async def push_events_to_dashboard_async(session, events, dashboard_url, removed=None, full_snapshot=None, timeout=5, wire_format="json"):
+    if full_snapshot is None:
+        payload = {"events": events}
+    else:
+        payload = {"events": events, "removed": removed or [], "mode": "delta"}
+
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    try:
+        resp = await post_payload_async(session, dashboard_url, payload, wire_format, client_timeout)
+        if resp.status == 409 and full_snapshot is not None:
+            print("Dashboard has no snapshot to apply the delta to, sending full snapshot")
+            resp = await post_payload_async(session, dashboard_url, {"events": full_snapshot()}, wire_format, client_timeout)
+        resp.raise_for_status()
+        return True
+    except Exception as e:
+        print(f"Push failed: {e}")
+        return False
@@ -1,30 +1,95 @@
-from azure.data.tables import TableServiceClient
+from traffic_ingester.helper_functions.table_client_registry_helper import get_table_client
+from traffic_ingester.helper_functions.store_events_batch_helper import submit_operations_in_batches
+from traffic_ingester.helper_functions.packed_property_helper import pack_compressed_property, unpack_compressed_property
 from datetime import datetime, timezone
 
-# Helper function to mark inactive events every time the function is triggered
-def cleanup_inactive_events(current_entities, STORAGE_CONNECTION_STRING, TABLE_NAME="TrafficEvents"):
+EVENTS_PARTITION_KEY = "OttawaTraffic"
+ACTIVE_INDEX_PARTITION_KEY = "TrafficIndex"
+ACTIVE_INDEX_ROW_KEY = "ActiveKeys"
+
+# Helper function to load the persisted set of RowKeys currently ACTIVE in storage
+def get_active_index(connection_string, metadata_table):
     try:
-        print(f"Starting cleanup for {TABLE_NAME}. Total current entities: {len(current_entities)}")
+        table_client = get_table_client(connection_string, metadata_table)
+        entity = table_client.get_entity(partition_key=ACTIVE_INDEX_PARTITION_KEY, row_key=ACTIVE_INDEX_ROW_KEY)
+        keys = unpack_compressed_property(entity, "Keys").decode()
+        return set(keys.split("\n")) if keys else set()
+    except Exception:
+        return None  # No index stored yet
 
-        table_service = TableServiceClient.from_connection_string(conn_str=STORAGE_CONNECTION_STRING)
-        table_client = table_service.get_table_client(table_name=TABLE_NAME)
+# Helper function to persist the ACTIVE RowKey index as a compressed binary property
+def update_active_index(connection_string, metadata_table, active_keys):
+    table_client = get_table_client(connection_string, metadata_table)
+    entity = {
+        "PartitionKey": ACTIVE_INDEX_PARTITION_KEY,
+        "RowKey": ACTIVE_INDEX_ROW_KEY,
+        "Count": len(active_keys),
+        **pack_compressed_property("Keys", "\n".join(sorted(active_keys)).encode())
+    }
+    try:
+        table_client.upsert_entity(entity)
+    except Exception as e:
+        # A stale index would hide deactivations, so drop it and rebuild from a full scan next tick
+        print(f"Failed to update active index, it will be rebuilt: {e}")
+        try:
+            table_client.delete_entity(partition_key=ACTIVE_INDEX_PARTITION_KEY, row_key=ACTIVE_INDEX_ROW_KEY)
+        except Exception:
+            pass
 
-        # Build set of current RowKeys from transformed entities
-        current_keys = {entity["RowKey"] for entity in current_entities}
+# Helper function to rebuild the ACTIVE RowKey index with a one-off partition scan
+def scan_active_keys(connection_string, table_name):
+    table_client = get_table_client(connection_string, table_name)
+    stored_entities = table_client.query_entities(
+        f"PartitionKey eq '{EVENTS_PARTITION_KEY}' and Status eq 'ACTIVE'",
+        select=["RowKey"]
+    )
+    return {entity["RowKey"] for entity in stored_entities}
 
-        # Query all ACTIVE entities in storage
-        stored_entities = table_client.query_entities("PartitionKey eq 'OttawaTraffic'")
-        for entity in stored_entities:
-            row_key = entity["RowKey"]
-            status = entity.get("Status", "")
-            if status == "ACTIVE" and row_key not in current_keys:
-                print(f"Marking event as INACTIVE: {row_key}")
-                entity["Status"] = "INACTIVE"
-                entity["LastSeen"] = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
-                table_client.update_entity(entity, mode="MERGE")
+# Helper function to mark the given RowKeys INACTIVE using batched MERGE transactions
+def deactivate_events(row_keys, connection_string, table_name):
+    table_client = get_table_client(connection_string, table_name)
+    last_seen = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
-    except Exception as e:
-        print(f"Failed to mark inactive events in {TABLE_NAME}: {str(e)}")
+    # Update-merge touches only Status/LastSeen. Unlike an upsert it never recreates a row
+    # that was deleted since it was indexed; such keys come back under "missing".
+    operations = [
+        ("update", {
+            "PartitionKey": EVENTS_PARTITION_KEY,
+            "RowKey": row_key,
+            "Status": "INACTIVE",
+            "LastSeen": last_seen
+        }, {"mode": "merge"})
+        for row_key in sorted(row_keys)
+    ]
+    for row_key in sorted(row_keys):
+        print(f"Marking event as INACTIVE: {row_key}")
+    return submit_operations_in_batches(table_client, operations, missing_ok=True)
+
+# Helper function to diff the feed against the ACTIVE index and flush only the changes
+def sync_active_index(current_keys, stored_active_keys, connection_string, table_name, metadata_table):
+    previous_index = get_active_index(connection_string, metadata_table)
+    if previous_index is None:
+        print(f"No active index found in {metadata_table}, rebuilding from {table_name}")
+        previous_index = scan_active_keys(connection_string, table_name)
+
+    active_keys = previous_index | set(stored_active_keys)
+    stale_keys = active_keys - set(current_keys)
+
+    failed_keys, missing_keys = set(), set()
+    if stale_keys:
+        results = deactivate_events(stale_keys, connection_string, table_name)
+        failed_keys, missing_keys = set(results["failed"]), set(results["missing"])
+        for row_key, error in results["failed"].items():
+            print(f"Failed to mark {row_key} as INACTIVE, will retry next run: {error}")
+        for row_key in sorted(missing_keys):
+            print(f"Dropping {row_key} from the active index, it is no longer stored")
+
+    # Keys that failed to deactivate stay in the index so the next tick retries them
+    new_index = (active_keys - stale_keys) | failed_keys
+    if new_index != previous_index:
+        update_active_index(connection_string, metadata_table, new_index)
+
+    return stale_keys - failed_keys - missing_keys
 
 # from azure.data.tables import TableServiceClient
 
@@ -0,0 +1,63 @@
+from traffic_ingester.lazy_import import lazy_import
+from traffic_ingester.wire_format import CONTENT_TYPES, encode_payload, resolve_wire_format
+
+requests = lazy_import("requests")
+
+# Helper function to POST one payload in the given wire format, falling back to JSON when
+# the format is unknown or unavailable here, or the dashboard does not accept it (415)
+def post_payload(dashboard_url, payload, wire_format="json", timeout=5):
+    wire_format = resolve_wire_format(wire_format)
+    if wire_format != "json":
+        headers = {"Content-Type": CONTENT_TYPES[wire_format]}
+        resp = requests.post(dashboard_url, data=encode_payload(payload, wire_format), headers=headers, timeout=timeout)
+        if resp.status_code != 415:
+            return resp
+        print(f"Dashboard does not accept {wire_format} payloads, sending JSON")
+    return requests.post(dashboard_url, json=payload, timeout=timeout)
+
+# Helper function to send a full snapshot in bounded chunks: the first chunk replaces the
+# dashboard's events and the rest are applied as deltas, so the snapshot is never held whole
+def post_snapshot_in_chunks(dashboard_url, events, chunk_size, wire_format="json", timeout=5):
+    chunk, first = [], True
+    for event in events:
+        chunk.append(event)
+        if len(chunk) == chunk_size:
+            post_payload(dashboard_url, snapshot_chunk_payload(chunk, first), wire_format, timeout).raise_for_status()
+            chunk, first = [], False
+    if chunk:
+        post_payload(dashboard_url, snapshot_chunk_payload(chunk, first), wire_format, timeout).raise_for_status()
+
+# Helper function to build the payload of one snapshot chunk
+def snapshot_chunk_payload(events, first):
+    return {"events": events} if first else {"events": events, "removed": [], "mode": "delta"}
+
+# Helper function to push events to the dashboard, as a delta when possible
+def push_events_to_dashboard(events, dashboard_url, removed=None, full_snapshot=None, timeout=5, wire_format="json", snapshot_chunk_size=None):
+    """
+    Push transformed events to the dashboard's /update-dashboard endpoint.
+
+    Without full_snapshot the events are sent as the complete snapshot. With it,
+    only the changed events and removed RowKeys are sent; if the dashboard has no
+    snapshot to apply the delta to it answers 409 and full_snapshot() is sent instead,
+    in chunks of snapshot_chunk_size events when given (full_snapshot() may then be
+    an iterator). wire_format "columnar" or "msgpack" sends a compact binary body
+    instead of JSON.
+    """
+    if full_snapshot is None:
+        payload = {"events": events}
+    else:
+        payload = {"events": events, "removed": removed or [], "mode": "delta"}
+
+    try:
+        resp = post_payload(dashboard_url, payload, wire_format, timeout)
+        if resp.status_code == 409 and full_snapshot is not None:
+            print("Dashboard has no snapshot to apply the delta to, sending full snapshot")
+            if snapshot_chunk_size:
+                post_snapshot_in_chunks(dashboard_url, full_snapshot(), snapshot_chunk_size, wire_format, timeout)
+                return True
+            resp = post_payload(dashboard_url, {"events": full_snapshot()}, wire_format, timeout)
+        resp.raise_for_status()
+        return True
+    except Exception as e:
+        print(f"Push failed: {e}")
+        return False
@@ -1,13 +1,30 @@
-from azure.data.tables import TableServiceClient
+import threading
+from traffic_ingester.helper_functions.table_client_registry_helper import get_table_service
+
+# Tables known to exist, per (connection string, table name). Creating a table is a network
+# round trip, so each one is provisioned once per process rather than on every call.
+_ensured_tables = set()
+_ensured_lock = threading.Lock()
 
 # Helper function to ensure Table Storage table exists
 def ensure_table_exists(STORAGE_CONNECTION_STRING, TABLE_NAME):
     """
     Ensure that the given table exists in Table Storage (Azurite or Azure).
-    Creates it if it does not exist.
+    Creates it if it does not exist. Only a successful check is cached, so a
+    failed one is retried on the next call.
     """
+    key = (STORAGE_CONNECTION_STRING, TABLE_NAME)
+    if key in _ensured_tables:
+        return
     try:
-        service = TableServiceClient.from_connection_string(STORAGE_CONNECTION_STRING)
+        service = get_table_service(STORAGE_CONNECTION_STRING)
         service.create_table_if_not_exists(TABLE_NAME)
+        with _ensured_lock:
+            _ensured_tables.add(key)
     except Exception as e:
         print(f"Failed to ensure table exists: {e}")
+
+# Helper function to forget which tables were provisioned (e.g. after a table is deleted)
+def forget_ensured_tables():
+    with _ensured_lock:
+        _ensured_tables.clear()
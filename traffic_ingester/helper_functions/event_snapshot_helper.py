@@ -0,0 +1,53 @@
+from traffic_ingester.snapshot_file import write_snapshot, read_snapshot_columns
+from traffic_ingester.helper_functions.transform_events_helper import ENTITY_COLUMNS
+
+# Columns of the ingester's event snapshot: the stored entity columns. Coordinates stay as
+# GeoCoordinates; the dashboard decodes them in bulk when it reads the snapshot.
+SNAPSHOT_COLUMNS = ENTITY_COLUMNS
+
+# Helper function to build snapshot columns from the ACTIVE events among transformed entities
+# (any iterable; only the columns are kept), appending to columns when given
+def snapshot_columns(events, columns=None):
+    columns = {name: [] for name in ENTITY_COLUMNS} if columns is None else columns
+    for event in events:
+        if event.get("Status") == "ACTIVE":
+            for name in ENTITY_COLUMNS:
+                columns[name].append(event.get(name))
+    return columns
+
+# Helper function to apply one run's delta to the local event snapshot file: rows of removed
+# and changed events are dropped and the changed ACTIVE events appended, so only the delta
+# is parsed. The first run, or a missing or unreadable file, writes the full ACTIVE set.
+# delta_columns, when given, holds the changed events already reduced by snapshot_columns.
+def update_event_snapshot(path, delta, delta_events, full_snapshot, delta_columns=None):
+    try:
+        previous = None
+        if not delta["initial"]:
+            try:
+                previous = read_snapshot_columns(path)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Rebuilding event snapshot {path}: {e}")
+
+        if previous is None or not set(SNAPSHOT_COLUMNS) <= set(previous[1]):
+            version = previous[0]["version"] if previous else 0
+            if delta["initial"]:
+                columns = delta_columns if delta_columns is not None else snapshot_columns(delta_events)
+            else:
+                columns = snapshot_columns(full_snapshot())
+        else:
+            header, kept = previous
+            version = header["version"]
+            replaced = set(delta["removed"]) | set(delta["added"]) | set(delta["changed"])
+            rows = [row for row, row_key in enumerate(kept["RowKey"]) if row_key not in replaced]
+            added = delta_columns if delta_columns is not None else snapshot_columns(delta_events)
+            columns = {name: [kept[name][row] for row in rows] + added[name] for name in SNAPSHOT_COLUMNS}
+
+        write_snapshot(path, columns, version=version + 1)
+        print(f"Wrote {len(columns['RowKey'])} ACTIVE events to event snapshot {path} (version {version + 1})")
+        return version + 1
+    except Exception as e:
+        # The snapshot only speeds up restarts; the next run rewrites it
+        print(f"Failed to update event snapshot {path}: {e}")
+        return None
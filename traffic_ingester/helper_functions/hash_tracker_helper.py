@@ -1,5 +1,6 @@
-from azure.data.tables import TableServiceClient
+from traffic_ingester.helper_functions.table_client_registry_helper import get_table_client
 from traffic_ingester.helper_functions.ensure_table_exists_helper import ensure_table_exists
+from traffic_ingester.helper_functions.packed_property_helper import pack_compressed_property, unpack_compressed_property
 import hashlib
 import json
 
@@ -11,8 +12,7 @@ ROW_KEY = "LastHash"
 # Helper function to get the last stored hash
 def get_last_hash(connection_string, table_name):
     try:
-        table_service = TableServiceClient.from_connection_string(connection_string)
-        table_client = table_service.get_table_client(table_name)
+        table_client = get_table_client(connection_string, table_name)
         entity = table_client.get_entity(partition_key=PARTITION_KEY, row_key=ROW_KEY)
         return entity.get("Hash", None)
     except Exception:
@@ -20,8 +20,7 @@ def get_last_hash(connection_string, table_name):
 
 # Helper function to update the stored hash
 def update_hash(connection_string, table_name, new_hash):
-    table_service = TableServiceClient.from_connection_string(connection_string)
-    table_client = table_service.get_table_client(table_name)
+    table_client = get_table_client(connection_string, table_name)
     entity = {
         "PartitionKey": PARTITION_KEY,
         "RowKey": ROW_KEY,
@@ -43,3 +42,117 @@ def has_new_events(events, connection_string, table_name):
         return True
     return False
 
+
+# Per-event fingerprints, stored as one compact map so each run can work on a delta
+FINGERPRINT_ROW_KEY = "EventFingerprints"
+
+# Helper function to get the key an event is tracked under (matches the transformed RowKey)
+def event_key(event):
+    return str(event.get("id", "unknown"))
+
+# Helper function to fingerprint a single raw event
+def compute_event_fingerprint(event):
+    payload = json.dumps(event, sort_keys=True)
+    return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+# Helper function to fingerprint every event in the feed, keyed by event id
+def compute_event_fingerprints(events):
+    return {event_key(event): compute_event_fingerprint(event) for event in events}
+
+# Helper function to get the last stored fingerprint map (None if never stored)
+def get_last_fingerprints(connection_string, table_name):
+    try:
+        table_client = get_table_client(connection_string, table_name)
+        entity = table_client.get_entity(partition_key=PARTITION_KEY, row_key=FINGERPRINT_ROW_KEY)
+        return json.loads(unpack_compressed_property(entity, "Fingerprints") or b"{}")
+    except Exception:
+        return None  # No fingerprints stored yet
+
+# Helper function to update the stored fingerprint map
+def update_fingerprints(connection_string, table_name, fingerprints):
+    table_client = get_table_client(connection_string, table_name)
+    entity = {
+        "PartitionKey": PARTITION_KEY,
+        "RowKey": FINGERPRINT_ROW_KEY,
+        "Count": len(fingerprints),
+        **pack_compressed_property("Fingerprints", json.dumps(fingerprints, separators=(",", ":")).encode())
+    }
+    table_client.upsert_entity(entity)
+
+# Helper function to compare two fingerprint maps
+def diff_fingerprints(previous, current):
+    return {
+        "added": [key for key in current if key not in previous],
+        "changed": [key for key in current if key in previous and previous[key] != current[key]],
+        "removed": [key for key in previous if key not in current]
+    }
+
+# Helper function to get the added/changed/removed event ids since the last run.
+# The new fingerprints are returned, not stored, so callers can persist them
+# only once the delta has been processed.
+def get_event_delta(events, connection_string, table_name):
+    ensure_table_exists(connection_string, table_name)
+    current = compute_event_fingerprints(events)
+    previous = get_last_fingerprints(connection_string, table_name)
+
+    delta = diff_fingerprints(previous or {}, current)
+    delta["initial"] = previous is None
+    delta["fingerprints"] = current
+
+    print(
+        f"[Fingerprint Check: Any new events?] Added: {len(delta['added'])}, "
+        f"Changed: {len(delta['changed'])}, Removed: {len(delta['removed'])}"
+    )
+    return delta
+
+# Helper function to check whether a delta contains any work
+def has_event_changes(delta):
+    return bool(delta["added"] or delta["changed"] or delta["removed"])
+
+# Helper function to fingerprint a stream of raw events and yield only added/changed ones.
+# Every fingerprint is recorded into `fingerprints` so removals can be diffed afterwards.
+def iter_changed_events(events, previous, fingerprints):
+    for event in events:
+        key = event_key(event)
+        fingerprint = compute_event_fingerprint(event)
+        fingerprints[key] = fingerprint
+        if previous.get(key) != fingerprint:
+            yield event
+
+# HTTP validators of the last fully processed feed, stored next to the hash rows
+VALIDATORS_ROW_KEY = "HttpValidators"
+
+# Helper function to get the stored ETag/Last-Modified validators (empty if none)
+def get_http_validators(connection_string, table_name):
+    try:
+        table_client = get_table_client(connection_string, table_name)
+        entity = table_client.get_entity(partition_key=PARTITION_KEY, row_key=VALIDATORS_ROW_KEY)
+        return {key: entity[key] for key in ("ETag", "LastModified") if entity.get(key)}
+    except Exception:
+        return {}  # No validators stored yet
+
+# Helper function to store the validators of a response once it has been fully processed
+def update_http_validators(connection_string, table_name, response_headers):
+    validators = {
+        "ETag": response_headers.get("ETag"),
+        "LastModified": response_headers.get("Last-Modified")
+    }
+    validators = {key: value for key, value in validators.items() if isinstance(value, str)}
+    if not validators:
+        return
+
+    try:
+        table_client = get_table_client(connection_string, table_name)
+        table_client.upsert_entity({"PartitionKey": PARTITION_KEY, "RowKey": VALIDATORS_ROW_KEY, **validators})
+    except Exception as e:
+        # Validators only save bandwidth; the next run simply does a full fetch
+        print(f"Failed to store HTTP validators: {e}")
+
+# Helper function to build If-None-Match/If-Modified-Since headers from stored validators
+def conditional_request_headers(validators):
+    headers = {}
+    if validators.get("ETag"):
+        headers["If-None-Match"] = validators["ETag"]
+    if validators.get("LastModified"):
+        headers["If-Modified-Since"] = validators["LastModified"]
+    return headers
@@ -0,0 +1,188 @@
+from datetime import datetime, timedelta, timezone
+from traffic_ingester.helper_functions.table_client_registry_helper import get_table_client
+from traffic_ingester.helper_functions.store_events_batch_helper import submit_operations_in_batches
+from traffic_ingester.helper_functions.cleanup_inactive_events_helper import EVENTS_PARTITION_KEY
+
+# History mode keeps every event in day partitions ("Day-20251021": events ACTIVE on that UTC
+# day, latest version per day) and an append-only status log in day partitions
+# ("Log-20251021": one row per added/changed/removed event, RowKey "<timestamp>-<RowKey>").
+# Partitions spread writes across partition servers, and a time-window query only scans
+# the partitions of the days in the window instead of the whole history.
+HISTORY_DAY_PREFIX = "Day-"
+STATUS_LOG_PREFIX = "Log-"
+
+# Metadata row remembering the last day whose partition received the full ACTIVE set
+HISTORY_MARKER_PARTITION_KEY = "TrafficHistory"
+HISTORY_MARKER_ROW_KEY = "LastDay"
+
+# Operations submitted at a time while copying the ACTIVE set, so memory stays bounded
+HISTORY_DAY_FLUSH_SIZE = 1000
+
+# Helper function to get the partition suffix of a UTC day
+def day_suffix(moment):
+    return moment.astimezone(timezone.utc).strftime("%Y%m%d")
+
+# Helper function to get the status log RowKey prefix of a moment (sortable, second precision)
+def log_timestamp(moment):
+    return moment.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+def get_history_day(connection_string, metadata_table):
+    try:
+        table_client = get_table_client(connection_string, metadata_table)
+        entity = table_client.get_entity(partition_key=HISTORY_MARKER_PARTITION_KEY, row_key=HISTORY_MARKER_ROW_KEY)
+        return entity.get("Day")
+    except Exception:
+        return None  # History not written yet
+
+def update_history_day(connection_string, metadata_table, day):
+    try:
+        table_client = get_table_client(connection_string, metadata_table)
+        table_client.upsert_entity({"PartitionKey": HISTORY_MARKER_PARTITION_KEY, "RowKey": HISTORY_MARKER_ROW_KEY, "Day": day})
+    except Exception as e:
+        # Without the marker the next run simply writes the full ACTIVE set again
+        print(f"Failed to store history day marker: {e}")
+
+# Helper function to build the status log rows for one run's delta
+def status_log_entities(delta, delta_events, observed_at):
+    partition_key = f"{STATUS_LOG_PREFIX}{day_suffix(observed_at)}"
+    timestamp = log_timestamp(observed_at)
+    added = set(delta["added"])
+
+    entries = [
+        {
+            "PartitionKey": partition_key,
+            "RowKey": f"{timestamp}-{event['RowKey']}",
+            "EventKey": event["RowKey"],
+            "Change": "added" if event["RowKey"] in added else "changed",
+            "Status": event.get("Status", "UNKNOWN"),
+            "ObservedAt": observed_at.isoformat()
+        }
+        for event in delta_events
+    ]
+    entries += [
+        {
+            "PartitionKey": partition_key,
+            "RowKey": f"{timestamp}-{row_key}",
+            "EventKey": row_key,
+            "Change": "removed",
+            "Status": "INACTIVE",
+            "ObservedAt": observed_at.isoformat()
+        }
+        for row_key in delta["removed"]
+    ]
+    return entries
+
+# Helper function to copy every stored ACTIVE event into today's day partition, once per UTC
+# day. Runs on every invocation, before the feed is fetched, so an event that stays ACTIVE
+# for days has a row in each of them even when the feed is unchanged (304) or no event
+# changed. The ACTIVE rows are read from the events table page by page and written in
+# bounded chunks; the day is only marked done when every row was written.
+def record_history_day(connection_string, events_table, table_name, metadata_table, now=None):
+    observed_at = now or datetime.now(timezone.utc).replace(microsecond=0)
+    today = day_suffix(observed_at)
+    if get_history_day(connection_string, metadata_table) == today:
+        return None
+
+    day_partition = f"{HISTORY_DAY_PREFIX}{today}"
+    results = {"succeeded": [], "failed": {}, "transactions": 0}
+    try:
+        stored = get_table_client(connection_string, events_table).query_entities(
+            f"PartitionKey eq '{EVENTS_PARTITION_KEY}' and Status eq 'ACTIVE'"
+        )
+        history_client = get_table_client(connection_string, table_name)
+        operations = []
+        for entity in stored:
+            operations.append(("upsert", {**entity, "PartitionKey": day_partition, "LastSeen": observed_at.isoformat()}))
+            if len(operations) == HISTORY_DAY_FLUSH_SIZE:
+                merge_results(results, submit_operations_in_batches(history_client, operations))
+                operations = []
+        merge_results(results, submit_operations_in_batches(history_client, operations))
+    except Exception as e:
+        # The day stays unmarked, so the next invocation copies it again
+        print(f"Failed to copy ACTIVE events into {table_name}/{day_partition}: {e}")
+        results["failed"]["*"] = str(e)
+        return results
+
+    print(f"Copied {len(results['succeeded'])} ACTIVE events into {table_name}/{day_partition} using {results['transactions']} transactions")
+    for row_key, error in results["failed"].items():
+        print(f"Failed to copy history entity {row_key}: {error}")
+    if not results["failed"]:
+        update_history_day(connection_string, metadata_table, today)
+    return results
+
+# Helper function to add one batch submission's outcomes to running totals
+def merge_results(results, batch_results):
+    results["succeeded"].extend(batch_results["succeeded"])
+    results["failed"].update(batch_results["failed"])
+    results["transactions"] += batch_results["transactions"]
+
+# Helper function to record one run's delta in the history table: the changed events go into
+# today's day partition and the delta is appended to the status log. Failed rows are
+# reported in the result's "failed", so the caller can record the delta again next run.
+def record_history(delta, delta_events, connection_string, table_name, now=None):
+    observed_at = now or datetime.now(timezone.utc).replace(microsecond=0)
+    day_partition = f"{HISTORY_DAY_PREFIX}{day_suffix(observed_at)}"
+
+    operations = [
+        ("upsert", {**event, "PartitionKey": day_partition, "LastSeen": observed_at.isoformat()})
+        for event in delta_events
+    ]
+    # Log rows are only ever inserted
+    log_entries = status_log_entities(delta, delta_events, observed_at)
+    operations += [("create", entry) for entry in log_entries]
+
+    try:
+        table_client = get_table_client(connection_string, table_name)
+        results = submit_operations_in_batches(table_client, operations)
+    except Exception as e:
+        results = {"succeeded": [], "failed": {entity["RowKey"]: str(e) for _, entity in operations}, "transactions": 0}
+
+    print(
+        f"Recorded {len(delta_events)} events in {table_name}/{day_partition} and "
+        f"{len(log_entries)} status changes using {results['transactions']} transactions"
+    )
+    for row_key, error in results["failed"].items():
+        print(f"Failed to record history entity {row_key}: {error}")
+    return results
+
+# Helper function to escape a value for a quoted OData string literal
+def quote(value):
+    return str(value).replace("'", "''")
+
+# Helper function to build an OData filter covering the partitions of a time window
+def partition_range_filter(prefix, start, end):
+    return f"PartitionKey ge '{prefix}{day_suffix(start)}' and PartitionKey le '{prefix}{day_suffix(end)}'"
+
+# Helper function to fetch the events active at some point in [start, end] (UTC datetimes).
+# Only the day partitions of the window are scanned; an event seen on several days is
+# returned once, in its latest version.
+def query_history(connection_string, table_name, start, end, status=None):
+    query_filter = partition_range_filter(HISTORY_DAY_PREFIX, start, end)
+    if status:
+        query_filter += f" and Status eq '{quote(status)}'"
+
+    table_client = get_table_client(connection_string, table_name)
+    start_text = start.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    end_text = end.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    events = {}
+    for entity in sorted(table_client.query_entities(query_filter), key=lambda entity: entity["PartitionKey"]):
+        # Feed timestamps are ISO 8601 UTC, so they compare as strings
+        if entity.get("StartTime") and entity["StartTime"] > end_text:
+            continue
+        if entity.get("EndTime") and entity["EndTime"] < start_text:
+            continue
+        events[entity["RowKey"]] = dict(entity)
+    return list(events.values())
+
+# Helper function to fetch the status log for [start, end], oldest first, optionally for one event
+def query_status_log(connection_string, table_name, start, end, event_key=None):
+    query_filter = (
+        f"{partition_range_filter(STATUS_LOG_PREFIX, start, end)} "
+        f"and RowKey ge '{log_timestamp(start)}' and RowKey lt '{log_timestamp(end + timedelta(seconds=1))}'"
+    )
+    if event_key:
+        query_filter += f" and EventKey eq '{quote(event_key)}'"
+
+    table_client = get_table_client(connection_string, table_name)
+    return sorted((dict(entity) for entity in table_client.query_entities(query_filter)), key=lambda entity: entity["RowKey"])
@@ -0,0 +1,22 @@
+import zlib
+
+# Azure Table properties are capped at 64 KiB, so larger blobs are split across
+# numbered binary properties (Name0, Name1, ...) with the part count in NameParts
+MAX_PROPERTY_BYTES = 64000
+
+# Helper function to compress bytes into one or more binary entity properties
+def pack_compressed_property(name, data):
+    packed = zlib.compress(data)
+    properties = {
+        f"{name}{part}": packed[start:start + MAX_PROPERTY_BYTES]
+        for part, start in enumerate(range(0, len(packed), MAX_PROPERTY_BYTES))
+    }
+    properties[f"{name}Parts"] = len(properties)
+    return properties
+
+# Helper function to reassemble and decompress bytes written by pack_compressed_property
+def unpack_compressed_property(entity, name):
+    parts = entity.get(f"{name}Parts")
+    if not parts:
+        return b""
+    return zlib.decompress(b"".join(entity[f"{name}{part}"] for part in range(parts)))
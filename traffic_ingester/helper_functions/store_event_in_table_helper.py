@@ -1,9 +1,10 @@
-from azure.data.tables import TableServiceClient
-from azure.core.exceptions import ResourceNotFoundError
+from traffic_ingester.helper_functions.table_client_registry_helper import get_table_client
+from traffic_ingester.lazy_import import lazy_import
+
+azure_exceptions = lazy_import("azure.core.exceptions")
 
 def store_event_in_table(event, connection_string, table_name):
-    table_service = TableServiceClient.from_connection_string(connection_string)
-    table_client = table_service.get_table_client(table_name)
+    table_client = get_table_client(connection_string, table_name)
 
     partition_key = event["PartitionKey"]
     row_key = event["RowKey"]
@@ -11,7 +12,7 @@ def store_event_in_table(event, connection_string, table_name):
     try:
         # Check if entity already exists
         existing = table_client.get_entity(partition_key=partition_key, row_key=row_key)
-    except ResourceNotFoundError:
+    except azure_exceptions.ResourceNotFoundError:
         # Entity does not exist — safe to insert
         try:
             table_client.upsert_entity(event)
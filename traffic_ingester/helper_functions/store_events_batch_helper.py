@@ -0,0 +1,115 @@
+from traffic_ingester.lazy_import import lazy_import
+from traffic_ingester.helper_functions.table_client_registry_helper import get_table_client
+
+tables = lazy_import("azure.data.tables")
+azure_exceptions = lazy_import("azure.core.exceptions")
+
+# Azure Table Storage accepts at most 100 operations per transaction, and every
+# operation in a transaction must target the same PartitionKey
+MAX_BATCH_SIZE = 100
+
+# Helper function to group table operations by PartitionKey into transaction-sized chunks
+def chunk_operations_by_partition(operations, batch_size=MAX_BATCH_SIZE):
+    partitions = {}
+    for operation in operations:
+        partitions.setdefault(operation[1]["PartitionKey"], []).append(operation)
+
+    for partition_operations in partitions.values():
+        for start in range(0, len(partition_operations), batch_size):
+            yield partition_operations[start:start + batch_size]
+
+# Helper function to apply a single transaction operation outside of a transaction
+def apply_operation(table_client, operation):
+    action, entity = operation[0], operation[1]
+    kwargs = operation[2] if len(operation) > 2 else {}
+
+    if action == "upsert":
+        table_client.upsert_entity(entity, **kwargs)
+    elif action == "update":
+        table_client.update_entity(entity, **kwargs)
+    elif action == "create":
+        table_client.create_entity(entity, **kwargs)
+    elif action == "delete":
+        table_client.delete_entity(partition_key=entity["PartitionKey"], row_key=entity["RowKey"], **kwargs)
+    else:
+        raise ValueError(f"Unsupported table operation: {action}")
+
+# Helper function to submit operations as batched transactions and report per-entity outcomes.
+# With missing_ok, operations on rows that no longer exist (e.g. an update of a deleted row)
+# are reported under "missing" instead of "failed".
+def submit_operations_in_batches(table_client, operations, batch_size=MAX_BATCH_SIZE, missing_ok=False):
+    results = {"succeeded": [], "failed": {}, "missing": [], "transactions": 0}
+
+    for chunk in chunk_operations_by_partition(operations, batch_size):
+        results["transactions"] += 1
+        try:
+            table_client.submit_transaction(chunk)
+            results["succeeded"].extend(operation[1]["RowKey"] for operation in chunk)
+        except tables.TableTransactionError as e:
+            # Transactions are all-or-nothing, so replay the chunk one entity at a time
+            # to keep one bad entity from dropping the rest of the batch
+            print(f"Transaction failed at operation {e.index}, retrying {len(chunk)} entities individually")
+            for operation in chunk:
+                row_key = operation[1]["RowKey"]
+                try:
+                    apply_operation(table_client, operation)
+                    results["succeeded"].append(row_key)
+                except azure_exceptions.ResourceNotFoundError as entity_error:
+                    if missing_ok:
+                        results["missing"].append(row_key)
+                    else:
+                        results["failed"][row_key] = str(entity_error)
+                except Exception as entity_error:
+                    results["failed"][row_key] = str(entity_error)
+        except Exception as e:
+            # Anything else (network, auth) would fail the same way per entity
+            for operation in chunk:
+                results["failed"][operation[1]["RowKey"]] = str(e)
+
+    return results
+
+# Helper function to upsert many events with one transaction per 100 entities of a partition
+def store_events_in_table_batch(events, connection_string, table_name):
+    table_client = get_table_client(connection_string, table_name)
+
+    operations = [("upsert", event) for event in events]
+    results = submit_operations_in_batches(table_client, operations)
+
+    print(
+        f"Stored {len(results['succeeded'])}/{len(operations)} events in {table_name} "
+        f"using {results['transactions']} transactions"
+    )
+    for row_key, error in results["failed"].items():
+        print(f"Failed to store entity {row_key}: {error}")
+
+    return results
+
+# Helper function to upsert a stream of events, flushing each partition every 100 entities
+def store_event_stream_in_table(events, connection_string, table_name, batch_size=MAX_BATCH_SIZE):
+    table_client = get_table_client(connection_string, table_name)
+    results = {"succeeded": [], "failed": {}, "transactions": 0}
+    pending = {}
+
+    def flush(operations):
+        chunk_results = submit_operations_in_batches(table_client, operations, batch_size)
+        results["succeeded"].extend(chunk_results["succeeded"])
+        results["failed"].update(chunk_results["failed"])
+        results["transactions"] += chunk_results["transactions"]
+
+    for event in events:
+        operations = pending.setdefault(event["PartitionKey"], [])
+        operations.append(("upsert", event))
+        if len(operations) >= batch_size:
+            flush(pending.pop(event["PartitionKey"]))
+
+    for operations in pending.values():
+        flush(operations)
+
+    print(
+        f"Stored {len(results['succeeded'])} streamed events in {table_name} "
+        f"using {results['transactions']} transactions"
+    )
+    for row_key, error in results["failed"].items():
+        print(f"Failed to store entity {row_key}: {error}")
+
+    return results
@@ -0,0 +1,108 @@
+import codecs
+import json
+
+# Consumed text is trimmed from the front of the buffer once it grows past this size
+COMPACT_THRESHOLD = 65536
+WHITESPACE = " \t\n\r"
+
+# Incremental reader over an iterable of byte chunks (e.g. response.iter_content())
+class _JsonStreamReader:
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read_more(self):
+        if self.eof:
+            return False
+        try:
+            chunk = next(self.chunks)
+            text = self.utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+        except StopIteration:
+            text = self.utf8.decode(b"", final=True)
+            self.eof = True
+
+        if self.pos > COMPACT_THRESHOLD:
+            self.buffer, self.pos = self.buffer[self.pos:], 0
+        self.buffer += text
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read_more():
+                return None
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos} of traffic feed")
+        self.pos += 1
+
+    def decode_value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A value touching the end of the buffer may be a truncated number; read on
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise ValueError(f"Malformed JSON at offset {self.pos} of traffic feed")
+            self._read_more()
+
+    def iter_array(self):
+        self.expect("[")
+        while True:
+            char = self.peek()
+            if char == "]":
+                self.pos += 1
+                return
+            if char == ",":
+                self.pos += 1
+                continue
+            if char is None:
+                raise ValueError("Unterminated array in traffic feed")
+            yield self.decode_value()
+
+# Helper function to yield raw events one at a time from a streamed traffic feed.
+# Accepts {"events": [...], ...} (key in any position) or a bare [...] array and
+# never holds more than one event plus a small read buffer in memory.
+def iter_feed_events(chunks):
+    reader = _JsonStreamReader(chunks)
+    char = reader.peek()
+
+    if char == "[":
+        yield from reader.iter_array()
+        return
+    if char != "{":
+        raise ValueError("Unexpected data format from traffic API")
+
+    reader.expect("{")
+    found_events = False
+    while True:
+        char = reader.peek()
+        if char == "}" or char is None:
+            break
+        if char == ",":
+            reader.pos += 1
+            continue
+
+        key = reader.decode_value()
+        reader.expect(":")
+        if key == "events" and reader.peek() == "[":
+            found_events = True
+            yield from reader.iter_array()
+        else:
+            reader.decode_value()  # Skip values we do not need
+
+    # Without an events array the feed is not a snapshot; never treat it as "everything removed"
+    if not found_events:
+        raise ValueError("Unexpected data format from traffic API")
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import weakref
+from traffic_ingester.lazy_import import lazy_import
+
+# Imported on first use, so the SDK stays out of the cold start
+requests = lazy_import("requests")
+HTTPAdapter = lazy_import("requests.adapters", "HTTPAdapter")
+RequestsTransport = lazy_import("azure.core.pipeline.transport", "RequestsTransport")
+TableServiceClient = lazy_import("azure.data.tables", "TableServiceClient")
+AsyncTableServiceClient = lazy_import("azure.data.tables.aio", "TableServiceClient")
+
+# Keep-alive pool sizing for the shared HTTP session used by every Table client
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+
+# Module-level registry so every helper reuses the same service/table clients and
+# TLS connections for the life of the Functions worker process
+_lock = threading.Lock()
+_session = None
+_transport = None
+_services = {}
+_table_clients = {}
+# Async clients per event loop: an aio client's connection pool belongs to the loop that
+# opened it, so each loop (in production, the Functions worker's one loop) gets its own
+_async_table_clients = weakref.WeakKeyDictionary()
+_client_stats = {"clients_created": 0, "clients_reused": 0}
+_baseline = {"clients_created": 0, "clients_reused": 0, "connections_opened": 0, "requests_sent": 0}
+
+# Helper function to lazily build the shared keep-alive session and transport
+def _get_transport():
+    global _session, _transport
+    if _transport is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+        # session_owner=False keeps the SDK from closing the shared session
+        _transport = RequestsTransport(session=_session, session_owner=False)
+    return _transport
+
+# Helper function to get a cached TableServiceClient for a connection string
+def get_table_service(connection_string):
+    with _lock:
+        service = _services.get(connection_string)
+        if service is not None:
+            _client_stats["clients_reused"] += 1
+            return service
+
+        service = TableServiceClient.from_connection_string(connection_string, transport=_get_transport())
+        _services[connection_string] = service
+        _client_stats["clients_created"] += 1
+        return service
+
+# Helper function to get a cached TableClient for a connection string and table
+def get_table_client(connection_string, table_name):
+    key = (connection_string, table_name)
+    with _lock:
+        table_client = _table_clients.get(key)
+        if table_client is not None:
+            _client_stats["clients_reused"] += 1
+            return table_client
+
+    table_client = get_table_service(connection_string).get_table_client(table_name)
+    with _lock:
+        # Another thread may have raced us here; keep whichever client landed first
+        if key not in _table_clients:
+            _table_clients[key] = table_client
+            _client_stats["clients_created"] += 1
+        return _table_clients[key]
+
+# Helper function to get a cached async TableClient for a connection string and table, for
+# the running event loop; it keeps its aiohttp connection pool between invocations
+def get_async_table_client(connection_string, table_name):
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _async_table_clients.setdefault(loop, {})
+        table_client = clients.get((connection_string, table_name))
+        if table_client is not None:
+            _client_stats["clients_reused"] += 1
+            return table_client
+
+        service = clients.get(connection_string)
+        if service is None:
+            service = clients[connection_string] = AsyncTableServiceClient.from_connection_string(connection_string)
+        table_client = clients[(connection_string, table_name)] = service.get_table_client(table_name)
+        _client_stats["clients_created"] += 1
+        return table_client
+
+# Helper function to read the urllib3 pool counters of the shared session
+def _connection_counters():
+    opened, sent = 0, 0
+    if _session is not None:
+        # http:// and https:// share one adapter, so count each adapter once
+        for adapter in {id(a): a for a in _session.adapters.values()}.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    opened += pool.num_connections
+                    sent += pool.num_requests
+    return {"connections_opened": opened, "requests_sent": sent}
+
+# Helper function to report client and connection reuse since the last reset
+def get_client_stats():
+    with _lock:
+        current = {**_client_stats, **_connection_counters()}
+        stats = {key: current[key] - _baseline[key] for key in current}
+    stats["connections_reused"] = max(stats["requests_sent"] - stats["connections_opened"], 0)
+    return stats
+
+# Helper function to start a new counting window, e.g. at the start of each invocation
+def reset_client_stats():
+    with _lock:
+        _baseline.update({**_client_stats, **_connection_counters()})
+
+# Helper function to drop every cached client (used by tests and on credential rotation)
+def clear_table_clients():
+    global _session, _transport
+    with _lock:
+        _services.clear()
+        _table_clients.clear()
+        _async_table_clients.clear()
+        if _session is not None:
+            _session.close()
+        _session, _transport = None, None
+        _client_stats.update({"clients_created": 0, "clients_reused": 0})
+        _baseline.update({key: 0 for key in _baseline})
@@ -0,0 +1,17 @@
+import time
+from contextlib import contextmanager
+
+# Helper function to record how long a pipeline stage takes, in milliseconds. A stage timed
+# more than once (e.g. per streamed batch) reports the total.
+@contextmanager
+def time_stage(timings, stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = round(timings.get(stage, 0) + (time.perf_counter() - start) * 1000, 1)
+
+# Helper function to print a one-line stage latency report
+def report_stage_timings(label, timings):
+    stages = ", ".join(f"{stage}={ms}ms" for stage, ms in timings.items())
+    print(f"[{label} stage latency] {stages}")
@@ -1,39 +1,44 @@
 from datetime import datetime, timezone
-        
-# Helper function to transform raw event data into Table Storage compatible entities
-def transform_events(events):
-    entities = []
 
-    for event in events:
-        try:
-            row_key = str(event.get("id", "unknown"))
-            event_type = event.get("eventType", "UNKNOWN")
-            location = event.get("headline", "Unknown location")
-            priority = event.get("priority", "UNKNOWN")
-            status = event.get("status", "UNKNOWN")
+# Helper function to transform one raw event into a Table Storage compatible entity
+def transform_event(event):
+    row_key = str(event.get("id", "unknown"))
+    event_type = event.get("eventType", "UNKNOWN")
+    location = event.get("headline", "Unknown location")
+    priority = event.get("priority", "UNKNOWN")
+    status = event.get("status", "UNKNOWN")
 
-            # Extract start/end times from schedule
-            schedule = event.get("schedule", [])
-            start_time = (schedule[0].get("startDateTime")) if schedule else None
-            end_time = (schedule[0].get("endDateTime")) if schedule else None
+    # Extract start/end times from schedule
+    schedule = event.get("schedule", [])
+    start_time = (schedule[0].get("startDateTime")) if schedule else None
+    end_time = (schedule[0].get("endDateTime")) if schedule else None
 
-            # Normalize geodata
-            geodata = event.get("geodata", {}).get("coordinates", None)
+    # Normalize geodata
+    geodata = event.get("geodata", {}).get("coordinates", None)
 
-            entity = {
-                "PartitionKey": "OttawaTraffic",
-                "RowKey": row_key,
-                "EventType": event_type,
-                "Location": location,
-                "StartTime": start_time,
-                "EndTime": end_time,
-                "Priority": priority,
-                "Status": status,
-                "GeoCoordinates": geodata
-            }
+    return {
+        "PartitionKey": "OttawaTraffic",
+        "RowKey": row_key,
+        "EventType": event_type,
+        "Location": location,
+        "StartTime": start_time,
+        "EndTime": end_time,
+        "Priority": priority,
+        "Status": status,
+        "GeoCoordinates": geodata
+    }
 
-            entities.append(entity)
+# Helper function to lazily transform a stream of raw events, skipping malformed ones
+def iter_transform_events(events):
+    for event in events:
+        try:
+            yield transform_event(event)
         except Exception as e:
             print(f"Failed to transform event {event.get('id', 'unknown')}: {e}")
 
-    return entities
+# Helper function to transform raw event data into Table Storage compatible entities
+def transform_events(events):
+    return list(iter_transform_events(events))
+
+# Entity columns after PartitionKey, in entity order (used for event snapshots)
+ENTITY_COLUMNS = ["RowKey", "EventType", "Location", "StartTime", "EndTime", "Priority", "Status", "GeoCoordinates"]
@@ -0,0 +1,56 @@
+import importlib
+import sys
+import threading
+import time
+
+# Heavy dependencies (requests, aiohttp, the Azure Tables SDK) are only needed once an
+# invocation runs, so modules bind them to stand-ins that import on first attribute access
+# or call. That keeps them out of the Functions host's cold start (the async path's aiohttp
+# is never imported by timer runs at all). One stand-in is shared per name, so patching
+# e.g. function_app.requests.post also reaches dashboard_push_helper, as with real modules.
+_lock = threading.Lock()
+_imports = {}
+_timings = {}
+
+# Stand-in for a module, or one attribute of it (e.g. a class), imported on first use.
+# Exception classes in except clauses must be real classes: use the module's stand-in
+# there (except tables.TableTransactionError), which resolves when the clause is evaluated.
+class LazyImport:
+    def __init__(self, module, attribute=None):
+        self._module = module
+        self._attribute = attribute
+        self._target = None
+
+    def _resolve(self):
+        if self._target is None:
+            started = time.perf_counter()
+            loaded = self._module in sys.modules
+            target = importlib.import_module(self._module)
+            if not loaded:
+                with _lock:
+                    _timings[self._module] = round((time.perf_counter() - started) * 1000, 1)
+            self._target = getattr(target, self._attribute) if self._attribute else target
+        return self._target
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        name = f"{self._module}.{self._attribute}" if self._attribute else self._module
+        return f"<lazy import {name}{'' if self._target is None else ' (loaded)'}>"
+
+# Helper to get the shared stand-in for a module (or for module.attribute)
+def lazy_import(module, attribute=None):
+    with _lock:
+        key = (module, attribute)
+        if key not in _imports:
+            _imports[key] = LazyImport(module, attribute)
+        return _imports[key]
+
+# Helper to report how long each lazily imported module took to import on first use, in ms
+def lazy_import_timings():
+    with _lock:
+        return dict(_timings)
@@ -0,0 +1,140 @@
+import json
+import os
+import tempfile
+import time
+from importlib.util import find_spec
+
+# Local on-disk snapshot of the latest event set, written after every update by the ingester
+# (ACTIVE entities) and the dashboard (ward-enriched frame) so restarts and extra worker
+# processes load it instead of re-parsing and re-joining events. With pyarrow installed the
+# file is an uncompressed Arrow IPC file, memory-mapped on read: the header comes from the
+# schema metadata without loading any column, and open_arrow's table uses the mapped
+# buffers in place. read_snapshot_frame/read_snapshot_columns convert that table into
+# pandas or Python objects, which copies the columns once. Without pyarrow the file is JSON
+# (a header line, then the columns), so reading a snapshot never runs code from the file.
+# Like wire_format.py this only needs the standard library (pyarrow and pandas are optional).
+SNAPSHOT_FORMAT = "traffic-snapshot"
+FORMAT_VERSION = 1
+HEADER_KEY = b"traffic_snapshot"
+ARROW_MAGIC = b"ARROW1"
+
+# Helper to check whether snapshots are written as Arrow IPC in this process
+def arrow_available():
+    return find_spec("pyarrow") is not None
+
+# Helper to tell whether a column's values need JSON text to be stored in one Arrow column
+# (e.g. GeoCoordinates holding [lon, lat] lists next to strings)
+def is_irregular(values):
+    types = {type(value) for value in values if value is not None}
+    return len(types) > 1 or not types <= {str, int, float, bool}
+
+def is_frame(data):
+    return hasattr(data, "columns") and hasattr(data, "dtypes")
+
+def row_count(data):
+    return len(data) if is_frame(data) else len(next(iter(data.values()), ()))
+
+def write_arrow(file, data, header):
+    import pyarrow as pa
+
+    if is_frame(data):
+        irregular = [name for name in data.columns if data[name].dtype == object and is_irregular(data[name])]
+        if irregular:
+            data = data.assign(**{name: [None if value is None else json.dumps(value) for value in data[name]] for name in irregular})
+        table = pa.Table.from_pandas(data, preserve_index=False)
+    else:
+        data = {name: list(values) for name, values in data.items()}
+        irregular = [name for name, values in data.items() if is_irregular(values)]
+        for name in irregular:
+            data[name] = [None if value is None else json.dumps(value) for value in data[name]]
+        table = pa.table(data)
+
+    header = {**header, "count": table.num_rows, "json_columns": irregular}
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), HEADER_KEY: json.dumps(header).encode("utf-8")})
+    with pa.ipc.new_file(file, table.schema) as writer:
+        writer.write_table(table)
+
+# JSON fallback: the header on the first line, so it can be read without the columns
+def write_json(file, data, header):
+    columns = data.to_dict("list") if is_frame(data) else {name: list(values) for name, values in data.items()}
+    file.write(json.dumps({**header, "count": row_count(data), "json_columns": []}).encode("utf-8") + b"\n")
+    file.write(json.dumps(columns).encode("utf-8"))
+
+# Helper to write a snapshot atomically (readers see the old or the new file). data is a
+# pandas DataFrame or a dict of equal-length column lists; version is the writer's data version.
+def write_snapshot(path, data, version=0, saved_at=None, use_arrow=None):
+    header = {"format": SNAPSHOT_FORMAT, "format_version": FORMAT_VERSION, "version": version, "saved_at": saved_at or time.time()}
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            if arrow_available() if use_arrow is None else use_arrow:
+                write_arrow(file, data, header)
+            else:
+                write_json(file, data, header)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+def check_header(header, path):
+    if header.get("format") != SNAPSHOT_FORMAT or header.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a version {FORMAT_VERSION} {SNAPSHOT_FORMAT} file")
+    return header
+
+def is_arrow_file(path):
+    with open(path, "rb") as file:
+        return file.read(len(ARROW_MAGIC)) == ARROW_MAGIC
+
+# Memory-map an Arrow snapshot; the returned table's buffers point into the mapped file
+def open_arrow(path):
+    import pyarrow as pa
+
+    table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    metadata = table.schema.metadata or {}
+    if HEADER_KEY not in metadata:
+        raise ValueError(f"{path} has no {SNAPSHOT_FORMAT} header")
+    return check_header(json.loads(metadata[HEADER_KEY]), path), table
+
+def load_json(path, columns=True):
+    with open(path, "rb") as file:
+        header = check_header(json.loads(file.readline()), path)
+        return header, json.loads(file.read()) if columns else None
+
+# Helper to read only a snapshot's header (version, saved_at, count, ...); for Arrow files
+# this maps the file without touching any column data
+def read_snapshot_header(path):
+    if is_arrow_file(path):
+        import pyarrow as pa
+        metadata = pa.ipc.open_file(pa.memory_map(path)).schema.metadata or {}
+        if HEADER_KEY not in metadata:
+            raise ValueError(f"{path} has no {SNAPSHOT_FORMAT} header")
+        return check_header(json.loads(metadata[HEADER_KEY]), path)
+    return load_json(path, columns=False)[0]
+
+def decode_json_column(values):
+    return [None if value is None else json.loads(value) for value in values]
+
+# Helper to read a snapshot as (header, pandas DataFrame); converts (copies) every column
+def read_snapshot_frame(path):
+    import pandas as pd
+
+    if is_arrow_file(path):
+        header, table = open_arrow(path)
+        frame = table.to_pandas()
+        if header["json_columns"]:
+            frame = frame.assign(**{name: decode_json_column(table.column(name).to_pylist()) for name in header["json_columns"]})
+        return header, frame
+    header, data = load_json(path)
+    return header, pd.DataFrame(data)
+
+# Helper to read a snapshot as (header, dict of column lists), without pandas; converts
+# (copies) every column into Python objects
+def read_snapshot_columns(path):
+    if is_arrow_file(path):
+        header, table = open_arrow(path)
+        columns = table.to_pydict()
+        columns.update((name, decode_json_column(columns[name])) for name in header["json_columns"])
+        return header, columns
+    return load_json(path)
@@ -1,5 +1,11 @@
 import pytest
 import os
+import json
+import time
+import hashlib
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from dotenv import load_dotenv, find_dotenv
 import sys
 from unittest.mock import MagicMock, patch
@@ -68,3 +74,67 @@ def sample_event():
         "priority": "HIGH",
         "status": "ACTIVE"
     }
+
+# Synthetic multi-megabyte feed (~6 MB, 20,000 events) for streaming ingestion tests
+@pytest.fixture(scope="session")
+def large_traffic_feed():
+    events = [
+        {
+            "id": f"{100000 + i}",
+            "priority": ["HIGH", "MEDIUM", "LOW"][i % 3],
+            "status": "ACTIVE" if i % 4 else "INACTIVE",
+            "eventType": ["Collision", "Construction", "Special Event"][i % 3],
+            "headline": f"Synthetic event {i} on Bank St & {i % 500} Ave",
+            "message": "Lane closure " * 8,
+            "schedule": [{"startDateTime": "2025-10-21T10:00:00Z", "endDateTime": "2025-10-21T12:00:00Z"}],
+            "geodata": {"coordinates": f"[{-75.9 + (i % 1000) / 2000}, {45.2 + (i % 700) / 2000}]"}
+        }
+        for i in range(20000)
+    ]
+    return json.dumps({"count": len(events), "events": events}).encode(), len(events)
+
+# Local stub of the Ottawa traffic API that honours ETag/Last-Modified validators
+class TrafficApiStub:
+    def __init__(self):
+        self.requests = []
+        self.set_events([])
+
+    def set_events(self, events):
+        self.body = json.dumps({"events": events}).encode()
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:16]}"'
+        self.last_modified = formatdate(time.time(), usegmt=True)
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append(dict(self.headers))
+                if self.headers.get("If-None-Match") == stub.etag:
+                    self.send_response(304)
+                    self.send_header("ETag", stub.etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(stub.body)))
+                self.send_header("ETag", stub.etag)
+                self.send_header("Last-Modified", stub.last_modified)
+                self.end_headers()
+                self.wfile.write(stub.body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+@pytest.fixture
+def traffic_api_stub():
+    stub = TrafficApiStub()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), stub.handler())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    stub.url = f"http://127.0.0.1:{server.server_port}/map/service/events"
+    yield stub
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,74 @@
+import pytest
+import asyncio
+import aiohttp
+from unittest.mock import patch, MagicMock, AsyncMock
+from azure.data.tables import TableTransactionError
+from traffic_ingester.helper_functions.async_ingest_helper import (
+    fetch_feed_async,
+    submit_operations_in_batches_async
+)
+
+def make_operation(row_key, partition_key="OttawaTraffic"):
+    return ("upsert", {"PartitionKey": partition_key, "RowKey": str(row_key), "Status": "ACTIVE"})
+
+class FakeAsyncTableClient:
+    def __init__(self, fail_transactions=False):
+        self.fail_transactions = fail_transactions
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.transactions = 0
+        self.upserts = []
+
+    async def submit_transaction(self, operations):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        self.transactions += 1
+        if self.fail_transactions:
+            raise TableTransactionError(message="0:Bad entity")
+
+    async def upsert_entity(self, entity, **kwargs):
+        self.upserts.append(entity["RowKey"])
+
+# Test that batch transactions run concurrently but never above the concurrency bound
+def test_submit_operations_in_batches_async_bounds_concurrency():
+    operations = [make_operation(i, partition_key=f"P{i % 10}") for i in range(1000)]
+    table_client = FakeAsyncTableClient()
+
+    results = asyncio.run(submit_operations_in_batches_async(table_client, operations, max_concurrency=3))
+
+    assert table_client.transactions == 10
+    assert table_client.max_in_flight == 3
+    assert len(results["succeeded"]) == 1000
+    assert results["failed"] == {}
+
+# Test that a failed async transaction is replayed per entity
+def test_submit_operations_in_batches_async_replays_failed_transaction():
+    operations = [make_operation(i) for i in range(3)]
+    table_client = FakeAsyncTableClient(fail_transactions=True)
+
+    results = asyncio.run(submit_operations_in_batches_async(table_client, operations))
+
+    assert table_client.upserts == ["0", "1", "2"]
+    assert sorted(results["succeeded"]) == ["0", "1", "2"]
+
+# Test that fetch retries with a non-blocking, jittered backoff
+def test_fetch_feed_async_retries_with_jittered_backoff():
+    class FailingResponse:
+        async def __aenter__(self):
+            raise aiohttp.ClientConnectionError("Connection refused")
+
+        async def __aexit__(self, *args):
+            return False
+
+    session = MagicMock()
+    session.get.return_value = FailingResponse()
+
+    with patch("traffic_ingester.helper_functions.async_ingest_helper.asyncio.sleep", new_callable=AsyncMock) as mock_sleep, \
+         patch("traffic_ingester.helper_functions.async_ingest_helper.random.uniform", return_value=0.75):
+        status, body, headers = asyncio.run(fetch_feed_async(session, "http://traffic", max_retries=3, backoff_seconds=5))
+
+    assert status is None and body is None
+    assert session.get.call_count == 3
+    assert [call.args[0] for call in mock_sleep.await_args_list] == [3.75, 7.5]
@@ -1,37 +1,88 @@
-import pytest
 from unittest.mock import patch, MagicMock
-from traffic_ingester.helper_functions.cleanup_inactive_events_helper import cleanup_inactive_events
-
-# Test to ensure that inactive events are marked correctly
-def test_cleanup_inactive_events_marks_entities_inactive():
-    # --- Incoming transformed entities ---
-    current_entities = [
-        {"RowKey": "123-Collision", "Status": "ACTIVE"},
-        {"RowKey": "456-Construction", "Status": "INACTIVE"},
-    ]
-    current_keys = {"123-Collision", "456-Construction"}
-
-    # --- Stored entities in Table Storage ---
-    stored_entities = [
-        {"PartitionKey": "OttawaTraffic", "RowKey": "123-Collision", "Status": "ACTIVE"},       # should be kept
-        {"PartitionKey": "OttawaTraffic", "RowKey": "789-Roadwork", "Status": "ACTIVE"},        # should be marked INACTIVE
-        {"PartitionKey": "OttawaTraffic", "RowKey": "456-Construction", "Status": "INACTIVE"},  # already inactive, no update
-    ]
-
-    with patch("traffic_ingester.helper_functions.cleanup_inactive_events_helper.TableServiceClient") as mock_tsc:
-        # Mock table client and its query/update methods
-        mock_table_client = MagicMock()
-        mock_table_client.query_entities.return_value = stored_entities
-        mock_tsc.from_connection_string.return_value.get_table_client.return_value = mock_table_client
-
-        # Act
-        cleanup_inactive_events(current_entities, "fake-conn-string", "TrafficEvents")
-
-        # Assert: update_entity should be called only for 789-Roadwork
-        assert mock_table_client.update_entity.call_count == 1
-
-        # Extract updated entity
-        updated_entity = mock_table_client.update_entity.call_args[0][0]
-        assert updated_entity["RowKey"] == "789-Roadwork"
-        assert updated_entity["Status"] == "INACTIVE"
-        assert "LastSeen" in updated_entity
+from azure.core.exceptions import ResourceNotFoundError
+from azure.data.tables import TableTransactionError
+from traffic_ingester.helper_functions.cleanup_inactive_events_helper import sync_active_index
+from traffic_ingester.helper_functions.packed_property_helper import pack_compressed_property, unpack_compressed_property
+
+def make_index_entity(keys):
+    return {"PartitionKey": "TrafficIndex", "RowKey": "ActiveKeys", **pack_compressed_property("Keys", "\n".join(sorted(keys)).encode())}
+
+# Test that cleanup only deactivates keys that left the feed, in one batch
+def test_sync_active_index_deactivates_only_removed_keys():
+    current_keys = {"123-Collision", "999-New"}
+
+    mock_events_client = MagicMock()
+    mock_metadata_client = MagicMock()
+    mock_metadata_client.get_entity.return_value = make_index_entity({"123-Collision", "789-Roadwork"})
+    clients = {"TrafficEvents": mock_events_client, "TrafficMetadata": mock_metadata_client}
+
+    with patch("traffic_ingester.helper_functions.cleanup_inactive_events_helper.get_table_client", side_effect=lambda conn, table: clients[table]):
+        deactivated = sync_active_index(current_keys, current_keys, "fake-conn-string", "TrafficEvents", "TrafficMetadata")
+
+    assert deactivated == {"789-Roadwork"}
+
+    # No partition scan and no per-entity MERGE; a single transaction instead
+    mock_events_client.query_entities.assert_not_called()
+    mock_events_client.update_entity.assert_not_called()
+    mock_events_client.submit_transaction.assert_called_once()
+    operations = mock_events_client.submit_transaction.call_args[0][0]
+    assert [operation[1]["RowKey"] for operation in operations] == ["789-Roadwork"]
+    assert operations[0][1]["Status"] == "INACTIVE"
+
+    # Index now tracks the still-active and newly-stored keys
+    index_entity = mock_metadata_client.upsert_entity.call_args[0][0]
+    assert set(unpack_compressed_property(index_entity, "Keys").decode().split("\n")) == {"123-Collision", "999-New"}
+
+# Test that cleanup does no storage writes when nothing changed
+def test_sync_active_index_no_changes():
+    current_keys = {"123-Collision"}
+
+    mock_events_client = MagicMock()
+    mock_metadata_client = MagicMock()
+    mock_metadata_client.get_entity.return_value = make_index_entity({"123-Collision"})
+    clients = {"TrafficEvents": mock_events_client, "TrafficMetadata": mock_metadata_client}
+
+    with patch("traffic_ingester.helper_functions.cleanup_inactive_events_helper.get_table_client", side_effect=lambda conn, table: clients[table]):
+        deactivated = sync_active_index(current_keys, current_keys, "fake-conn-string", "TrafficEvents", "TrafficMetadata")
+
+    assert deactivated == set()
+    mock_events_client.submit_transaction.assert_not_called()
+    mock_metadata_client.upsert_entity.assert_not_called()
+
+# Test that a missing index is rebuilt from a one-off scan of ACTIVE rows
+def test_sync_active_index_bootstraps_index():
+    current_keys = {"123-Collision"}
+
+    mock_events_client = MagicMock()
+    mock_events_client.query_entities.return_value = [{"RowKey": "123-Collision"}, {"RowKey": "789-Roadwork"}]
+    mock_metadata_client = MagicMock()
+    mock_metadata_client.get_entity.side_effect = Exception("Entity not found")
+    clients = {"TrafficEvents": mock_events_client, "TrafficMetadata": mock_metadata_client}
+
+    with patch("traffic_ingester.helper_functions.cleanup_inactive_events_helper.get_table_client", side_effect=lambda conn, table: clients[table]):
+        deactivated = sync_active_index(current_keys, current_keys, "fake-conn-string", "TrafficEvents", "TrafficMetadata")
+
+    assert deactivated == {"789-Roadwork"}
+    mock_events_client.query_entities.assert_called_once()
+    mock_metadata_client.upsert_entity.assert_called_once()
+
+# Test that a stale key whose row was deleted is dropped from the index, not recreated
+def test_sync_active_index_drops_deleted_rows():
+    current_keys = {"123-Collision"}
+
+    mock_events_client = MagicMock()
+    mock_events_client.submit_transaction.side_effect = TableTransactionError(message="0:Entity not found")
+    mock_events_client.update_entity.side_effect = ResourceNotFoundError("Entity not found")
+    mock_metadata_client = MagicMock()
+    mock_metadata_client.get_entity.return_value = make_index_entity({"123-Collision", "789-Deleted"})
+    clients = {"TrafficEvents": mock_events_client, "TrafficMetadata": mock_metadata_client}
+
+    with patch("traffic_ingester.helper_functions.cleanup_inactive_events_helper.get_table_client", side_effect=lambda conn, table: clients[table]):
+        deactivated = sync_active_index(current_keys, current_keys, "fake-conn-string", "TrafficEvents", "TrafficMetadata")
+
+    assert deactivated == set()
+    operation = mock_events_client.submit_transaction.call_args[0][0][0]
+    assert operation[0] == "update" and operation[2] == {"mode": "merge"}
+    mock_events_client.upsert_entity.assert_not_called()
+    index_entity = mock_metadata_client.upsert_entity.call_args[0][0]
+    assert unpack_compressed_property(index_entity, "Keys").decode() == "123-Collision"
@@ -0,0 +1,126 @@
+import pytest
+import asyncio
+import aiohttp
+from unittest.mock import patch, MagicMock
+import azure.functions as func
+from traffic_ingester import function_app
+from traffic_ingester.helper_functions.async_ingest_helper import fetch_feed_async
+from traffic_ingester.helper_functions.hash_tracker_helper import (
+    get_http_validators,
+    update_http_validators,
+    conditional_request_headers
+)
+
+class DictTableClient:
+    def __init__(self):
+        self.entities = {}
+
+    def get_entity(self, partition_key, row_key):
+        return dict(self.entities[(partition_key, row_key)])
+
+    def upsert_entity(self, entity):
+        self.entities[(entity["PartitionKey"], entity["RowKey"])] = dict(entity)
+
+def make_delta(keys):
+    return {"added": list(keys), "changed": [], "removed": [], "initial": True, "fingerprints": {key: "aaaa" for key in keys}}
+
+# Test that validators round-trip and become conditional request headers
+def test_http_validators_round_trip():
+    table_client = DictTableClient()
+
+    with patch("traffic_ingester.helper_functions.hash_tracker_helper.get_table_client", return_value=table_client):
+        assert get_http_validators("fake-conn-string", "TrafficMetadata") == {}
+
+        update_http_validators("fake-conn-string", "TrafficMetadata", {"ETag": '"abc"', "Last-Modified": "Tue, 21 Oct 2025 10:00:00 GMT"})
+        validators = get_http_validators("fake-conn-string", "TrafficMetadata")
+
+    assert conditional_request_headers(validators) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Tue, 21 Oct 2025 10:00:00 GMT"
+    }
+
+# Test that an unchanged feed short-circuits on 304 before any parsing, hashing or storage
+def test_fetch_traffic_events_short_circuits_on_not_modified(traffic_api_stub):
+    traffic_api_stub.set_events([{"id": "123", "eventType": "Collision", "status": "ACTIVE"}])
+    metadata_client = DictTableClient()
+
+    with patch("traffic_ingester.function_app.TRAFFIC_URL", traffic_api_stub.url), \
+         patch("traffic_ingester.helper_functions.hash_tracker_helper.get_table_client", return_value=metadata_client), \
+         patch("traffic_ingester.function_app.get_event_delta", side_effect=lambda events, *args: make_delta([e["id"] for e in events])) as mock_delta, \
+         patch("traffic_ingester.function_app.store_events_in_table_batch", return_value={"succeeded": ["123"], "failed": {}, "transactions": 1}) as mock_store, \
+         patch("traffic_ingester.function_app.sync_active_index"), \
+         patch("traffic_ingester.function_app.update_fingerprints"), \
+         patch("traffic_ingester.function_app.push_events_to_dashboard"):
+
+        # First run: full fetch, validators are stored once the feed is processed
+        function_app.fetch_traffic_events(MagicMock(spec=func.TimerRequest))
+        assert mock_delta.call_count == 1
+        assert "If-None-Match" not in traffic_api_stub.requests[0]
+
+        # Second run: conditional request, 304, nothing else runs
+        function_app.fetch_traffic_events(MagicMock(spec=func.TimerRequest))
+        assert traffic_api_stub.requests[1]["If-None-Match"] == traffic_api_stub.etag
+        assert mock_delta.call_count == 1
+        assert mock_store.call_count == 1
+
+        # Third run: the feed changed upstream, so it is fetched and processed again
+        traffic_api_stub.set_events([{"id": "456", "eventType": "Construction", "status": "ACTIVE"}])
+        function_app.fetch_traffic_events(MagicMock(spec=func.TimerRequest))
+        assert mock_delta.call_count == 2
+
+# Test that validators are not stored when some events failed, so they are retried
+def test_fetch_traffic_events_keeps_fetching_after_store_failure(traffic_api_stub):
+    traffic_api_stub.set_events([{"id": "123", "eventType": "Collision", "status": "ACTIVE"}])
+    metadata_client = DictTableClient()
+
+    with patch("traffic_ingester.function_app.TRAFFIC_URL", traffic_api_stub.url), \
+         patch("traffic_ingester.helper_functions.hash_tracker_helper.get_table_client", return_value=metadata_client), \
+         patch("traffic_ingester.function_app.get_event_delta", side_effect=lambda events, *args: make_delta([e["id"] for e in events])), \
+         patch("traffic_ingester.function_app.store_events_in_table_batch", return_value={"succeeded": [], "failed": {"123": "boom"}, "transactions": 1}), \
+         patch("traffic_ingester.function_app.sync_active_index"), \
+         patch("traffic_ingester.function_app.update_fingerprints"), \
+         patch("traffic_ingester.function_app.push_events_to_dashboard"):
+
+        function_app.fetch_traffic_events(MagicMock(spec=func.TimerRequest))
+
+    assert metadata_client.entities == {}
+
+# Test that a failed dashboard push keeps the previous fingerprints and validators, so the
+# next run fetches the whole feed and pushes the same changes again
+def test_fetch_traffic_events_resends_after_failed_push(traffic_api_stub):
+    traffic_api_stub.set_events([{"id": "123", "eventType": "Collision", "status": "ACTIVE"}])
+    metadata_client = DictTableClient()
+
+    with patch("traffic_ingester.function_app.TRAFFIC_URL", traffic_api_stub.url), \
+         patch("traffic_ingester.helper_functions.hash_tracker_helper.get_table_client", return_value=metadata_client), \
+         patch("traffic_ingester.function_app.get_event_delta", side_effect=lambda events, *args: make_delta([e["id"] for e in events])), \
+         patch("traffic_ingester.function_app.store_events_in_table_batch", return_value={"succeeded": ["123"], "failed": {}, "transactions": 1}), \
+         patch("traffic_ingester.function_app.sync_active_index"), \
+         patch("traffic_ingester.function_app.update_fingerprints") as mock_update_fingerprints, \
+         patch("traffic_ingester.function_app.push_events_to_dashboard", side_effect=[False, True]) as mock_push:
+
+        function_app.fetch_traffic_events(MagicMock(spec=func.TimerRequest))
+        assert metadata_client.entities == {}
+        mock_update_fingerprints.assert_not_called()
+
+        # The retry is a full fetch, not a 304, and pushes the event again
+        function_app.fetch_traffic_events(MagicMock(spec=func.TimerRequest))
+        assert "If-None-Match" not in traffic_api_stub.requests[1]
+        assert [call.args[0][0]["RowKey"] for call in mock_push.call_args_list] == ["123", "123"]
+        mock_update_fingerprints.assert_called_once()
+        assert metadata_client.entities != {}
+
+# Test that the async fetch also sends validators and reports 304
+def test_fetch_feed_async_returns_not_modified(traffic_api_stub):
+    traffic_api_stub.set_events([{"id": "123"}])
+
+    async def fetch_twice():
+        async with aiohttp.ClientSession() as session:
+            first = await fetch_feed_async(session, traffic_api_stub.url, 1, 0)
+            second = await fetch_feed_async(session, traffic_api_stub.url, 1, 0, headers={"If-None-Match": first[2]["ETag"]})
+            return first, second
+
+    first, second = asyncio.run(fetch_twice())
+
+    assert first[0] == 200 and b'"123"' in first[1]
+    assert second[0] == 304 and second[1] == b""
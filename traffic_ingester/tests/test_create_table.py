@@ -1,17 +1,32 @@
 # traffic_ingester/tests/test_ensure_table_exists.py
 import pytest
 from unittest.mock import patch, MagicMock
-from traffic_ingester.helper_functions.ensure_table_exists_helper import ensure_table_exists
+from traffic_ingester.helper_functions.ensure_table_exists_helper import ensure_table_exists, forget_ensured_tables
 
 # Test to ensure that ensure_table_exists calls create_table_if_not_exists
 def test_ensure_table_exists_calls_create_table():
-    with patch("traffic_ingester.helper_functions.ensure_table_exists_helper.TableServiceClient") as mock_tsc:
+    forget_ensured_tables()
+    with patch("traffic_ingester.helper_functions.ensure_table_exists_helper.get_table_service") as mock_get_table_service:
         # Arrange: mock service and its method
         mock_service = MagicMock()
-        mock_tsc.from_connection_string.return_value = mock_service
+        mock_get_table_service.return_value = mock_service
 
         # Act
         ensure_table_exists("fake-conn-string", "TrafficEvents")
 
         # Assert: create_table_if_not_exists was called
         mock_service.create_table_if_not_exists.assert_called_once_with("TrafficEvents")
+
+# Test that a table is only provisioned once per process, and retried after a failure
+def test_ensure_table_exists_caches_created_tables():
+    forget_ensured_tables()
+    with patch("traffic_ingester.helper_functions.ensure_table_exists_helper.get_table_service") as mock_get_table_service:
+        mock_service = mock_get_table_service.return_value
+        mock_service.create_table_if_not_exists.side_effect = [Exception("unreachable"), None, None]
+
+        ensure_table_exists("fake-conn-string", "TrafficEvents")
+        ensure_table_exists("fake-conn-string", "TrafficEvents")
+        ensure_table_exists("fake-conn-string", "TrafficEvents")
+        ensure_table_exists("fake-conn-string", "TrafficMetadata")
+
+    assert [call.args[0] for call in mock_service.create_table_if_not_exists.call_args_list] == ["TrafficEvents", "TrafficEvents", "TrafficMetadata"]
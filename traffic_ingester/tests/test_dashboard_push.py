@@ -0,0 +1,78 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from traffic_ingester.helper_functions.dashboard_push_helper import push_events_to_dashboard
+from traffic_ingester.wire_format import decode_payload
+
+DASHBOARD_URL = "http://localhost:8050/update-dashboard"
+
+# Test that a full snapshot is posted in the original payload format
+def test_push_events_to_dashboard_full_snapshot():
+    events = [{"RowKey": "123"}]
+
+    with patch("traffic_ingester.helper_functions.dashboard_push_helper.requests.post") as mock_post:
+        mock_post.return_value.status_code = 200
+
+        assert push_events_to_dashboard(events, DASHBOARD_URL) is True
+        mock_post.assert_called_once_with(DASHBOARD_URL, json={"events": events}, timeout=5)
+
+# Test that a 409 from the dashboard falls back to the full snapshot
+def test_push_events_to_dashboard_resends_full_snapshot_on_conflict():
+    delta_events = [{"RowKey": "456"}]
+    all_events = [{"RowKey": "123"}, {"RowKey": "456"}]
+    conflict, ok = MagicMock(status_code=409), MagicMock(status_code=200)
+
+    with patch("traffic_ingester.helper_functions.dashboard_push_helper.requests.post", side_effect=[conflict, ok]) as mock_post:
+        assert push_events_to_dashboard(delta_events, DASHBOARD_URL, removed=["789"], full_snapshot=lambda: all_events) is True
+
+        first, second = mock_post.call_args_list
+        assert first.kwargs["json"] == {"events": delta_events, "removed": ["789"], "mode": "delta"}
+        assert second.kwargs["json"] == {"events": all_events}
+
+# Test that a chunked fallback streams the full snapshot: the first chunk replaces, the rest are deltas
+def test_push_events_to_dashboard_sends_full_snapshot_in_chunks():
+    all_events = ({"RowKey": str(i)} for i in range(5))
+    conflict, ok = MagicMock(status_code=409), MagicMock(status_code=200)
+
+    with patch("traffic_ingester.helper_functions.dashboard_push_helper.requests.post", side_effect=[conflict, ok, ok, ok]) as mock_post:
+        assert push_events_to_dashboard([], DASHBOARD_URL, removed=["9"], full_snapshot=lambda: all_events, snapshot_chunk_size=2) is True
+
+    payloads = [call.kwargs["json"] for call in mock_post.call_args_list[1:]]
+    assert payloads == [
+        {"events": [{"RowKey": "0"}, {"RowKey": "1"}]},
+        {"events": [{"RowKey": "2"}, {"RowKey": "3"}], "removed": [], "mode": "delta"},
+        {"events": [{"RowKey": "4"}], "removed": [], "mode": "delta"}
+    ]
+
+# Test that a binary wire format is posted with its content type
+def test_push_events_to_dashboard_columnar():
+    events = [{"RowKey": "123", "Priority": "HIGH"}]
+
+    with patch("traffic_ingester.helper_functions.dashboard_push_helper.requests.post") as mock_post:
+        mock_post.return_value.status_code = 200
+
+        assert push_events_to_dashboard(events, DASHBOARD_URL, wire_format="columnar") is True
+        call = mock_post.call_args
+        assert call.kwargs["headers"] == {"Content-Type": "application/x-traffic-columnar"}
+        assert decode_payload(call.kwargs["data"], "columnar") == {"events": events}
+
+# Test that a dashboard rejecting the binary format (415) gets the JSON payload instead
+def test_push_events_to_dashboard_falls_back_to_json():
+    events = [{"RowKey": "123"}]
+    unsupported, ok = MagicMock(status_code=415), MagicMock(status_code=200)
+
+    with patch("traffic_ingester.helper_functions.dashboard_push_helper.requests.post", side_effect=[unsupported, ok]) as mock_post:
+        assert push_events_to_dashboard(events, DASHBOARD_URL, wire_format="columnar") is True
+
+        assert mock_post.call_args_list[1].kwargs["json"] == {"events": events}
+
+# Test that an unknown or unavailable wire format is sent as JSON instead of failing the push
+@pytest.mark.parametrize("wire_format", ["protobuf", "msgpack"])
+def test_push_events_to_dashboard_unavailable_format_sends_json(wire_format):
+    events = [{"RowKey": "123"}]
+
+    with patch("traffic_ingester.wire_format.available_formats", return_value=["json", "columnar"]), \
+         patch("traffic_ingester.helper_functions.dashboard_push_helper.requests.post") as mock_post:
+        mock_post.return_value.status_code = 200
+
+        assert push_events_to_dashboard(events, DASHBOARD_URL, wire_format=wire_format) is True
+        mock_post.assert_called_once_with(DASHBOARD_URL, json={"events": events}, timeout=5)
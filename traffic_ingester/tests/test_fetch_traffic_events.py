@@ -1,5 +1,7 @@
 import pytest
-from unittest.mock import patch, MagicMock
+import asyncio
+import json
+from unittest.mock import patch, MagicMock, AsyncMock
 import os
 from dotenv import load_dotenv
 import azure.functions as func
@@ -57,6 +59,15 @@ def test_fetch_traffic_events_successful_ingestion_flow():
         }
     ]
 
+    initial_delta = {
+        "added": ["123", "456"],
+        "changed": [],
+        "removed": [],
+        "initial": True,
+        "fingerprints": {"123": "aaaa", "456": "bbbb"}
+    }
+    store_results = {"succeeded": ["123"], "failed": {}, "transactions": 1}
+
     fake_response = MagicMock()
     fake_response.status_code = 200
     fake_response.json.return_value = {"events": raw_events}
@@ -65,9 +76,12 @@ def test_fetch_traffic_events_successful_ingestion_flow():
          patch("traffic_ingester.function_app.requests.post") as mock_post, \
          patch("traffic_ingester.function_app.sanitize_event", side_effect=lambda e: e) as mock_sanitize, \
          patch("traffic_ingester.function_app.transform_events", return_value=transformed_events) as mock_transform, \
-         patch("traffic_ingester.function_app.has_new_events", return_value=True) as mock_has_new, \
-         patch("traffic_ingester.function_app.store_event_in_table") as mock_store, \
-         patch("traffic_ingester.function_app.cleanup_inactive_events") as mock_cleanup:
+         patch("traffic_ingester.function_app.get_event_delta", return_value=initial_delta) as mock_delta, \
+         patch("traffic_ingester.function_app.store_events_in_table_batch", return_value=store_results) as mock_store, \
+         patch("traffic_ingester.function_app.sync_active_index") as mock_cleanup, \
+         patch("traffic_ingester.function_app.get_http_validators", return_value={}), \
+         patch("traffic_ingester.function_app.update_http_validators"), \
+         patch("traffic_ingester.function_app.update_fingerprints") as mock_update_fingerprints:
 
         # Act: call the scheduled function with a dummy TimerRequest
         dummy_timer = MagicMock(spec=func.TimerRequest)
@@ -79,21 +93,144 @@ def test_fetch_traffic_events_successful_ingestion_flow():
         # Assert: traffic API was called
         mock_get.assert_called_once()
 
-        # Assert: hash check was performed
-        mock_has_new.assert_called_once_with(raw_events, os.getenv("STORAGE_CONNECTION_STRING"), "TrafficMetadata")
+        # Assert: fingerprint delta check was performed
+        mock_delta.assert_called_once_with(raw_events, os.getenv("STORAGE_CONNECTION_STRING"), "TrafficMetadata")
 
         # Assert: sanitize and transform were called
         assert mock_sanitize.call_count == len(raw_events)
         mock_transform.assert_called_once()
 
-        # Assert: only ACTIVE event was stored
-        mock_store.assert_called_once_with(transformed_events[0], os.getenv("STORAGE_CONNECTION_STRING"), os.getenv("TABLE_NAME"))
+        # Assert: only ACTIVE event was stored, in a single batch call
+        mock_store.assert_called_once_with([transformed_events[0]], os.getenv("STORAGE_CONNECTION_STRING"), os.getenv("TABLE_NAME"))
+
+        # Assert: cleanup was called with every current key and the newly stored keys
+        mock_cleanup.assert_called_once_with({"123", "456"}, {"123"}, os.getenv("STORAGE_CONNECTION_STRING"), os.getenv("TABLE_NAME"), "TrafficMetadata")
 
-        # Assert: cleanup was called
-        mock_cleanup.assert_called_once_with(transformed_events, os.getenv("STORAGE_CONNECTION_STRING"), os.getenv("TABLE_NAME"))
+        # Assert: fingerprints are persisted after processing
+        mock_update_fingerprints.assert_called_once_with(os.getenv("STORAGE_CONNECTION_STRING"), "TrafficMetadata", initial_delta["fingerprints"])
 
         # Assert: broadcast POST was called with events
         mock_post.assert_called_once()
         args, kwargs = mock_post.call_args
         assert kwargs["json"] == {"events": transformed_events}
         assert kwargs["timeout"] == 5
+
+def test_fetch_traffic_events_processes_only_the_delta():
+    raw_events = [
+        {"id": "123", "eventType": "Collision", "status": "ACTIVE"},
+        {"id": "456", "eventType": "Construction", "status": "ACTIVE"}
+    ]
+    delta = {
+        "added": [],
+        "changed": ["456"],
+        "removed": ["789"],
+        "initial": False,
+        "fingerprints": {"123": "aaaa", "456": "cccc"}
+    }
+
+    fake_response = MagicMock()
+    fake_response.status_code = 200
+    fake_response.json.return_value = {"events": raw_events}
+
+    with patch("traffic_ingester.function_app.requests.get", return_value=fake_response), \
+         patch("traffic_ingester.function_app.requests.post") as mock_post, \
+         patch("traffic_ingester.function_app.get_event_delta", return_value=delta), \
+         patch("traffic_ingester.function_app.store_events_in_table_batch", return_value={"succeeded": ["456"], "failed": {}, "transactions": 1}) as mock_store, \
+         patch("traffic_ingester.function_app.sync_active_index") as mock_cleanup, \
+         patch("traffic_ingester.function_app.get_http_validators", return_value={}), \
+         patch("traffic_ingester.function_app.update_http_validators"), \
+         patch("traffic_ingester.function_app.update_fingerprints"):
+
+        function_app.fetch_traffic_events(MagicMock(spec=func.TimerRequest))
+
+        # Only the changed event is transformed and stored
+        stored_events = mock_store.call_args[0][0]
+        assert [event["RowKey"] for event in stored_events] == ["456"]
+
+        # Cleanup still sees every key currently in the feed
+        assert mock_cleanup.call_args[0][0] == {"123", "456"}
+
+        # The dashboard receives a delta payload
+        payload = mock_post.call_args.kwargs["json"]
+        assert payload["mode"] == "delta"
+        assert [event["RowKey"] for event in payload["events"]] == ["456"]
+        assert payload["removed"] == ["789"]
+
+def test_fetch_traffic_events_async_reports_stage_latency():
+    raw_events = [{"id": "123", "eventType": "Collision", "status": "ACTIVE"}]
+    delta = {"added": ["123"], "changed": [], "removed": [], "initial": True, "fingerprints": {"123": "aaaa"}}
+
+    with patch("traffic_ingester.function_app.fetch_feed_async", new_callable=AsyncMock, return_value=(200, json.dumps({"events": raw_events}).encode(), {})), \
+         patch("traffic_ingester.function_app.get_event_delta", return_value=delta), \
+         patch("traffic_ingester.function_app.store_events_in_table_batch_async", new_callable=AsyncMock, return_value={"succeeded": ["123"], "failed": {}, "transactions": 1}) as mock_store, \
+         patch("traffic_ingester.function_app.push_events_to_dashboard_async", new_callable=AsyncMock) as mock_push, \
+         patch("traffic_ingester.function_app.sync_active_index"), \
+         patch("traffic_ingester.function_app.get_http_validators", return_value={}), \
+         patch("traffic_ingester.function_app.update_http_validators"), \
+         patch("traffic_ingester.function_app.update_fingerprints"):
+
+        response = asyncio.run(function_app.fetch_traffic_events_async(MagicMock(spec=func.HttpRequest)))
+
+        body = json.loads(response.get_body())
+        assert response.status_code == 200
+        assert body["status"] == "ingested"
+        assert {"fetch", "parse", "delta", "transform", "store", "cleanup", "push", "total"} <= set(body["stages_ms"])
+
+        assert [event["RowKey"] for event in mock_store.await_args[0][0]] == ["123"]
+        mock_push.assert_awaited_once()
+
+def test_fetch_traffic_events_async_keeps_fingerprints_after_failed_push():
+    raw_events = [{"id": "123", "eventType": "Collision", "status": "ACTIVE"}]
+    delta = {"added": ["123"], "changed": [], "removed": [], "initial": True, "fingerprints": {"123": "aaaa"}}
+
+    with patch("traffic_ingester.function_app.fetch_feed_async", new_callable=AsyncMock, return_value=(200, json.dumps({"events": raw_events}).encode(), {})), \
+         patch("traffic_ingester.function_app.get_event_delta", return_value=delta), \
+         patch("traffic_ingester.function_app.store_events_in_table_batch_async", new_callable=AsyncMock, return_value={"succeeded": ["123"], "failed": {}, "transactions": 1}), \
+         patch("traffic_ingester.function_app.push_events_to_dashboard_async", new_callable=AsyncMock, return_value=False), \
+         patch("traffic_ingester.function_app.sync_active_index"), \
+         patch("traffic_ingester.function_app.get_http_validators", return_value={}), \
+         patch("traffic_ingester.function_app.update_http_validators") as mock_update_validators, \
+         patch("traffic_ingester.function_app.update_fingerprints") as mock_update_fingerprints:
+
+        response = asyncio.run(function_app.fetch_traffic_events_async(MagicMock(spec=func.HttpRequest)))
+
+        assert response.status_code == 500
+        assert json.loads(response.get_body())["status"] == "push_failed"
+        mock_update_fingerprints.assert_not_called()
+        mock_update_validators.assert_not_called()
+
+def test_fetch_traffic_events_streaming_mode():
+    body = json.dumps({"events": [
+        {"id": "123", "eventType": "Collision", "status": "ACTIVE"},
+        {"id": "456", "eventType": "Construction", "status": "INACTIVE"}
+    ]}).encode()
+
+    fake_response = MagicMock()
+    fake_response.iter_content.return_value = [body[:10], body[10:]]
+    stored = []
+
+    def consume(events, *args):
+        stored.extend(events)
+        return {"succeeded": [event["RowKey"] for event in stored], "failed": {}, "transactions": 1}
+
+    with patch("traffic_ingester.function_app.STREAM_EVENTS", True), \
+         patch("traffic_ingester.function_app.requests.get", return_value=fake_response) as mock_get, \
+         patch("traffic_ingester.function_app.requests.post") as mock_post, \
+         patch("traffic_ingester.function_app.ensure_table_exists"), \
+         patch("traffic_ingester.function_app.get_last_fingerprints", return_value=None), \
+         patch("traffic_ingester.function_app.store_event_stream_in_table", side_effect=consume), \
+         patch("traffic_ingester.function_app.sync_active_index") as mock_cleanup, \
+         patch("traffic_ingester.function_app.get_http_validators", return_value={}), \
+         patch("traffic_ingester.function_app.update_http_validators"), \
+         patch("traffic_ingester.function_app.update_fingerprints") as mock_update_fingerprints:
+
+        function_app.fetch_traffic_events(MagicMock(spec=func.TimerRequest))
+
+        assert mock_get.call_args.kwargs["stream"] is True
+        fake_response.json.assert_not_called()
+
+        # Only the ACTIVE event reaches storage; both reach the dashboard
+        assert [event["RowKey"] for event in stored] == ["123"]
+        assert [event["RowKey"] for event in mock_post.call_args.kwargs["json"]["events"]] == ["123", "456"]
+        assert mock_cleanup.call_args[0][0] == {"123", "456"}
+        assert set(mock_update_fingerprints.call_args[0][2]) == {"123", "456"}
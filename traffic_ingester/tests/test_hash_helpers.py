@@ -6,7 +6,12 @@ from unittest.mock import patch, MagicMock
 from traffic_ingester.helper_functions.hash_tracker_helper import (
     get_last_hash,
     update_hash,
-    has_new_events
+    has_new_events,
+    compute_event_fingerprints,
+    get_last_fingerprints,
+    update_fingerprints,
+    get_event_delta,
+    has_event_changes
 )
 
 PARTITION_KEY = "TrafficHash"
@@ -20,8 +25,8 @@ def test_get_last_hash_returns_value():
     mock_table_client = MagicMock()
     mock_table_client.get_entity.return_value = mock_entity
 
-    with patch("traffic_ingester.helper_functions.hash_tracker_helper.TableServiceClient") as mock_tsc:
-        mock_tsc.from_connection_string.return_value.get_table_client.return_value = mock_table_client
+    with patch("traffic_ingester.helper_functions.hash_tracker_helper.get_table_client") as mock_get_table_client:
+        mock_get_table_client.return_value = mock_table_client
         result = get_last_hash(CONNECTION_STRING, TABLE_NAME)
         assert result == "abc123"
         mock_table_client.get_entity.assert_called_once_with(partition_key=PARTITION_KEY, row_key=ROW_KEY)
@@ -31,16 +36,16 @@ def test_get_last_hash_returns_none_on_exception():
     mock_table_client = MagicMock()
     mock_table_client.get_entity.side_effect = Exception("Entity not found")
 
-    with patch("traffic_ingester.helper_functions.hash_tracker_helper.TableServiceClient") as mock_tsc:
-        mock_tsc.from_connection_string.return_value.get_table_client.return_value = mock_table_client
+    with patch("traffic_ingester.helper_functions.hash_tracker_helper.get_table_client") as mock_get_table_client:
+        mock_get_table_client.return_value = mock_table_client
         result = get_last_hash(CONNECTION_STRING, TABLE_NAME)
         assert result is None
 
 # Test update_hash calls upsert_entity with correct parameters
 def test_update_hash_calls_upsert_entity():
-    with patch("traffic_ingester.helper_functions.hash_tracker_helper.TableServiceClient") as mock_tsc:
+    with patch("traffic_ingester.helper_functions.hash_tracker_helper.get_table_client") as mock_get_table_client:
         mock_table_client = MagicMock()
-        mock_tsc.from_connection_string.return_value.get_table_client.return_value = mock_table_client
+        mock_get_table_client.return_value = mock_table_client
 
         update_hash(CONNECTION_STRING, TABLE_NAME, "newhash123")
 
@@ -76,3 +81,48 @@ def test_has_new_events_detects_no_change():
         result = has_new_events(events, CONNECTION_STRING, TABLE_NAME)
         assert result is False
         mock_update.assert_not_called()
+
+# Test that per-event fingerprints yield explicit added/changed/removed sets
+def test_get_event_delta_reports_added_changed_removed():
+    previous_events = [{"id": "1", "status": "ACTIVE"}, {"id": "2", "status": "ACTIVE"}]
+    current_events = [{"id": "1", "status": "ACTIVE"}, {"id": "2", "status": "INACTIVE"}, {"id": "3", "status": "ACTIVE"}]
+    previous = compute_event_fingerprints(previous_events)
+    previous["4"] = "ffffffffffffffff"
+
+    with patch("traffic_ingester.helper_functions.hash_tracker_helper.ensure_table_exists"), \
+         patch("traffic_ingester.helper_functions.hash_tracker_helper.get_last_fingerprints", return_value=previous):
+
+        delta = get_event_delta(current_events, CONNECTION_STRING, TABLE_NAME)
+
+    assert delta["added"] == ["3"]
+    assert delta["changed"] == ["2"]
+    assert delta["removed"] == ["4"]
+    assert delta["initial"] is False
+    assert has_event_changes(delta)
+
+# Test that the first run treats every event as added
+def test_get_event_delta_initial_run():
+    events = [{"id": "1", "status": "ACTIVE"}]
+
+    with patch("traffic_ingester.helper_functions.hash_tracker_helper.ensure_table_exists"), \
+         patch("traffic_ingester.helper_functions.hash_tracker_helper.get_last_fingerprints", return_value=None):
+
+        delta = get_event_delta(events, CONNECTION_STRING, TABLE_NAME)
+
+    assert delta["added"] == ["1"]
+    assert delta["initial"] is True
+
+# Test that fingerprints round-trip through the stored entity
+def test_update_and_get_fingerprints_round_trip():
+    fingerprints = compute_event_fingerprints([{"id": str(i), "status": "ACTIVE"} for i in range(50)])
+
+    with patch("traffic_ingester.helper_functions.hash_tracker_helper.get_table_client") as mock_get_table_client:
+        mock_table_client = MagicMock()
+        mock_get_table_client.return_value = mock_table_client
+
+        update_fingerprints(CONNECTION_STRING, TABLE_NAME, fingerprints)
+        stored_entity = mock_table_client.upsert_entity.call_args[0][0]
+        assert stored_entity["RowKey"] == "EventFingerprints"
+
+        mock_table_client.get_entity.return_value = stored_entity
+        assert get_last_fingerprints(CONNECTION_STRING, TABLE_NAME) == fingerprints
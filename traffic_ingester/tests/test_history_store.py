@@ -0,0 +1,174 @@
+import json
+from datetime import datetime, timezone
+from unittest.mock import patch, MagicMock
+import azure.functions as func
+from traffic_ingester import function_app
+from traffic_ingester.helper_functions.history_store_helper import record_history, record_history_day, query_history, query_status_log
+
+NOW = datetime(2025, 10, 21, 14, 30, 5, tzinfo=timezone.utc)
+
+def make_event(row_key, status="ACTIVE", start="2025-10-21T10:00:00Z", end="2025-10-21T18:00:00Z"):
+    return {"PartitionKey": "OttawaTraffic", "RowKey": str(row_key), "Status": status, "StartTime": start, "EndTime": end}
+
+def submitted_entities(mock_table_client):
+    return [operation for call in mock_table_client.submit_transaction.call_args_list for operation in call.args[0]]
+
+# Test that the first invocation of a day copies every stored ACTIVE event into the day partition
+def test_record_history_day_copies_active_set_once_per_day():
+    stored = [make_event(1), make_event(2)]
+
+    with patch("traffic_ingester.helper_functions.history_store_helper.get_table_client") as mock_get_table_client:
+        mock_table_client = MagicMock()
+        mock_table_client.get_entity.return_value = {"Day": "20251020"}
+        mock_table_client.query_entities.return_value = iter(stored)
+        mock_get_table_client.return_value = mock_table_client
+
+        results = record_history_day("fake-conn-string", "TrafficEvents", "TrafficHistory", "TrafficMetadata", now=NOW)
+
+        # Later invocations that day skip the copy
+        mock_table_client.get_entity.return_value = {"Day": "20251021"}
+        assert record_history_day("fake-conn-string", "TrafficEvents", "TrafficHistory", "TrafficMetadata", now=NOW) is None
+
+    assert mock_table_client.query_entities.call_args.args[0] == "PartitionKey eq 'OttawaTraffic' and Status eq 'ACTIVE'"
+    day_rows = [entity for action, entity in submitted_entities(mock_table_client)]
+    assert {entity["PartitionKey"] for entity in day_rows} == {"Day-20251021"}
+    assert sorted(entity["RowKey"] for entity in day_rows) == ["1", "2"]
+    assert results["transactions"] == 1
+    mock_table_client.upsert_entity.assert_called_once_with({"PartitionKey": "TrafficHistory", "RowKey": "LastDay", "Day": "20251021"})
+
+# Test that a day whose copy failed is not marked, so the next invocation copies it again
+def test_record_history_day_retries_after_failure():
+    with patch("traffic_ingester.helper_functions.history_store_helper.get_table_client") as mock_get_table_client:
+        mock_table_client = MagicMock()
+        mock_table_client.get_entity.return_value = {"Day": "20251020"}
+        mock_table_client.query_entities.return_value = iter([make_event(1)])
+        mock_table_client.submit_transaction.side_effect = Exception("throttled")
+        mock_table_client.upsert_entity.side_effect = Exception("throttled")
+        mock_get_table_client.return_value = mock_table_client
+
+        results = record_history_day("fake-conn-string", "TrafficEvents", "TrafficHistory", "TrafficMetadata", now=NOW)
+
+    assert list(results["failed"]) == ["1"]
+    assert all(call.args[0]["PartitionKey"] != "TrafficHistory" for call in mock_table_client.upsert_entity.call_args_list)
+
+# Test that a run writes only the changed events and logs the delta
+def test_record_history_writes_delta_and_status_log():
+    delta = {"added": ["2"], "changed": ["1"], "removed": ["9"]}
+
+    with patch("traffic_ingester.helper_functions.history_store_helper.get_table_client") as mock_get_table_client:
+        mock_table_client = MagicMock()
+        mock_get_table_client.return_value = mock_table_client
+
+        results = record_history(delta, [make_event(1, status="INACTIVE"), make_event(2)], "fake-conn-string", "TrafficHistory", now=NOW)
+
+    mock_table_client.get_entity.assert_not_called()
+    operations = submitted_entities(mock_table_client)
+    day_rows = [entity for action, entity in operations if action == "upsert"]
+    log_rows = [entity for action, entity in operations if action == "create"]
+    assert [(entity["PartitionKey"], entity["RowKey"]) for entity in day_rows] == [("Day-20251021", "1"), ("Day-20251021", "2")]
+    assert [(entity["RowKey"], entity["Change"]) for entity in log_rows] == [
+        ("20251021T143005Z-1", "changed"), ("20251021T143005Z-2", "added"), ("20251021T143005Z-9", "removed")
+    ]
+    assert {entity["PartitionKey"] for entity in log_rows} == {"Log-20251021"}
+    assert results["transactions"] == 2 and not results["failed"]
+
+# Test that a failed history write keeps the previous fingerprints, so the delta is recorded again
+def test_finish_ingest_keeps_fingerprints_after_history_failure():
+    delta = {"added": ["1"], "changed": [], "removed": [], "initial": False, "fingerprints": {"1": "aaaa"}}
+
+    with patch("traffic_ingester.function_app.HISTORY_MODE", True), \
+         patch("traffic_ingester.function_app.sync_active_index"), \
+         patch("traffic_ingester.function_app.push_events_to_dashboard", return_value=True), \
+         patch("traffic_ingester.function_app.record_history", return_value={"succeeded": [], "failed": {"1": "boom"}, "transactions": 1}), \
+         patch("traffic_ingester.function_app.update_fingerprints") as mock_update_fingerprints:
+        completed = function_app.finish_ingest(delta, [make_event(1)], {"succeeded": ["1"], "failed": {}}, MagicMock(), {})
+
+    assert completed is False
+    mock_update_fingerprints.assert_not_called()
+
+# Test that the day's ACTIVE set is copied even when the feed is unchanged (304)
+def test_fetch_traffic_events_copies_history_day_on_not_modified():
+    fake_response = MagicMock()
+    fake_response.status_code = 304
+
+    with patch("traffic_ingester.function_app.HISTORY_MODE", True), \
+         patch("traffic_ingester.function_app.ensure_table_exists"), \
+         patch("traffic_ingester.function_app.requests.get", return_value=fake_response), \
+         patch("traffic_ingester.function_app.get_http_validators", return_value={"ETag": '"abc"'}), \
+         patch("traffic_ingester.function_app.get_event_delta") as mock_delta, \
+         patch("traffic_ingester.function_app.record_history_day") as mock_history_day:
+        function_app.fetch_traffic_events(MagicMock(spec=func.TimerRequest))
+
+    mock_history_day.assert_called_once_with(function_app.STORAGE_CONNECTION_STRING, function_app.TABLE_NAME, "TrafficHistory", "TrafficMetadata")
+    mock_delta.assert_not_called()
+
+# Test that a window query only covers its day partitions, trims by schedule and keeps the latest version
+def test_query_history_scans_window_partitions():
+    stored = [
+        {**make_event(1, status="ACTIVE"), "PartitionKey": "Day-20251020"},
+        {**make_event(1, status="INACTIVE"), "PartitionKey": "Day-20251021"},
+        {**make_event(2, start="2025-10-22T09:00:00Z", end=None), "PartitionKey": "Day-20251021"}
+    ]
+
+    with patch("traffic_ingester.helper_functions.history_store_helper.get_table_client") as mock_get_table_client:
+        mock_table_client = MagicMock()
+        mock_table_client.query_entities.return_value = stored
+        mock_get_table_client.return_value = mock_table_client
+
+        events = query_history("fake-conn-string", "TrafficHistory", datetime(2025, 10, 20, tzinfo=timezone.utc), NOW)
+
+    mock_table_client.query_entities.assert_called_once_with("PartitionKey ge 'Day-20251020' and PartitionKey le 'Day-20251021'")
+    assert [(event["RowKey"], event["Status"]) for event in events] == [("1", "INACTIVE")]
+
+# Test that the status log query narrows by RowKey timestamp and escapes the event key
+def test_query_status_log_filters_by_time_and_event():
+    with patch("traffic_ingester.helper_functions.history_store_helper.get_table_client") as mock_get_table_client:
+        mock_table_client = MagicMock()
+        mock_table_client.query_entities.return_value = [{"RowKey": "20251021T143005Z-1"}, {"RowKey": "20251021T120000Z-1"}]
+        mock_get_table_client.return_value = mock_table_client
+
+        changes = query_status_log("fake-conn-string", "TrafficHistory", datetime(2025, 10, 21, tzinfo=timezone.utc), NOW, event_key="O'Neil")
+
+    assert mock_table_client.query_entities.call_args.args[0] == (
+        "PartitionKey ge 'Log-20251021' and PartitionKey le 'Log-20251021' "
+        "and RowKey ge '20251021T000000Z' and RowKey lt '20251021T143006Z' and EventKey eq 'O''Neil'"
+    )
+    assert [change["RowKey"] for change in changes] == ["20251021T120000Z-1", "20251021T143005Z-1"]
+
+# Test the QueryTrafficHistory endpoint end to end with the query helpers mocked
+def test_query_traffic_history_endpoint():
+    request = MagicMock(spec=func.HttpRequest)
+    request.params = {"start": "2025-10-20T00:00:00Z", "end": "2025-10-21T00:00:00Z", "status": "ACTIVE"}
+
+    with patch("traffic_ingester.function_app.HISTORY_MODE", True), \
+         patch("traffic_ingester.function_app.ensure_table_exists"), \
+         patch("traffic_ingester.function_app.query_history", return_value=[make_event(1)]) as mock_query, \
+         patch("traffic_ingester.function_app.query_status_log", return_value=[]):
+        response = function_app.query_traffic_history(request)
+
+        body = json.loads(response.get_body())
+        assert response.status_code == 200
+        assert body["events"] == [make_event(1)]
+        assert mock_query.call_args.kwargs["status"] == "ACTIVE"
+
+        # Invalid or reversed windows are rejected before querying
+        request.params = {"start": "yesterday"}
+        assert function_app.query_traffic_history(request).status_code == 400
+        request.params = {"start": "2025-10-21T00:00:00Z", "end": "2025-10-20T00:00:00Z"}
+        assert function_app.query_traffic_history(request).status_code == 400
+        assert mock_query.call_count == 1
+
+# Test that the endpoint answers 404 without touching storage when history is disabled
+def test_query_traffic_history_disabled():
+    request = MagicMock(spec=func.HttpRequest)
+    request.params = {}
+
+    with patch("traffic_ingester.function_app.HISTORY_MODE", False), \
+         patch("traffic_ingester.function_app.ensure_table_exists") as mock_ensure, \
+         patch("traffic_ingester.function_app.query_history") as mock_query:
+        response = function_app.query_traffic_history(request)
+
+    assert response.status_code == 404
+    assert "HISTORY_MODE" in json.loads(response.get_body())["error"]
+    mock_ensure.assert_not_called()
+    mock_query.assert_not_called()
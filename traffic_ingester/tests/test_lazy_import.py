@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+import azure.functions as func
+from traffic_ingester import function_app
+from traffic_ingester.lazy_import import lazy_import, lazy_import_timings
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Test that stand-ins are shared per name and only import their module on first use
+def test_lazy_import_defers_until_first_use():
+    sys.modules.pop("wave", None)
+    wave = lazy_import("wave")
+
+    assert lazy_import("wave") is wave
+    assert "wave" not in sys.modules
+    assert wave.WAVE_FORMAT_PCM == 1
+    assert "wave" in sys.modules and "wave" in lazy_import_timings()
+    assert lazy_import("wave", "Error")().__class__.__name__ == "Error"
+
+# Test that importing the function app loads none of the deferred dependencies
+def test_function_app_import_defers_heavy_dependencies():
+    deferred = ["requests", "aiohttp", "azure.data.tables", "azure.core", "dotenv"]
+    code = f"import sys, traffic_ingester.function_app; print([m for m in {deferred!r} if m in sys.modules])"
+
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=PROJECT_ROOT)
+
+    assert result.stdout.strip() == "[]"
+
+# Test that tables are provisioned on the first invocation and the cold start reported once
+def test_fetch_traffic_events_provisions_tables_and_reports_cold_start(capsys):
+    with patch.object(function_app, "cold_start_reported", False), \
+         patch("traffic_ingester.function_app.ensure_table_exists") as mock_ensure, \
+         patch("traffic_ingester.function_app.ingest_traffic_events"):
+        function_app.fetch_traffic_events(MagicMock(spec=func.TimerRequest))
+        function_app.fetch_traffic_events(MagicMock(spec=func.TimerRequest))
+
+    assert mock_ensure.call_args_list[0].args == (function_app.STORAGE_CONNECTION_STRING, function_app.TABLE_NAME)
+    output = capsys.readouterr().out
+    assert output.count("[Cold start stage latency] imports=") == 1
+    assert output.count("provision=") == 2
@@ -0,0 +1,97 @@
+import math
+import json
+import pickle
+import pytest
+from unittest.mock import MagicMock
+from traffic_ingester.snapshot_file import write_snapshot, read_snapshot_header, read_snapshot_frame, read_snapshot_columns, arrow_available
+from traffic_ingester.helper_functions.event_snapshot_helper import update_event_snapshot
+
+def make_entity(row_key, status="ACTIVE", coordinates="[-75.6972, 45.4215]"):
+    return {
+        "PartitionKey": "OttawaTraffic",
+        "RowKey": str(row_key),
+        "EventType": "Collision",
+        "Location": f"Event {row_key}",
+        "StartTime": "2025-10-21T10:00:00Z",
+        "EndTime": None,
+        "Priority": "HIGH",
+        "Status": status,
+        "GeoCoordinates": coordinates
+    }
+
+FORMATS = [pytest.param(True, marks=pytest.mark.skipif(not arrow_available(), reason="pyarrow not installed")), False]
+
+# Test that column dicts round-trip with their header, including [lon, lat] lists next to strings
+@pytest.mark.parametrize("use_arrow", FORMATS)
+def test_snapshot_round_trips_columns(tmp_path, use_arrow):
+    path = str(tmp_path / "events.snapshot")
+    columns = {
+        "RowKey": ["1", "2", "3"],
+        "GeoCoordinates": ["[-75.7, 45.4]", [-75.8, 45.5], None],
+        "Longitude": [-75.7, -75.8, math.nan]
+    }
+
+    write_snapshot(path, columns, version=7, saved_at=1000, use_arrow=use_arrow)
+
+    header = read_snapshot_header(path)
+    assert (header["version"], header["saved_at"], header["count"]) == (7, 1000, 3)
+    _, read = read_snapshot_columns(path)
+    assert read["GeoCoordinates"] == columns["GeoCoordinates"]
+    assert read["Longitude"][:2] == [-75.7, -75.8] and math.isnan(read["Longitude"][2])
+
+    _, frame = read_snapshot_frame(path)
+    assert list(frame["RowKey"]) == ["1", "2", "3"]
+    assert frame["GeoCoordinates"].iloc[1] == [-75.8, 45.5]
+
+# Test that files from another format version are rejected instead of misread
+def test_snapshot_rejects_other_format_versions(tmp_path):
+    path = tmp_path / "events.snapshot"
+    with open(path, "w") as file:
+        file.write(json.dumps({"format": "traffic-snapshot", "format_version": 99}) + "\n{}")
+
+    with pytest.raises(ValueError):
+        read_snapshot_header(str(path))
+
+# Test that the fallback format is plain JSON: frames round-trip and a pickle is never loaded
+def test_snapshot_fallback_is_json(tmp_path):
+    import pandas as pd
+    path = str(tmp_path / "latest_snapshot")
+    frame = pd.DataFrame({"RowKey": ["1", "2"], "Longitude": [-75.7, math.nan], "WARD": ["12", "3"]})
+
+    write_snapshot(path, frame, version=3, use_arrow=False)
+    with open(path, "rb") as file:
+        assert json.loads(file.readline())["version"] == 3
+    pd.testing.assert_frame_equal(read_snapshot_frame(path)[1], frame)
+
+    with open(path, "wb") as file:
+        pickle.dump({"header": {"format": "traffic-snapshot", "format_version": 1}, "data": {}}, file)
+    with pytest.raises(ValueError):
+        read_snapshot_columns(path)
+
+# Test that the first run writes the ACTIVE set and later runs apply only the delta
+def test_update_event_snapshot_applies_deltas(tmp_path):
+    path = str(tmp_path / "events.snapshot")
+    full_snapshot = MagicMock()
+
+    initial = {"initial": True, "added": ["1", "2", "3"], "changed": [], "removed": []}
+    events = [make_entity(1), make_entity(2), make_entity(3, status="INACTIVE")]
+    assert update_event_snapshot(path, initial, events, full_snapshot) == 1
+
+    delta = {"initial": False, "added": ["4"], "changed": ["2"], "removed": ["1"]}
+    events = [make_entity(2, coordinates="[-75.5, 45.3]"), make_entity(4)]
+    assert update_event_snapshot(path, delta, events, full_snapshot) == 2
+
+    full_snapshot.assert_not_called()
+    header, columns = read_snapshot_columns(path)
+    assert header["version"] == 2
+    assert columns["RowKey"] == ["2", "4"]
+    assert columns["GeoCoordinates"] == ["[-75.5, 45.3]", "[-75.6972, 45.4215]"]
+
+# Test that a missing snapshot is rebuilt from the full feed
+def test_update_event_snapshot_rebuilds_missing_file(tmp_path):
+    path = str(tmp_path / "events.snapshot")
+    delta = {"initial": False, "added": ["2"], "changed": [], "removed": []}
+
+    assert update_event_snapshot(path, delta, [make_entity(2)], lambda: [make_entity(1), make_entity(2)]) == 1
+
+    assert read_snapshot_columns(path)[1]["RowKey"] == ["1", "2"]
@@ -15,9 +15,9 @@ def test_store_event_skips_if_entity_exists():
         "GeoCoordinates": "[-75.69, 45.40]"
     }
 
-    with patch("traffic_ingester.helper_functions.store_event_in_table_helper.TableServiceClient") as mock_tsc:
+    with patch("traffic_ingester.helper_functions.store_event_in_table_helper.get_table_client") as mock_get_table_client:
         mock_table_client = MagicMock()
-        mock_tsc.from_connection_string.return_value.get_table_client.return_value = mock_table_client
+        mock_get_table_client.return_value = mock_table_client
 
         # Simulate that entity already exists
         mock_table_client.get_entity.return_value = transformed_event
@@ -0,0 +1,58 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from azure.data.tables import TableTransactionError
+from traffic_ingester.helper_functions.store_events_batch_helper import (
+    chunk_operations_by_partition,
+    store_events_in_table_batch
+)
+
+def make_event(row_key, partition_key="OttawaTraffic"):
+    return {"PartitionKey": partition_key, "RowKey": str(row_key), "Status": "ACTIVE"}
+
+# Test that operations are grouped by PartitionKey and capped at 100 per transaction
+def test_chunk_operations_groups_by_partition_and_caps_size():
+    operations = [("upsert", make_event(i)) for i in range(250)]
+    operations += [("upsert", make_event(i, "Other")) for i in range(3)]
+
+    chunks = list(chunk_operations_by_partition(operations))
+
+    assert [len(chunk) for chunk in chunks] == [100, 100, 50, 3]
+    for chunk in chunks:
+        assert len({operation[1]["PartitionKey"] for operation in chunk}) == 1
+
+# Test that events are written with one submit_transaction per chunk
+def test_store_events_in_table_batch_submits_transactions():
+    events = [make_event(i) for i in range(205)]
+
+    with patch("traffic_ingester.helper_functions.store_events_batch_helper.get_table_client") as mock_get_table_client:
+        mock_table_client = MagicMock()
+        mock_get_table_client.return_value = mock_table_client
+
+        results = store_events_in_table_batch(events, "fake-conn-string", "TrafficEvents")
+
+        assert mock_table_client.submit_transaction.call_count == 3
+        mock_table_client.get_entity.assert_not_called()
+        mock_table_client.upsert_entity.assert_not_called()
+        assert results["transactions"] == 3
+        assert len(results["succeeded"]) == 205
+        assert results["failed"] == {}
+
+# Test that a failed transaction is replayed per entity and outcomes are reported per entity
+def test_store_events_in_table_batch_reports_per_entity_failures():
+    events = [make_event(i) for i in range(3)]
+
+    def upsert(entity, **kwargs):
+        if entity["RowKey"] == "1":
+            raise Exception("Bad entity")
+
+    with patch("traffic_ingester.helper_functions.store_events_batch_helper.get_table_client") as mock_get_table_client:
+        mock_table_client = MagicMock()
+        mock_table_client.submit_transaction.side_effect = TableTransactionError(message="1:Bad entity")
+        mock_table_client.upsert_entity.side_effect = upsert
+        mock_get_table_client.return_value = mock_table_client
+
+        results = store_events_in_table_batch(events, "fake-conn-string", "TrafficEvents")
+
+        assert mock_table_client.upsert_entity.call_count == 3
+        assert results["succeeded"] == ["0", "2"]
+        assert list(results["failed"]) == ["1"]
@@ -0,0 +1,185 @@
+import pytest
+import json
+import tracemalloc
+from unittest.mock import patch, MagicMock
+import azure.functions as func
+from traffic_ingester import function_app
+from traffic_ingester.helper_functions.stream_events_helper import iter_feed_events
+from traffic_ingester.helper_functions.transform_events_helper import iter_transform_events
+from traffic_ingester.helper_functions.sanitize_event_helper import sanitize_event
+from traffic_ingester.helper_functions.store_events_batch_helper import store_event_stream_in_table
+from traffic_ingester.snapshot_file import read_snapshot_columns
+
+def chunked(data, size):
+    return (data[start:start + size] for start in range(0, len(data), size))
+
+# Test that events are parsed correctly regardless of how the body is chunked
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 65536])
+def test_iter_feed_events_handles_any_chunking(chunk_size):
+    feed = {
+        "meta": {"note": "brackets ] and braces } in strings", "values": [1, 2, 3]},
+        "events": [{"id": i, "headline": "Café \"Rideau\"", "score": 12345.678} for i in range(5)],
+        "count": 5
+    }
+    body = json.dumps(feed, ensure_ascii=False).encode()
+
+    assert list(iter_feed_events(chunked(body, chunk_size))) == feed["events"]
+
+# Test that a bare array feed is also supported
+def test_iter_feed_events_accepts_bare_array():
+    assert list(iter_feed_events([b'[{"id": "1"}, ', b'{"id": "2"}]'])) == [{"id": "1"}, {"id": "2"}]
+
+# Test that a feed without an events array is rejected rather than read as empty
+def test_iter_feed_events_rejects_unexpected_format():
+    with pytest.raises(ValueError):
+        list(iter_feed_events([b'{"error": "maintenance"}']))
+
+# Test that the full multi-megabyte feed is parsed, in order, from 64 KiB chunks
+def test_iter_feed_events_parses_large_feed(large_traffic_feed):
+    body, count = large_traffic_feed
+    assert len(body) > 5 * 1024 * 1024
+
+    ids = [event["id"] for event in iter_feed_events(chunked(body, 65536))]
+    assert len(ids) == count
+    assert ids[0] == "100000" and ids[-1] == str(100000 + count - 1)
+
+# Test that peak memory of the parse -> sanitize -> transform pipeline stays flat
+def test_streaming_pipeline_memory_stays_flat(large_traffic_feed):
+    body, count = large_traffic_feed
+
+    tracemalloc.start()
+    try:
+        seen = 0
+        for entity in iter_transform_events(sanitize_event(e) for e in iter_feed_events(chunked(body, 65536))):
+            seen += 1
+        _, streaming_peak = tracemalloc.get_traced_memory()
+
+        tracemalloc.reset_peak()
+        events = json.loads(body)["events"]
+        _, loaded_peak = tracemalloc.get_traced_memory()
+        del events
+    finally:
+        tracemalloc.stop()
+
+    assert seen == count
+    # Streaming holds a read buffer and one event, not the ~6 MB feed
+    assert streaming_peak < 1024 * 1024
+    assert streaming_peak * 10 < loaded_peak
+
+# Test that streamed events are flushed in 100-entity transactions as they arrive
+def test_store_event_stream_in_table_flushes_per_partition():
+    def events():
+        for i in range(250):
+            yield {"PartitionKey": "OttawaTraffic", "RowKey": str(i), "Status": "ACTIVE"}
+
+    with patch("traffic_ingester.helper_functions.store_events_batch_helper.get_table_client") as mock_get_table_client:
+        mock_table_client = MagicMock()
+        mock_get_table_client.return_value = mock_table_client
+
+        results = store_event_stream_in_table(events(), "fake-conn-string", "TrafficEvents")
+
+    sizes = [len(call.args[0]) for call in mock_table_client.submit_transaction.call_args_list]
+    assert sizes == [100, 100, 50]
+    assert len(results["succeeded"]) == 250
+
+# Test that the real streaming ingestion path keeps memory flat on a first run, when every
+# event in the feed is part of the delta: changed events are published one bounded batch at
+# a time, the first replacing the dashboard's events and the rest applied as deltas
+def test_ingest_event_stream_memory_stays_flat(large_traffic_feed):
+    body, count = large_traffic_feed
+    pushes = []
+
+    def store(events, *args):
+        stored = sum(1 for _ in events)
+        return {"succeeded": [], "failed": {}, "transactions": stored // 100}
+
+    # A plain function rather than a mock, which would keep every pushed batch alive
+    def push(events, url, **kwargs):
+        pushes.append((len(events), "full_snapshot" in kwargs))
+        return True
+
+    with patch("traffic_ingester.function_app.ensure_table_exists"), \
+         patch("traffic_ingester.function_app.get_last_fingerprints", return_value=None), \
+         patch("traffic_ingester.function_app.store_event_stream_in_table", new=store), \
+         patch("traffic_ingester.function_app.sync_active_index"), \
+         patch("traffic_ingester.function_app.push_events_to_dashboard", new=push), \
+         patch("traffic_ingester.function_app.update_fingerprints") as mock_update_fingerprints:
+        tracemalloc.start()
+        try:
+            assert function_app.ingest_event_stream(chunked(body, 65536), {}) is True
+            _, streaming_peak = tracemalloc.get_traced_memory()
+
+            tracemalloc.reset_peak()
+            events = json.loads(body)["events"]
+            _, loaded_peak = tracemalloc.get_traced_memory()
+            del events
+        finally:
+            tracemalloc.stop()
+
+    assert sum(size for size, _ in pushes) == count
+    assert max(size for size, _ in pushes) == function_app.STREAM_PUSH_BATCH
+    assert [is_delta for _, is_delta in pushes] == [False] + [True] * (len(pushes) - 1)
+    assert len(mock_update_fingerprints.call_args.args[2]) == count
+    # One batch plus the fingerprint map, not the ~6 MB feed and its transformed copy
+    assert streaming_peak * 5 < loaded_peak
+
+def make_raw_event(i):
+    return {"id": str(i), "status": "ACTIVE", "geodata": {"coordinates": f"[-75.{i:04d}, 45.4]"}}
+
+# Test that a multi-batch stream writes the event snapshot file once, with every ACTIVE event
+def test_ingest_event_stream_writes_event_snapshot_once(tmp_path):
+    body = json.dumps({"events": [make_raw_event(i) for i in range(2500)]}).encode()
+    path = str(tmp_path / "events.snapshot")
+
+    with patch("traffic_ingester.function_app.EVENT_SNAPSHOT_FILE", path), \
+         patch("traffic_ingester.function_app.ensure_table_exists"), \
+         patch("traffic_ingester.function_app.get_last_fingerprints", return_value=None), \
+         patch("traffic_ingester.function_app.store_event_stream_in_table", side_effect=lambda events, *args: {"succeeded": [e["RowKey"] for e in events], "failed": {}}), \
+         patch("traffic_ingester.function_app.sync_active_index"), \
+         patch("traffic_ingester.function_app.push_events_to_dashboard", return_value=True) as mock_push, \
+         patch("traffic_ingester.function_app.update_fingerprints"), \
+         patch("traffic_ingester.function_app.update_event_snapshot", wraps=function_app.update_event_snapshot) as mock_snapshot:
+        assert function_app.ingest_event_stream(chunked(body, 4096), {}) is True
+
+    assert mock_push.call_count == 3
+    mock_snapshot.assert_called_once()
+    _, columns = read_snapshot_columns(path)
+    assert columns["RowKey"] == [str(i) for i in range(2500)]
+
+# Test that a stream breaking off partway marks the run incomplete: the batches already
+# published stay published, but fingerprints and the event snapshot are left untouched
+def test_ingest_event_stream_keeps_fingerprints_when_stream_breaks(tmp_path):
+    def broken_feed(chunks):
+        for i in range(1500):
+            yield make_raw_event(i)
+        raise ValueError("Unexpected data format from traffic API")
+
+    with patch("traffic_ingester.function_app.EVENT_SNAPSHOT_FILE", str(tmp_path / "events.snapshot")), \
+         patch("traffic_ingester.function_app.iter_feed_events", new=broken_feed), \
+         patch("traffic_ingester.function_app.ensure_table_exists"), \
+         patch("traffic_ingester.function_app.get_last_fingerprints", return_value=None), \
+         patch("traffic_ingester.function_app.store_event_stream_in_table", side_effect=lambda events, *args: {"succeeded": [e["RowKey"] for e in events], "failed": {}}), \
+         patch("traffic_ingester.function_app.sync_active_index") as mock_cleanup, \
+         patch("traffic_ingester.function_app.push_events_to_dashboard", return_value=True) as mock_push, \
+         patch("traffic_ingester.function_app.update_fingerprints") as mock_update_fingerprints, \
+         patch("traffic_ingester.function_app.update_event_snapshot") as mock_snapshot:
+        assert function_app.ingest_event_stream([], {}) is False
+
+    assert mock_push.call_count == 1
+    mock_cleanup.assert_not_called()
+    mock_update_fingerprints.assert_not_called()
+    mock_snapshot.assert_not_called()
+
+# Test that a streamed response is closed when the feed is not modified (304)
+def test_streaming_fetch_closes_response_on_not_modified():
+    fake_response = MagicMock(status_code=304)
+
+    with patch("traffic_ingester.function_app.STREAM_EVENTS", True), \
+         patch("traffic_ingester.function_app.ensure_table_exists"), \
+         patch("traffic_ingester.function_app.requests.get", return_value=fake_response), \
+         patch("traffic_ingester.function_app.get_http_validators", return_value={}), \
+         patch("traffic_ingester.function_app.ingest_event_stream") as mock_ingest:
+        function_app.fetch_traffic_events(MagicMock(spec=func.TimerRequest))
+
+    fake_response.__exit__.assert_called_once()
+    mock_ingest.assert_not_called()
@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock
+from traffic_ingester.helper_functions.table_client_registry_helper import (
+    get_table_service,
+    get_table_client,
+    get_async_table_client,
+    get_client_stats,
+    reset_client_stats,
+    clear_table_clients
+)
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    clear_table_clients()
+    yield
+    clear_table_clients()
+
+# Test that service and table clients are built once and reused afterwards
+def test_get_table_client_reuses_cached_clients():
+    with patch("traffic_ingester.helper_functions.table_client_registry_helper.TableServiceClient") as mock_tsc:
+        first = get_table_client("fake-conn-string", "TrafficEvents")
+        second = get_table_client("fake-conn-string", "TrafficEvents")
+        service = get_table_service("fake-conn-string")
+
+        assert first is second
+        assert service is mock_tsc.from_connection_string.return_value
+        mock_tsc.from_connection_string.assert_called_once()
+        service.get_table_client.assert_called_once_with("TrafficEvents")
+
+        # All clients share the pooled keep-alive transport
+        assert "transport" in mock_tsc.from_connection_string.call_args.kwargs
+
+# Test that a different table name gets its own client on the same service
+def test_get_table_client_caches_per_table():
+    with patch("traffic_ingester.helper_functions.table_client_registry_helper.TableServiceClient") as mock_tsc:
+        mock_tsc.from_connection_string.return_value.get_table_client.side_effect = lambda name: MagicMock(name=name)
+
+        events_client = get_table_client("fake-conn-string", "TrafficEvents")
+        metadata_client = get_table_client("fake-conn-string", "TrafficMetadata")
+
+        assert events_client is not metadata_client
+        mock_tsc.from_connection_string.assert_called_once()
+
+# Test that stats count created vs reused clients within the current window
+def test_client_stats_reset_per_invocation():
+    with patch("traffic_ingester.helper_functions.table_client_registry_helper.TableServiceClient"):
+        get_table_client("fake-conn-string", "TrafficEvents")
+        stats = get_client_stats()
+        assert stats["clients_created"] == 2  # service + table client
+        assert stats["clients_reused"] == 0
+
+        reset_client_stats()
+        get_table_client("fake-conn-string", "TrafficEvents")
+        get_table_client("fake-conn-string", "TrafficEvents")
+        stats = get_client_stats()
+        assert stats["clients_created"] == 0
+        assert stats["clients_reused"] == 2
+
+# Test that async table clients are cached per event loop and reused across invocations
+def test_get_async_table_client_reuses_clients_per_loop():
+    async def invocation():
+        return get_async_table_client("fake-conn-string", "TrafficEvents")
+
+    with patch("traffic_ingester.helper_functions.table_client_registry_helper.AsyncTableServiceClient") as mock_tsc:
+        mock_tsc.from_connection_string.side_effect = lambda conn: MagicMock()
+        loop = asyncio.new_event_loop()
+        try:
+            first = loop.run_until_complete(invocation())
+            second = loop.run_until_complete(invocation())
+        finally:
+            loop.close()
+        other_loop = asyncio.run(invocation())
+
+    assert first is second
+    assert mock_tsc.from_connection_string.call_count == 2
+    assert other_loop is not first
@@ -0,0 +1,65 @@
+import json
+import pytest
+from traffic_ingester.wire_format import encode_payload, decode_payload, wire_format_for, available_formats, resolve_wire_format
+
+def make_entities(count):
+    return [
+        {
+            "PartitionKey": "OttawaTraffic",
+            "RowKey": str(100000 + i),
+            "EventType": ["Collision", "Construction", "Special Event"][i % 3],
+            "Location": f"Synthetic event {i} on Bank St",
+            "StartTime": "2025-10-21T10:00:00Z" if i % 5 else None,
+            "EndTime": f"2025-10-21T12:{i % 60:02d}:00Z",
+            "Priority": ["HIGH", "MEDIUM", "LOW"][i % 3],
+            "Status": "ACTIVE",
+            "GeoCoordinates": [-75.9 + i / 2000, 45.2 + i / 3000] if i % 2 else f"[{-75.9 + i / 2000!r}, {45.2 + i / 3000!r}]"
+        }
+        for i in range(count)
+    ]
+
+# Test that the columnar format round-trips a delta exactly, compressed or not, at a fraction of the JSON size
+@pytest.mark.parametrize("compress", [False, True])
+def test_columnar_round_trip_is_exact_and_smaller(compress):
+    payload = {"events": make_entities(500), "removed": ["1", "2"], "mode": "delta"}
+
+    body = encode_payload(payload, "columnar", compress=compress)
+
+    assert decode_payload(body, "columnar") == payload
+    assert len(body) < len(json.dumps(payload)) / 3
+
+# Test that values outside the packed encodings survive unchanged
+def test_columnar_keeps_irregular_values():
+    events = make_entities(4)
+    events[0]["GeoCoordinates"] = [[-75.7, 45.4], [-75.8, 45.5]]
+    events[1]["GeoCoordinates"] = "[-75.69, 45.40]"
+    events[2]["StartTime"] = "2025-10-21 10:00"
+    del events[3]["Location"]
+    events[3]["Extra"] = {"lanes": 2}
+    payload = {"events": events}
+
+    decoded = decode_payload(encode_payload(payload, "columnar"), "columnar")
+
+    assert decoded == payload
+    assert "Location" not in decoded["events"][3]
+
+# Test that content types map to wire formats, defaulting to JSON
+def test_wire_format_for_content_type():
+    assert wire_format_for(None) == "json"
+    assert wire_format_for("application/json; charset=utf-8") == "json"
+    assert wire_format_for("application/x-traffic-columnar") == "columnar"
+    assert wire_format_for("text/plain") is None
+
+# Test the optional MessagePack format
+def test_msgpack_round_trip():
+    pytest.importorskip("msgpack")
+    payload = {"events": make_entities(10)}
+
+    assert "msgpack" in available_formats()
+    assert decode_payload(encode_payload(payload, "msgpack"), "msgpack") == payload
+
+# Test that configured wire formats are normalized, and unknown ones fall back to JSON
+def test_resolve_wire_format():
+    assert resolve_wire_format(" Columnar ") == "columnar"
+    assert resolve_wire_format(None) == "json"
+    assert resolve_wire_format("protobuf") == "json"
@@ -0,0 +1,262 @@
+import json
+import struct
+import sys
+import zlib
+from array import array
+from datetime import datetime, timezone
+from importlib.util import find_spec
+
+# Wire formats for event payloads ({"events": [...], plus "mode"/"removed" for deltas) sent
+# by the ingester to the dashboard and by the WebSocket server to its clients. JSON stays
+# the default and the fallback. This module only uses the standard library (msgpack is
+# optional), so the dashboard and the WebSocket server can import it as well.
+CONTENT_TYPES = {
+    "json": "application/json",
+    "columnar": "application/x-traffic-columnar",
+    "msgpack": "application/msgpack"
+}
+
+# Columnar frame: magic, flags byte, then (zlib-compressed when FLAG_ZLIB is set) a length-
+# prefixed JSON header followed by the packed little-endian column buffers
+MAGIC = b"TEV1"
+FLAG_ZLIB = 1
+
+# Frames at least this large are compressed unless compress is given explicitly
+COMPRESS_MIN_BYTES = 1024
+
+# Columns always dictionary-encoded; other string columns are when values repeat enough
+DICTIONARY_COLUMNS = ("PartitionKey", "EventType", "Priority", "Status")
+
+# Feed timestamps ("2025-10-21T10:00:00Z") travel as int64 epoch seconds
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+NO_TIMESTAMP = -2 ** 63
+
+# Point kinds in a "points" column: null, [lon, lat] list, "[lon, lat]" string, anything else
+POINT_NONE, POINT_LIST, POINT_STRING, POINT_OTHER = range(4)
+
+# Helper to list the wire formats this process can encode and decode
+def available_formats():
+    formats = ["json", "columnar"]
+    if find_spec("msgpack") is not None:
+        formats.append("msgpack")
+    return formats
+
+# Helper to validate a configured wire format: unknown names, and msgpack without the
+# package installed, fall back to JSON instead of failing every push
+def resolve_wire_format(wire_format):
+    name = (wire_format or "json").strip().lower()
+    if name in available_formats():
+        return name
+    reason = "is not installed" if name in CONTENT_TYPES else "is not a known wire format"
+    print(f"Wire format {wire_format!r} {reason} (expected one of {', '.join(available_formats())}), using JSON")
+    return "json"
+
+# Helper to map a Content-Type header to a wire format; None when it is not supported here
+def wire_format_for(content_type):
+    media_type = (content_type or CONTENT_TYPES["json"]).split(";")[0].strip().lower()
+    for wire_format, known in CONTENT_TYPES.items():
+        if media_type == known and wire_format in available_formats():
+            return wire_format
+    return None
+
+# Helper to encode a payload dict as bytes in the given wire format
+def encode_payload(payload, wire_format="json", compress=None):
+    if wire_format == "json":
+        return json.dumps(payload).encode("utf-8")
+    if wire_format == "msgpack":
+        import msgpack
+        return msgpack.packb(payload)
+    if wire_format == "columnar":
+        return encode_columnar(payload, compress)
+    raise ValueError(f"Unknown wire format: {wire_format}")
+
+# Helper to decode bytes produced by encode_payload back into the payload dict
+def decode_payload(body, wire_format="json"):
+    if wire_format == "json":
+        return json.loads(body)
+    if wire_format == "msgpack":
+        import msgpack
+        return msgpack.unpackb(body)
+    if wire_format == "columnar":
+        return decode_columnar(body)
+    raise ValueError(f"Unknown wire format: {wire_format}")
+
+# Helper to get an array's bytes in little-endian order
+def little_endian_bytes(values):
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+# Helper to read one little-endian array from a buffer, returning it and the next offset
+def read_array(typecode, count, buffer, offset):
+    values = array(typecode)
+    end = offset + count * values.itemsize
+    values.frombytes(buffer[offset:end])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values, end
+
+def encode_dictionary(name, values):
+    if not all(value is None or type(value) is str for value in values):
+        return None
+    index = {}
+    codes = [index.setdefault(value, len(index)) for value in values]
+    if name not in DICTIONARY_COLUMNS and len(index) * 2 > len(values):
+        return None
+    if len(index) > 65536:
+        return None
+    typecode = "B" if len(index) <= 256 else "H"
+    return {"encoding": "dictionary", "type": typecode, "values": list(index)}, [array(typecode, codes)]
+
+def encode_timestamps(values):
+    parsed = {None: NO_TIMESTAMP}
+    for value in values:
+        if value is None:
+            continue
+        # Only the exact feed format, so decoding renders the same string back
+        if type(value) is not str or len(value) != 20 or value[4] != "-" or value[10] != "T" or value[19] != "Z":
+            return None
+        if value in parsed:
+            continue
+        try:
+            parsed[value] = int(datetime.fromisoformat(value[:19]).replace(tzinfo=timezone.utc).timestamp())
+        except ValueError:
+            return None
+    return {"encoding": "timestamp"}, [array("q", map(parsed.__getitem__, values))]
+
+# Helper to split a canonical "[lon, lat]" string into floats; None when re-rendering would differ
+def parse_point_string(value):
+    if not value.startswith("[") or not value.endswith("]"):
+        return None
+    parts = value[1:-1].split(", ")
+    if len(parts) != 2:
+        return None
+    try:
+        lon, lat = float(parts[0]), float(parts[1])
+    except ValueError:
+        return None
+    return (lon, lat) if f"[{lon!r}, {lat!r}]" == value else None
+
+def encode_points(values):
+    kinds = array("B", bytes(len(values)))
+    coordinates = array("d", bytes(16 * len(values)))
+    other = {}
+    for row, value in enumerate(values):
+        point = None
+        if value is None:
+            continue
+        if type(value) is list and len(value) == 2 and type(value[0]) is float and type(value[1]) is float:
+            kinds[row], point = POINT_LIST, value
+        elif type(value) is str:
+            point = parse_point_string(value)
+            kinds[row] = POINT_STRING if point else POINT_OTHER
+        else:
+            kinds[row] = POINT_OTHER
+        if point:
+            coordinates[2 * row], coordinates[2 * row + 1] = point
+        else:
+            other[str(row)] = value
+
+    # Worth it only when most rows are plain points
+    if len(other) * 2 > len(values):
+        return None
+    return {"encoding": "points", "other": other}, [kinds, coordinates]
+
+# Helper to pick the most compact encoding for one column
+def encode_column(name, values):
+    if name in DICTIONARY_COLUMNS:
+        encoded = encode_dictionary(name, values)
+        if encoded:
+            return encoded
+    for encoder in (encode_timestamps, encode_points):
+        encoded = encoder(values)
+        if encoded:
+            return encoded
+    return encode_dictionary(name, values) or ({"encoding": "json", "values": values}, [])
+
+def encode_columnar(payload, compress=None):
+    events = payload.get("events") or []
+    names = list(dict.fromkeys(name for event in events for name in event))
+
+    columns, buffers = [], []
+    for name in names:
+        values = [event.get(name) for event in events]
+        spec, arrays = encode_column(name, values)
+        spec["name"] = name
+        if not all(name in event for event in events):
+            spec["missing"] = [row for row, event in enumerate(events) if name not in event]
+        columns.append(spec)
+        buffers.extend(little_endian_bytes(column) for column in arrays)
+
+    header = {
+        "count": len(events),
+        "columns": columns,
+        "fields": {key: value for key, value in payload.items() if key != "events"}
+    }
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    body = b"".join([struct.pack("<I", len(header_bytes)), header_bytes, *buffers])
+
+    if compress is None:
+        compress = len(body) >= COMPRESS_MIN_BYTES
+    if compress:
+        return MAGIC + bytes([FLAG_ZLIB]) + zlib.compress(body)
+    return MAGIC + bytes([0]) + body
+
+def decode_column(spec, count, buffer, offset):
+    encoding = spec["encoding"]
+    if encoding == "json":
+        return spec["values"], offset
+    if encoding == "dictionary":
+        codes, offset = read_array(spec["type"], count, buffer, offset)
+        return list(map(spec["values"].__getitem__, codes)), offset
+    if encoding == "timestamp":
+        seconds, offset = read_array("q", count, buffer, offset)
+        rendered = {NO_TIMESTAMP: None}
+        values = []
+        for value in seconds:
+            if value not in rendered:
+                rendered[value] = datetime.fromtimestamp(value, timezone.utc).strftime(TIMESTAMP_FORMAT)
+            values.append(rendered[value])
+        return values, offset
+    if encoding == "points":
+        kinds, offset = read_array("B", count, buffer, offset)
+        coordinates, offset = read_array("d", 2 * count, buffer, offset)
+        other = spec["other"]
+        values = []
+        for row, kind in enumerate(kinds):
+            if kind == POINT_LIST:
+                values.append([coordinates[2 * row], coordinates[2 * row + 1]])
+            elif kind == POINT_STRING:
+                values.append(f"[{coordinates[2 * row]!r}, {coordinates[2 * row + 1]!r}]")
+            elif kind == POINT_OTHER:
+                values.append(other[str(row)])
+            else:
+                values.append(None)
+        return values, offset
+    raise ValueError(f"Unknown column encoding: {encoding}")
+
+def decode_columnar(body):
+    if body[:4] != MAGIC:
+        raise ValueError("Not a columnar event frame")
+    body = zlib.decompress(body[5:]) if body[4] & FLAG_ZLIB else body[5:]
+
+    (header_length,) = struct.unpack_from("<I", body)
+    header = json.loads(body[4:4 + header_length])
+    count = header["count"]
+    offset = 4 + header_length
+
+    names, columns, missing = [], [], []
+    for spec in header["columns"]:
+        values, offset = decode_column(spec, count, body, offset)
+        names.append(spec["name"])
+        columns.append(values)
+        missing.extend((row, spec["name"]) for row in spec.get("missing", ()))
+
+    events = [dict(zip(names, row)) for row in zip(*columns)] if columns else [{} for _ in range(count)]
+    for row, name in missing:
+        del events[row][name]
+
+    payload = {"events": events}
+    payload.update(header["fields"])
+    return payload
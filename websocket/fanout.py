@@ -0,0 +1,256 @@
+import asyncio
+import itertools
+import json
+from collections import OrderedDict
+from traffic_ingester.wire_format import encode_payload
+
+# What to do with a client whose pending messages pass a high-water mark: replace them
+# with one full snapshot of the current state, or disconnect it
+SLOW_CONSUMER_POLICIES = ("resync", "disconnect")
+
+# Coalesced delta runs kept serialized, so clients with the same backlog share the text
+MAX_MERGED_MESSAGES = 32
+
+# Helper to key an event by RowKey (falling back to id for raw feed events)
+def event_key(event):
+    return str(event.get("RowKey", event.get("id")))
+
+# Helper to build a broadcast from a /broadcast payload: {"events": [...]} is a snapshot,
+# {"mode": "delta", "events": [...], "removed": [...]} a delta
+def make_broadcast(events, removed=None, mode=None):
+    if mode == "delta":
+        return Broadcast("delta", events, removed or [])
+    return Broadcast("snapshot", events)
+
+# Helper to rebuild a broadcast from its wire text, reusing the text instead of re-encoding
+def parse_broadcast(text):
+    payload = json.loads(text)
+    broadcast = make_broadcast(payload["events"], payload.get("removed"), payload.get("mode"))
+    broadcast._text = text
+    return broadcast
+
+# One broadcast message. The text is serialized once, on first use, and shared by every
+# client; a snapshot carries the full event set and a delta only upserts and removals.
+# Clients that negotiated a binary wire format share one encoding per format the same way.
+class Broadcast:
+    sequence = itertools.count(1)
+
+    def __init__(self, kind, events, removed=()):
+        self.kind = kind
+        self.events = events
+        self.removed = list(removed)
+        self.seq = next(Broadcast.sequence)
+        self._text = None
+        self.encoded = {}
+
+    def payload(self):
+        if self.kind == "snapshot":
+            return {"events": self.events}
+        return {"mode": "delta", "events": self.events, "removed": self.removed}
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = json.dumps(self.payload())
+        return self._text
+
+    # The message as sent to a client: text for JSON, bytes for a binary wire format
+    def frame(self, wire_format="json"):
+        if wire_format == "json":
+            return self.text
+        if wire_format not in self.encoded:
+            self.encoded[wire_format] = encode_payload(self.payload(), wire_format)
+        return self.encoded[wire_format]
+
+# One subscriber: its socket, the broadcasts not yet sent to it, and its counters
+class ClientConnection:
+    ids = itertools.count(1)
+
+    def __init__(self, websocket, wire_format="json"):
+        self.id = next(ClientConnection.ids)
+        self.websocket = websocket
+        self.wire_format = wire_format
+        self.pending = []
+        self.wakeup = asyncio.Event()
+        self.task = None
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.resyncs = 0
+
+    def pending_bytes(self):
+        return sum(len(broadcast.frame(self.wire_format)) for broadcast in self.pending)
+
+# Broadcast fan-out engine. Each broadcast is serialized once and queued for every client
+# without awaiting any socket; per-client sender tasks drain the queues concurrently, so
+# one slow or dead socket never holds up the others. Backlogs are coalesced: a snapshot
+# supersedes everything pending before it, consecutive deltas are merged into one message,
+# and a backlog past the high-water marks is replaced by one snapshot of the current state.
+class FanoutEngine:
+    def __init__(self, high_water_messages=16, high_water_bytes=8 * 1024 * 1024, policy="resync", send_timeout=10.0):
+        if policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {policy}")
+        self.high_water_messages = high_water_messages
+        self.high_water_bytes = high_water_bytes
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.clients = set()
+        self.closing = set()
+        self.disconnected = 0
+        # Current event set, kept so a lagging client can be resynced with one snapshot
+        self.state = {}
+        self.state_snapshot = None
+        self.merged = OrderedDict()
+
+    # Start fanning out to an accepted WebSocket (call from the event loop), in the wire
+    # format negotiated with it
+    def register(self, websocket, wire_format="json"):
+        client = ClientConnection(websocket, wire_format)
+        client.task = asyncio.create_task(self.send_loop(client))
+        self.clients.add(client)
+        return client
+
+    # Stop fanning out to a client whose socket has gone away
+    async def unregister(self, client):
+        self.clients.discard(client)
+        if client.task is not asyncio.current_task():
+            client.task.cancel()
+            await asyncio.gather(client.task, return_exceptions=True)
+
+    # Queue a full snapshot ({"events": [...]}) or a delta (events upserted by RowKey plus
+    # removed RowKeys) for every client
+    def broadcast(self, events, removed=None, mode=None):
+        return self.broadcast_message(make_broadcast(events, removed, mode))
+
+    # Queue a broadcast received as wire text (e.g. from the pub/sub backend)
+    def receive(self, text):
+        return self.broadcast_message(parse_broadcast(text))
+
+    def broadcast_message(self, message):
+        if message.kind == "delta":
+            for key in message.removed:
+                self.state.pop(key, None)
+            self.state.update((event_key(event), event) for event in message.events)
+        else:
+            self.state = {event_key(event): event for event in message.events}
+        self.state_snapshot = message if message.kind == "snapshot" else None
+
+        for client in list(self.clients):
+            self.enqueue(client, message)
+        return {"clients": len(self.clients), "bytes": len(message.text)}
+
+    # Snapshot of the current state, built (and serialized) at most once per broadcast
+    def current_snapshot(self):
+        if self.state_snapshot is None:
+            self.state_snapshot = Broadcast("snapshot", list(self.state.values()))
+        return self.state_snapshot
+
+    def enqueue(self, client, message):
+        if message.kind == "snapshot":
+            client.dropped += len(client.pending)
+            client.pending = [message]
+        elif client.pending and client.pending[0].kind == "snapshot":
+            # A pending snapshot plus this delta is just the current state
+            client.pending = [self.current_snapshot()]
+        else:
+            client.pending.append(message)
+
+        # A backlog of one is already as small as it gets
+        backlog = len(client.pending) > 1
+        if backlog and (len(client.pending) > self.high_water_messages or client.pending_bytes() > self.high_water_bytes):
+            if self.policy == "disconnect":
+                self.schedule_close(client, "backlog over high-water mark")
+                return
+            client.dropped += len(client.pending)
+            client.resyncs += 1
+            client.pending = [self.current_snapshot()]
+        client.wakeup.set()
+
+    # Turn a client's backlog into one message: a lone broadcast as is, or a run of deltas
+    # merged by RowKey (cached by sequence range so identical backlogs serialize once)
+    def coalesce(self, pending):
+        if len(pending) == 1:
+            return pending[0]
+
+        key = (pending[0].seq, pending[-1].seq)
+        merged = self.merged.get(key)
+        if merged is None:
+            upserts, removed = {}, {}
+            for delta in pending:
+                for row_key in delta.removed:
+                    upserts.pop(row_key, None)
+                    removed[row_key] = True
+                for event in delta.events:
+                    removed.pop(event_key(event), None)
+                    upserts[event_key(event)] = event
+            merged = Broadcast("delta", list(upserts.values()), list(removed))
+            self.merged[key] = merged
+            while len(self.merged) > MAX_MERGED_MESSAGES:
+                self.merged.popitem(last=False)
+        return merged
+
+    async def send_loop(self, client):
+        while True:
+            await client.wakeup.wait()
+            client.wakeup.clear()
+            while client.pending:
+                pending, client.pending = client.pending, []
+                client.coalesced += len(pending) - 1
+                message = self.coalesce(pending)
+                frame = message.frame(client.wire_format)
+                send = client.websocket.send_text if isinstance(frame, str) else client.websocket.send_bytes
+                try:
+                    await asyncio.wait_for(send(frame), self.send_timeout)
+                    client.sent += 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # Dead or stuck socket: drop it without affecting anyone else
+                    await self.close(client, f"send failed: {e!r}")
+                    return
+
+    # Remove a client and close its socket; safe to call more than once
+    async def close(self, client, reason):
+        if client not in self.clients:
+            return
+        self.clients.discard(client)
+        self.disconnected += 1
+        print(f"Disconnecting WebSocket client {client.id} ({reason})")
+        if client.task is not asyncio.current_task():
+            client.task.cancel()
+        try:
+            await asyncio.wait_for(client.websocket.close(), self.send_timeout)
+        except Exception:
+            pass
+
+    # Close from synchronous code (broadcast); keep a reference so the task is not collected
+    def schedule_close(self, client, reason):
+        task = asyncio.create_task(self.close(client, reason))
+        self.closing.add(task)
+        task.add_done_callback(self.closing.discard)
+
+    def stats(self):
+        clients = [
+            {
+                "id": client.id,
+                "wire_format": client.wire_format,
+                "queue_depth": len(client.pending),
+                "queued_bytes": client.pending_bytes(),
+                "sent": client.sent,
+                "coalesced": client.coalesced,
+                "dropped": client.dropped,
+                "resyncs": client.resyncs
+            }
+            for client in sorted(self.clients, key=lambda client: client.id)
+        ]
+        return {
+            "clients": len(clients),
+            "disconnected": self.disconnected,
+            "sent": sum(client["sent"] for client in clients),
+            "coalesced": sum(client["coalesced"] for client in clients),
+            "dropped": sum(client["dropped"] for client in clients),
+            "max_queue_depth": max((client["queue_depth"] for client in clients), default=0),
+            "high_water_messages": self.high_water_messages,
+            "high_water_bytes": self.high_water_bytes,
+            "per_client": clients
+        }
@@ -0,0 +1,78 @@
+import asyncio
+
+# Pub/sub backends that carry /broadcast messages to every server process. Each process
+# publishes what it receives and feeds whatever it hears into its own fan-out engine, so
+# any worker (or host) behind a load balancer reaches every subscriber.
+
+# Single-process backend: a publish is delivered straight to this process's handler
+class InProcessBroker:
+    def __init__(self):
+        self.handler = None
+
+    async def start(self, handler):
+        self.handler = handler
+
+    # Returns how many processes received the message
+    async def publish(self, text):
+        self.handler(text)
+        return 1
+
+    async def stop(self):
+        self.handler = None
+
+# Redis-protocol backend (redis-server, or fakeredis in tests): every process subscribes
+# to one channel and a publish goes to all of them, in the same order for everyone
+class RedisBroker:
+    def __init__(self, client, channel="traffic-broadcasts", reconnect_seconds=1.0, connect_timeout=10.0):
+        self.client = client
+        self.channel = channel
+        self.reconnect_seconds = reconnect_seconds
+        self.connect_timeout = connect_timeout
+        self.task = None
+        self.subscribed = asyncio.Event()
+
+    # Subscribe before the server takes connections; an unreachable Redis fails startup
+    # after connect_timeout seconds instead of hanging it
+    async def start(self, handler):
+        self.task = asyncio.create_task(self.listen(handler))
+        try:
+            await asyncio.wait_for(self.subscribed.wait(), self.connect_timeout)
+        except asyncio.TimeoutError:
+            await self.stop()
+            raise ConnectionError(f"Could not subscribe to Redis channel {self.channel!r} within {self.connect_timeout:g}s") from None
+
+    async def listen(self, handler):
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                self.subscribed.set()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        data = message["data"]
+                        handler(data.decode("utf-8") if isinstance(data, bytes) else data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Messages published while disconnected are lost; the next snapshot resyncs clients
+                print(f"Pub/sub connection lost, resubscribing: {e!r}")
+                await asyncio.sleep(self.reconnect_seconds)
+            finally:
+                await pubsub.aclose()
+
+    async def publish(self, text):
+        return await self.client.publish(self.channel, text)
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+        await self.client.aclose()
+
+# Helper to create the broker for WS_BROKER ("memory" or "redis")
+def create_broker(backend="memory", redis_url=None, channel="traffic-broadcasts", connect_timeout=10.0):
+    if backend == "redis":
+        # Optional dependency, only needed when running several workers or hosts
+        import redis.asyncio
+        return RedisBroker(redis.asyncio.Redis.from_url(redis_url or "redis://localhost:6379/0"), channel, connect_timeout=connect_timeout)
+    return InProcessBroker()
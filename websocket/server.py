@@ -1,11 +1,12 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, Request
 from fastapi.responses import HTMLResponse, JSONResponse
 import uvicorn
 import os
 from dotenv import load_dotenv
-
-app = FastAPI()
-clients = []
+from websocket.fanout import FanoutEngine, make_broadcast
+from websocket.pubsub import create_broker
+from traffic_ingester.wire_format import available_formats
 
 # Explicitly load the .env file from this folder
 BASE_DIR = os.path.dirname(__file__)
@@ -13,30 +14,84 @@ load_dotenv(dotenv_path=os.path.join(BASE_DIR, ".env"))
 
 PORT = int(os.getenv("PORT"))
 
+# Fan-out engine for connected clients: per-client backlogs coalesced down to the latest
+# snapshot or one merged delta, high-water marks on backlog size, and a policy for slow
+# consumers past them (resync with one snapshot, or disconnect)
+fanout = FanoutEngine(
+    high_water_messages=int(os.getenv("WS_HIGH_WATER_MESSAGES", "16")),
+    high_water_bytes=int(os.getenv("WS_HIGH_WATER_BYTES", str(8 * 1024 * 1024))),
+    policy=os.getenv("WS_SLOW_CONSUMER_POLICY", "resync"),
+    send_timeout=float(os.getenv("WS_SEND_TIMEOUT", "10"))
+)
+
+# Pub/sub backend carrying broadcasts to every server process: "memory" for a single
+# process, "redis" when running several workers or hosts behind a load balancer
+broker = create_broker(
+    os.getenv("WS_BROKER", "memory"),
+    redis_url=os.getenv("REDIS_URL"),
+    channel=os.getenv("WS_BROKER_CHANNEL", "traffic-broadcasts"),
+    connect_timeout=float(os.getenv("WS_BROKER_CONNECT_TIMEOUT", "10"))
+)
+
+# Subscribe this process to the broker for the lifetime of the app
+@asynccontextmanager
+async def lifespan(app):
+    await broker.start(fanout.receive)
+    try:
+        yield
+    finally:
+        await broker.stop()
+
+app = FastAPI(lifespan=lifespan)
+
+# WebSocket subprotocols a client can offer to receive binary frames instead of JSON text;
+# clients offering none of them (or ones this server cannot encode) get JSON
+WIRE_SUBPROTOCOLS = {
+    "traffic.columnar": "columnar",
+    "traffic.msgpack": "msgpack"
+}
+
+# Helper to pick the first offered subprotocol this server can encode
+def negotiate_subprotocol(offered):
+    formats = available_formats()
+    return next((protocol for protocol in offered if WIRE_SUBPROTOCOLS.get(protocol) in formats), None)
+
 # Endpoint for WebSocket connections
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    await websocket.accept()
-    clients.append(websocket)
+    subprotocol = negotiate_subprotocol(websocket.scope.get("subprotocols", []))
+    await websocket.accept(subprotocol=subprotocol)
+    client = fanout.register(websocket, WIRE_SUBPROTOCOLS.get(subprotocol, "json"))
     try:
         while True:
             await websocket.receive_text()  # Keep connection alive
     except:
-        clients.remove(websocket)
+        await fanout.unregister(client)
 
-# Endpoint to broadcast events to all connected clients; Dashboard listens here
+# Endpoint to broadcast events to all connected clients; Dashboard listens here. A full
+# snapshot is {"events": [...]}; {"mode": "delta", "events": [...], "removed": [...]}
+# upserts events by RowKey and removes the listed RowKeys.
 @app.post("/broadcast")
 async def broadcast(request: Request):
     data = await request.json()
     events = data.get("events")
+    removed = data.get("removed", [])
+    if not isinstance(events, list) or not isinstance(removed, list):
+        return JSONResponse(status_code=422, content={"error": "Expected 'events' and 'removed' to be lists"})
     print(f"Received broadcast with {len(events)} events")
-    if not isinstance(events, list):
-        return JSONResponse(status_code=422, content={"error": "Expected 'events' to be a list"})
-    
-    for client in clients:
-        await client.send_json({"events": events})
-    
-    return {"status": "sent", "clients": len(clients)}
+
+    # Serialized once and published to every process, each of which queues it for its own
+    # clients; returns without waiting on any socket
+    text = make_broadcast(events, removed, data.get("mode")).text
+    workers = await broker.publish(text)
+
+    return {"status": "sent", "clients": len(fanout.clients), "workers": workers}
+
+# Endpoint for fan-out stats: totals plus per-client queue depth, queued bytes, and
+# sent/coalesced/dropped message counts
+@app.get("/stats")
+async def stats():
+    return fanout.stats()
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=PORT)
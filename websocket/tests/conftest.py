@@ -0,0 +1,4 @@
+import os
+
+# server.py reads PORT at import time
+os.environ.setdefault("PORT", "8000")
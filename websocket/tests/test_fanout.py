@@ -0,0 +1,164 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import patch
+from websocket.fanout import FanoutEngine
+
+# Stand-in for a Starlette WebSocket; "stall" blocks sends until released, "fail" raises
+class FakeSocket:
+    def __init__(self, mode="ok"):
+        self.mode = mode
+        self.release = asyncio.Event()
+        self.messages = []
+        self.closed = False
+
+    async def send_text(self, message):
+        if self.mode == "stall":
+            await self.release.wait()
+        if self.mode == "fail":
+            raise ConnectionResetError("socket gone")
+        self.messages.append(json.loads(message))
+
+    async def close(self):
+        self.closed = True
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+def event(row_key, priority="HIGH"):
+    return {"RowKey": str(row_key), "Priority": priority}
+
+# Test that a broadcast is serialized once and delivered to every client
+def test_broadcast_serializes_once_for_all_clients():
+    async def scenario():
+        engine = FanoutEngine()
+        sockets = [FakeSocket() for _ in range(3)]
+        for socket in sockets:
+            engine.register(socket)
+
+        with patch("websocket.fanout.json.dumps", wraps=json.dumps) as mock_dumps:
+            result = engine.broadcast([event(1)])
+            await settle()
+
+        assert mock_dumps.call_count == 1
+        assert result["clients"] == 3
+        assert all(socket.messages == [{"events": [event(1)]}] for socket in sockets)
+
+    asyncio.run(scenario())
+
+# Test that deltas queued behind a slow send are merged into one message by RowKey
+def test_pending_deltas_are_merged():
+    async def scenario():
+        engine = FanoutEngine()
+        socket = FakeSocket("stall")
+        client = engine.register(socket)
+
+        engine.broadcast([event(1), event(2)])
+        await settle()
+        engine.broadcast([event(3)], mode="delta")
+        engine.broadcast([event(1, "LOW")], removed=["2"], mode="delta")
+        engine.broadcast([event(2)], removed=["3"], mode="delta")
+        assert engine.stats()["per_client"][0]["queue_depth"] == 3
+
+        socket.release.set()
+        await settle()
+
+        assert socket.messages == [
+            {"events": [event(1), event(2)]},
+            {"mode": "delta", "events": [event(1, "LOW"), event(2)], "removed": ["3"]}
+        ]
+        assert client.coalesced == 2
+
+    asyncio.run(scenario())
+
+# Test that a new snapshot supersedes a client's pending backlog
+def test_snapshot_supersedes_pending_messages():
+    async def scenario():
+        engine = FanoutEngine()
+        socket = FakeSocket("stall")
+        client = engine.register(socket)
+
+        engine.broadcast([event(1)])
+        await settle()
+        engine.broadcast([event(2)], mode="delta")
+        engine.broadcast([event(3)], mode="delta")
+        engine.broadcast([event(4)])
+
+        assert [message.kind for message in client.pending] == ["snapshot"]
+        assert client.dropped == 2
+
+    asyncio.run(scenario())
+
+# Test that a backlog past the high-water mark is replaced by one snapshot of the current state
+def test_backlog_over_high_water_resyncs_with_snapshot():
+    async def scenario():
+        engine = FanoutEngine(high_water_messages=3)
+        fast = FakeSocket()
+        engine.register(fast)
+        slow_socket = FakeSocket("stall")
+        slow = engine.register(slow_socket)
+
+        engine.broadcast([event(0)])
+        await settle()
+        for row_key in range(1, 6):
+            engine.broadcast([event(row_key)], mode="delta")
+            await settle()
+
+        assert len(fast.messages) == 6
+        assert len(slow.pending) <= 3
+        assert slow.resyncs == 1
+
+        slow_socket.release.set()
+        await settle()
+        received = {}
+        for message in slow_socket.messages:
+            if message.get("mode") != "delta":
+                received = {}
+            received.update((item["RowKey"], item) for item in message["events"])
+        assert sorted(received) == ["0", "1", "2", "3", "4", "5"]
+
+    asyncio.run(scenario())
+
+# Test that the disconnect policy closes a client whose backlog passes the high-water mark
+def test_slow_client_disconnected_by_policy():
+    async def scenario():
+        engine = FanoutEngine(high_water_messages=1, policy="disconnect")
+        socket = FakeSocket("stall")
+        engine.register(socket)
+
+        engine.broadcast([event(0)])
+        await settle()
+        for row_key in range(1, 4):
+            engine.broadcast([event(row_key)], mode="delta")
+            await settle()
+
+        assert socket.closed
+        assert engine.stats()["clients"] == 0
+        assert engine.stats()["disconnected"] == 1
+
+    asyncio.run(scenario())
+
+# Test that a dead socket is cleaned up and the rest keep receiving
+def test_dead_socket_removed_after_failed_send():
+    async def scenario():
+        engine = FanoutEngine()
+        alive = FakeSocket()
+        engine.register(alive)
+        engine.register(FakeSocket("fail"))
+
+        engine.broadcast([event(1)])
+        await settle()
+        engine.broadcast([event(2)])
+        await settle()
+
+        assert len(alive.messages) == 2
+        assert engine.stats()["clients"] == 1
+        assert engine.stats()["disconnected"] == 1
+
+    asyncio.run(scenario())
+
+# Test that an unknown policy is rejected up front
+def test_unknown_policy_rejected():
+    with pytest.raises(ValueError):
+        FanoutEngine(policy="block")
@@ -0,0 +1,90 @@
+import asyncio
+import json
+import pytest
+from websocket.fanout import FanoutEngine, make_broadcast
+from websocket.pubsub import InProcessBroker, RedisBroker
+from websocket.tests.test_fanout import FakeSocket, event, settle
+
+fakeredis = pytest.importorskip("fakeredis")
+
+# Wait until every socket has received the expected number of messages
+async def wait_for_messages(sockets, count):
+    for _ in range(200):
+        if all(len(socket.messages) >= count for socket in sockets):
+            return
+        await asyncio.sleep(0.01)
+
+# Test that the in-process broker hands published text straight to the local engine
+def test_in_process_broker_delivers_locally():
+    async def scenario():
+        engine = FanoutEngine()
+        socket = FakeSocket()
+        engine.register(socket)
+        broker = InProcessBroker()
+        await broker.start(engine.receive)
+
+        receivers = await broker.publish(make_broadcast([event(1)]).text)
+        await settle()
+        await broker.stop()
+
+        assert receivers == 1
+        assert socket.messages == [{"events": [event(1)]}]
+
+    asyncio.run(scenario())
+
+# Test that a broadcast published by one worker reaches the clients of every worker, in order
+def test_redis_broker_delivers_to_every_worker():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        workers = []
+        for _ in range(2):
+            engine = FanoutEngine()
+            socket = FakeSocket()
+            engine.register(socket)
+            broker = RedisBroker(fakeredis.FakeAsyncRedis(server=server))
+            await broker.start(engine.receive)
+            workers.append((engine, socket, broker))
+
+        publisher = workers[0][2]
+        receivers = await publisher.publish(make_broadcast([event(1), event(2)]).text)
+        await publisher.publish(make_broadcast([event(3)], removed=["1"], mode="delta").text)
+        sockets = [socket for _, socket, _ in workers]
+        await wait_for_messages(sockets, 2)
+        for _, _, broker in workers:
+            await broker.stop()
+
+        assert receivers == 2
+        for engine, socket, _ in workers:
+            assert socket.messages == [
+                {"events": [event(1), event(2)]},
+                {"mode": "delta", "events": [event(3)], "removed": ["1"]}
+            ]
+            assert set(engine.state) == {"2", "3"}
+
+    asyncio.run(scenario())
+
+# Test that an unreachable Redis fails startup after the connect timeout instead of hanging
+def test_redis_broker_start_times_out_when_unreachable():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        server.connected = False
+        broker = RedisBroker(fakeredis.FakeAsyncRedis(server=server), reconnect_seconds=0.01, connect_timeout=0.2)
+
+        with pytest.raises(ConnectionError):
+            await broker.start(lambda text: None)
+        assert broker.task.done()
+
+    asyncio.run(asyncio.wait_for(scenario(), 5))
+
+# Test that received wire text is queued as is rather than re-encoded
+def test_receive_reuses_wire_text():
+    async def scenario():
+        engine = FanoutEngine()
+        engine.register(FakeSocket())
+        text = json.dumps({"mode": "delta", "events": [event(4)], "removed": []})
+
+        engine.receive(text)
+
+        assert next(iter(engine.clients)).pending[0].text is text
+
+    asyncio.run(scenario())
@@ -0,0 +1,44 @@
+from fastapi.testclient import TestClient
+from websocket.server import app
+from traffic_ingester.wire_format import decode_payload
+
+# Test that a broadcast reaches connected WebSocket clients end to end
+def test_broadcast_reaches_websocket_clients():
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws") as first, client.websocket_connect("/ws") as second:
+            response = client.post("/broadcast", json={"events": [{"RowKey": "1"}]})
+
+            assert response.json() == {"status": "sent", "clients": 2, "workers": 1}
+            assert first.receive_json() == {"events": [{"RowKey": "1"}]}
+            assert second.receive_json() == {"events": [{"RowKey": "1"}]}
+
+# Test that a malformed broadcast is rejected
+def test_broadcast_rejects_non_list_events():
+    with TestClient(app) as client:
+        response = client.post("/broadcast", json={"events": "nope"})
+
+    assert response.status_code == 422
+
+# Test that deltas are forwarded and per-client stats are exposed
+def test_delta_broadcast_and_stats():
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws") as socket:
+            client.post("/broadcast", json={"events": [{"RowKey": "1"}]})
+            assert socket.receive_json() == {"events": [{"RowKey": "1"}]}
+
+            client.post("/broadcast", json={"events": [{"RowKey": "2"}], "removed": ["1"], "mode": "delta"})
+            assert socket.receive_json() == {"mode": "delta", "events": [{"RowKey": "2"}], "removed": ["1"]}
+            stats = client.get("/stats").json()
+
+    assert stats["per_client"][0]["sent"] == 2
+    assert {"queue_depth", "queued_bytes", "dropped", "coalesced"} <= set(stats["per_client"][0])
+
+# Test that a client offering the columnar subprotocol gets binary frames
+def test_columnar_subprotocol_receives_binary_frames():
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws", subprotocols=["traffic.columnar"]) as binary, client.websocket_connect("/ws") as text:
+            client.post("/broadcast", json={"events": [{"RowKey": "1", "Priority": "HIGH"}]})
+
+            assert binary.accepted_subprotocol == "traffic.columnar"
+            assert decode_payload(binary.receive_bytes(), "columnar") == {"events": [{"RowKey": "1", "Priority": "HIGH"}]}
+            assert text.receive_json() == {"events": [{"RowKey": "1", "Priority": "HIGH"}]}